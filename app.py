@@ -3,9 +3,17 @@ xDaimon FastScan - Main Dash Application
 Главный файл приложения для визуализации стакана ордеров Polymarket
 """
 
+import argparse
+import importlib.util
+import plotly.io as pio
 from dash import Dash
 from src.layout import create_main_layout
 from src.callbacks import register_callbacks
+from src.catalog import refresh_catalog, start_catalog_refresher
+from src.server import register_health_route, warm_up, serve
+from src.shared_store import enable_shared_store
+from src.metrics import register_metrics_route
+from src.config import SERVER_WORKERS
 
 
 def create_app():
@@ -13,19 +21,53 @@ def create_app():
     app = Dash(__name__, suppress_callback_exceptions=True)
     app.title = "xDaimon FastScan"
 
+    # Ответы Dash (фигуры, Patch) сериализуются через plotly.io.json:
+    # orjson заметно быстрее стандартного json на больших фигурах
+    if importlib.util.find_spec('orjson') is not None:
+        pio.json.config.default_engine = 'orjson'
+
+    # Каталог рынков: сканируются только новые и изменённые файлы,
+    # дальше каталог обновляется в фоне
+    refresh_catalog()
+    start_catalog_refresher()
+
     # Главный layout
     app.layout = create_main_layout
 
     # Регистрируем callbacks
     register_callbacks(app)
 
+    # Проверка живости для балансировщика / мониторинга
+    register_health_route(app)
+    # Метрики callbacks для Prometheus
+    register_metrics_route(app)
+
     return app
 
 
 def main():
-    """Точка входа в приложение"""
+    """
+    Точка входа в приложение.
+
+    Использование:
+        python app.py                           # dev сервер Flask (debug, reloader)
+        python app.py --serve --workers 4       # gunicorn, прогрев, без debug
+    """
+    parser = argparse.ArgumentParser(description='xDaimon FastScan')
+    parser.add_argument('--serve', action='store_true', help='Production режим (gunicorn)')
+    parser.add_argument('--workers', type=int, default=SERVER_WORKERS, help='Процессов-воркеров (--serve)')
+    parser.add_argument('--host', type=str, default=None, help='Адрес (по умолчанию 127.0.0.1, с --serve 0.0.0.0)')
+    parser.add_argument('--port', type=int, default=8050, help='Порт')
+    args = parser.parse_args()
+
     app = create_app()
-    app.run(debug=True, host='127.0.0.1', port=8050)
+    if args.serve:
+        # Воркеры отображают рынки из общего хранилища вместо собственных копий
+        enable_shared_store()
+        warm_up()
+        serve(app, host=args.host or '0.0.0.0', port=args.port, workers=args.workers)
+    else:
+        app.run(debug=True, host=args.host or '127.0.0.1', port=args.port)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,102 @@
+window.dash_clientside = window.dash_clientside || {};
+
+// Active-Track: окно ±zoom строк вокруг слайдера на всех графиках с рядами.
+// Диапазоны осей ставятся и держатся в браузере (assets/axis_pins.js),
+// сервер только догружает точки окна (см. callbacks.py, Callback 4 и 4a)
+window.dash_clientside.active_track = {
+    state: {
+        loaded: null,   // {filename, half, x_min, x_max} - диапазон точек, загруженных с сервера
+        pending: null,  // {chartAxes, range} - окно для следующего кадра (range = null - autorange)
+        rafId: null
+    },
+
+    // Сколько окон догружать с каждой стороны от видимого
+    prefetchWindows: 1,
+
+    // Графики одного шага слайдера применяются в одном кадре
+    scheduleRelayout: function (chartAxes, range) {
+        const s = this.state;
+        s.pending = { chartAxes: chartAxes, range: range };
+        if (s.rafId !== null) {
+            return;
+        }
+        s.rafId = requestAnimationFrame(() => {
+            s.rafId = null;
+            const pending = s.pending;
+            s.pending = null;
+            if (pending) {
+                this.applyRange(pending.chartAxes, pending.range);
+            }
+        });
+    },
+
+    // range = null - autorange (Active-Track выключен)
+    applyRange: function (chartAxes, range) {
+        const pins = window.dash_clientside.axis_pins;
+        for (const [chartId, axes] of Object.entries(chartAxes)) {
+            // Окно остаётся на графике и после догрузки точек сервером (Patch без осей)
+            pins.set(chartId, axes, range);
+            const graph = pins.getGraph(chartId);
+            if (!graph || !graph._fullLayout) {
+                continue;
+            }
+            const layoutUpdate = {};
+            for (const axis of axes) {
+                if (range === null) {
+                    layoutUpdate[`${axis}.autorange`] = true;
+                } else {
+                    layoutUpdate[`${axis}.range`] = range;
+                }
+            }
+            // Plotly.update вместо relayout: plotly_relayout отправил бы relayoutData
+            // в связанный зум (assets/axis_link.js) и разнёс бы окно по группе повторно
+            Plotly.update(graph, {}, layoutUpdate);
+        }
+    },
+
+    // Окно для слайдера. Возвращает запрос к серверу (Store active-track-request)
+    // или no_update, если загруженных точек хватает
+    update: function (row, filename, playbackState, activeTrack, zoomLevel, chartAxes) {
+        const noUpdate = window.dash_clientside.no_update;
+        const s = this.state;
+
+        // Во время playback графики обновляет playback engine
+        if (playbackState && playbackState.is_playing) {
+            return noUpdate;
+        }
+        if (!filename || row === null || row === undefined) {
+            s.loaded = null;
+            return noUpdate;
+        }
+
+        if (!activeTrack || !activeTrack.includes('enabled')) {
+            // Выключили Active-Track: вернуть обзорные ряды и autorange
+            if (s.loaded && s.loaded.filename === filename) {
+                s.loaded = null;
+                this.scheduleRelayout(chartAxes, null);
+                return { reset: true };
+            }
+            s.loaded = null;
+            return noUpdate;
+        }
+
+        const half = zoomLevel ? zoomLevel : 150;
+        const range = [Math.max(0, row - half), row + half];
+        this.scheduleRelayout(chartAxes, range);
+
+        const loaded = s.loaded;
+        if (loaded && loaded.filename === filename && loaded.half === half &&
+            range[0] >= loaded.x_min && range[1] <= loaded.x_max) {
+            return noUpdate;
+        }
+
+        const margin = 2 * half * this.prefetchWindows;
+        s.loaded = {
+            filename: filename,
+            half: half,
+            x_min: Math.max(0, range[0] - margin),
+            x_max: range[1] + margin
+        };
+        return { data_range: [s.loaded.x_min, s.loaded.x_max] };
+    }
+};
@@ -0,0 +1,114 @@
+window.dash_clientside = window.dash_clientside || {};
+
+// Связанный зум: диапазон X, выбранный на одном графике, переносится на
+// остальные графики группы (и на все оси X того же графика) в браузере.
+// Сервер только догружает точки нового диапазона - одним запросом на все
+// графики (Store linked-zoom-request, см. callbacks.py Callback 6), диапазоны
+// осей держит браузер (assets/axis_pins.js)
+window.dash_clientside.axis_link = {
+    state: {
+        pending: null,    // {origin, axis, range, charts} - последний зум до debounce
+        timerId: null,
+        expected: {}      // id графика -> ключ диапазона, выставленного нами (защита от петли)
+    },
+
+    debounceMs: 150,
+
+    getGraph: function (chartId) {
+        const div = document.getElementById(chartId);
+        return div ? div.getElementsByClassName('js-plotly-plot')[0] : null;
+    },
+
+    // Изменение диапазона одной из осей X графика (как parse_relayout раньше на сервере).
+    // Возвращает {axis, range} (range = null при сбросе зума) или null
+    parseRelayout: function (relayoutData, axes) {
+        for (const axis of axes) {
+            const start = relayoutData[`${axis}.range[0]`];
+            const end = relayoutData[`${axis}.range[1]`];
+            if (start !== undefined && end !== undefined) {
+                return { axis: axis, range: [start, end] };
+            }
+            if (relayoutData[`${axis}.range`] !== undefined) {
+                return { axis: axis, range: relayoutData[`${axis}.range`].slice() };
+            }
+            if (relayoutData[`${axis}.autorange`] !== undefined) {
+                return { axis: axis, range: null };
+            }
+        }
+        return null;
+    },
+
+    rangeKey: function (range) {
+        return range === null ? 'auto' : JSON.stringify(range);
+    },
+
+    // Callback: relayoutData одного из графиков
+    onRelayout: function (chartId, relayoutData, chartAxes, linkedCharts) {
+        const s = this.state;
+        const axes = chartAxes[chartId];
+        if (!axes || !relayoutData) {
+            return;
+        }
+        const change = this.parseRelayout(relayoutData, axes);
+        if (!change) {
+            return;
+        }
+
+        // relayout, который выставили мы сами, дальше не распространяется
+        const key = this.rangeKey(change.range);
+        if (s.expected[chartId] === key) {
+            delete s.expected[chartId];
+            return;
+        }
+
+        const linked = linkedCharts || [];
+        const charts = linked.includes(chartId) ? linked.filter((id) => chartAxes[id]) : [chartId];
+        s.pending = { origin: chartId, axis: change.axis, range: change.range, charts: charts };
+        if (s.timerId !== null) {
+            clearTimeout(s.timerId);
+        }
+        s.timerId = setTimeout(() => this.flush(chartAxes), this.debounceMs);
+    },
+
+    // Применить последний зум к группе и запросить точки диапазона
+    flush: function (chartAxes) {
+        const s = this.state;
+        const pending = s.pending;
+        s.pending = null;
+        s.timerId = null;
+        if (!pending) {
+            return;
+        }
+
+        const key = this.rangeKey(pending.range);
+        const pins = window.dash_clientside.axis_pins;
+        for (const chartId of pending.charts) {
+            // Диапазон остаётся и после догрузки точек сервером (Patch без осей)
+            pins.set(chartId, chartAxes[chartId], pending.range);
+            const graph = this.getGraph(chartId);
+            if (!graph || !graph._fullLayout) {
+                continue;
+            }
+            const layoutUpdate = {};
+            for (const axis of chartAxes[chartId]) {
+                if (chartId === pending.origin && axis === pending.axis) {
+                    continue;
+                }
+                if (pending.range === null) {
+                    layoutUpdate[`${axis}.autorange`] = true;
+                } else {
+                    layoutUpdate[`${axis}.range`] = pending.range;
+                }
+            }
+            if (Object.keys(layoutUpdate).length === 0) {
+                continue;
+            }
+            s.expected[chartId] = key;
+            Plotly.relayout(graph, layoutUpdate);
+        }
+
+        window.dash_clientside.set_props('linked-zoom-request', {
+            data: { range: pending.range, charts: pending.charts }
+        });
+    }
+};
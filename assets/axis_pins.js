@@ -0,0 +1,58 @@
+window.dash_clientside = window.dash_clientside || {};
+
+// Диапазоны осей X, выставленные в браузере (Active-Track, связанный зум).
+// Сервер догружает в фигуры только точки линий, а dcc.Graph после Patch
+// перерисовывает график через Plotly.react с layout из своего figure, где
+// этих диапазонов нет. Закреплённый диапазон возвращается сразу после
+// отрисовки (plotly_afterplot), до следующего кадра браузера
+window.dash_clientside.axis_pins = {
+    pins: {},  // id графика -> {axes, range} (range = null - autorange)
+
+    getGraph: function (chartId) {
+        const div = document.getElementById(chartId);
+        return div ? div.getElementsByClassName('js-plotly-plot')[0] : null;
+    },
+
+    // Закрепить диапазон на всех осях axes графика
+    set: function (chartId, axes, range) {
+        this.pins[chartId] = { axes: axes, range: range === null ? null : range.slice() };
+        const graph = this.getGraph(chartId);
+        // dcc.Graph может пересоздать div графика - обработчик вешается на каждый
+        if (graph && graph.on && !graph._axisPinsBound) {
+            graph._axisPinsBound = true;
+            graph.on('plotly_afterplot', () => {
+                Promise.resolve().then(() => this.restore(chartId));
+            });
+        }
+    },
+
+    // Смена файла: новые фигуры рисуются со своими диапазонами
+    clear: function () {
+        this.pins = {};
+    },
+
+    restore: function (chartId) {
+        const pin = this.pins[chartId];
+        const graph = this.getGraph(chartId);
+        if (!pin || !graph || !graph._fullLayout) {
+            return;
+        }
+        const layoutUpdate = {};
+        for (const axis of pin.axes) {
+            const current = graph.layout[axis] || {};
+            if (pin.range === null) {
+                if (current.autorange !== true) {
+                    layoutUpdate[`${axis}.autorange`] = true;
+                }
+            } else if (!current.range || current.autorange === true ||
+                       current.range[0] !== pin.range[0] || current.range[1] !== pin.range[1]) {
+                layoutUpdate[`${axis}.range`] = pin.range.slice();
+            }
+        }
+        // Диапазон совпадает (в т.ч. после нашего же update) - повторной отрисовки нет
+        if (Object.keys(layoutUpdate).length > 0) {
+            // Plotly.update, а не relayout: без relayoutData в связанный зум
+            Plotly.update(graph, {}, layoutUpdate);
+        }
+    }
+};
@@ -0,0 +1,92 @@
+window.dash_clientside = window.dash_clientside || {};
+
+// Таймер до закрытия рынка: seconds_till_end всего файла приходит один раз
+// (Store market-timer-data, src/wire_format.py encode_market_timer),
+// обратный отсчёт и фаза считаются в браузере без запросов к серверу
+const PHASE_BASE_STYLE = { marginBottom: '10px' };
+const PHASE_BADGE_STYLE = {
+    display: 'inline-block',
+    padding: '4px 10px',
+    borderRadius: '4px',
+    fontSize: '13px',
+    fontWeight: 'bold'
+};
+
+window.dash_clientside.market_timer = {
+    source: null,   // упакованный массив, из которого декодирован seconds
+    seconds: null,  // Float32Array seconds_till_end по строкам
+    phases: [],     // MARKET_PHASES (src/widgets/market_header.py)
+    lastSeconds: undefined,
+
+    // MM:SS как format_time_till_end в src/schema.py
+    formatTime: function (seconds) {
+        const total = Math.max(0, Math.trunc(seconds));
+        const minutes = String(Math.floor(total / 60)).padStart(2, '0');
+        return `${minutes}:${String(total % 60).padStart(2, '0')}`;
+    },
+
+    // Фаза как get_phase_color в src/widgets/market_header.py
+    findPhase: function (seconds) {
+        if (seconds < 0) {
+            return null;
+        }
+        for (const phase of this.phases) {
+            if (phase.above === null || seconds > phase.above) {
+                return phase;
+            }
+        }
+        return null;
+    },
+
+    // [countdown-display, countdown-seconds, market-phase children, market-phase style]
+    format: function (seconds) {
+        if (seconds === null || seconds === undefined || isNaN(seconds)) {
+            return ['--:--', '(--- сек)', '', PHASE_BASE_STYLE];
+        }
+        const phase = this.findPhase(seconds);
+        if (!phase) {
+            return [this.formatTime(seconds), `(${seconds} сек)`, '', PHASE_BASE_STYLE];
+        }
+        const style = Object.assign({}, PHASE_BASE_STYLE, PHASE_BADGE_STYLE, {
+            backgroundColor: phase.backgroundColor,
+            color: phase.color
+        });
+        if (phase.animation) {
+            style.animation = phase.animation;
+        }
+        return [this.formatTime(seconds), `(${seconds} сек)`, `${phase.phaseIcon} ${phase.phase}`, style];
+    },
+
+    // Callback: слайдер или новый файл
+    update: function (row, timerData, phases) {
+        this.phases = phases || [];
+        if (!timerData || row === null || row === undefined) {
+            this.source = null;
+            this.seconds = null;
+            this.lastSeconds = undefined;
+            return this.format(null);
+        }
+        if (timerData !== this.source) {
+            this.seconds = window.dash_clientside.playback.decodeArray(timerData.seconds_till_end);
+            this.source = timerData;
+        }
+        const seconds = row < this.seconds.length ? this.seconds[row] : NaN;
+        this.lastSeconds = seconds;
+        return this.format(seconds);
+    },
+
+    // Playback: кадр уже содержит seconds_till_end, слайдер обновляется
+    // раз в секунду, поэтому таймер выставляется напрямую (только при смене значения)
+    render: function (seconds) {
+        const value = seconds === null ? NaN : seconds;
+        if (Object.is(value, this.lastSeconds)) {
+            return;
+        }
+        this.lastSeconds = value;
+        const [display, secondsText, phaseText, phaseStyle] = this.format(value);
+        const setProps = window.dash_clientside.set_props;
+        setProps('countdown-display', { children: display });
+        setProps('countdown-seconds', { children: secondsText });
+        setProps('market-phase', { children: phaseText, style: phaseStyle });
+    }
+};
@@ -1,16 +1,45 @@
 window.dash_clientside = window.dash_clientside || {};
+
+// Колоночный формат чанков (src/wire_format.py)
+const CHUNK_FORMAT = 'soa-1';
+const TYPED_ARRAYS = {
+    f4: Float32Array,
+    f8: Float64Array,
+    i1: Int8Array,
+    u1: Uint8Array,
+    i4: Int32Array
+};
+// Тензор уровней: (n, сторона, книга, уровень, price/size)
+const LEVELS_PER_ROW = 2 * 2 * 5;
+const BOOK_TRACES = [
+    // [ключ кадра, сторона, книга, знак x, цвет, цвет аномалии]
+    ['up_bids', 0, 0, -1, 'rgba(0, 200, 83, 0.7)', 'rgba(0, 255, 100, 1)'],
+    ['up_asks', 0, 1, 1, 'rgba(244, 67, 54, 0.7)', 'rgba(255, 100, 100, 1)'],
+    ['down_bids', 1, 0, -1, 'rgba(0, 200, 83, 0.7)', 'rgba(0, 255, 100, 1)'],
+    ['down_asks', 1, 1, 1, 'rgba(244, 67, 54, 0.7)', 'rgba(255, 100, 100, 1)']
+];
+// halfEven - как форматирование f"{s:,.0f}" в Python
+const SIZE_FORMAT = new Intl.NumberFormat('en-US', { maximumFractionDigits: 0, roundingMode: 'halfEven' });
+// Строк в одном запросе чанка
+const CHUNK_ROWS = 500;
+
 window.dash_clientside.playback = {
     // Состояние воспроизведения
     state: {
         isPlaying: false,
-        globalBuffer: [], // Полный буфер данных в памяти JS
+        globalBuffer: [], // Декодированные колоночные чанки, идущие подряд
         globalBufferStartRow: 0, // Индекс первой строки в буфере
+        globalBufferLength: 0, // Число строк во всех чанках буфера
         lastValues: {}, // Последние значения для оптимизации restyle
         fps: 10,
         speed: 1,
         lastFrameTime: 0,
         chunkRequestThreshold: 0.75, // Запрашивать следующий чанк на 75%
         isChunkRequested: false,
+        requestedRange: null, // [start, end) последнего запрошенного чанка
+        filename: null,       // Файл, из которого буфер
+        scrubRow: null,       // Строка слайдера, которую нужно отрисовать вне playback
+        scrubRafId: null,
         totalRows: 0,
         currentGlobalRow: 0,
         lastSliderUpdate: 0,  // Для throttling slider updates
@@ -46,33 +75,127 @@ window.dash_clientside.playback = {
         });
     },
 
-    // Callback: Получение нового batch данных от сервера
-    receiveBatch: function (batchData, requestInfo) {
-        if (!batchData || batchData.length === 0) return;
+    // Декодирование base64 typed array ({dtype, shape, bdata})
+    decodeArray: function (packed) {
+        const binary = atob(packed.bdata);
+        const bytes = new Uint8Array(binary.length);
+        for (let i = 0; i < binary.length; i++) {
+            bytes[i] = binary.charCodeAt(i);
+        }
+        return new TYPED_ARRAYS[packed.dtype](bytes.buffer);
+    },
+
+    // Декодирование колоночного чанка в typed arrays
+    decodeChunk: function (chunk) {
+        const markers = {};
+        for (const name in chunk.markers) {
+            markers[name] = this.decodeArray(chunk.markers[name]);
+        }
+        return {
+            count: chunk.count,
+            barScale: chunk.bar_scale,
+            levels: this.decodeArray(chunk.levels),
+            anomaly: this.decodeArray(chunk.anomaly),
+            buyers: this.decodeArray(chunk.buyers),
+            markers: markers,
+            secondsTillEnd: this.decodeArray(chunk.seconds_till_end),
+            timestamp: chunk.timestamp
+        };
+    },
 
-        console.log(`Received batch: ${batchData.length} frames. Start: ${requestInfo?.start_row}`);
+    // Callback: Получение нового чанка данных от сервера
+    receiveBatch: function (chunk, requestInfo) {
+        if (!chunk || !chunk.count) return;
+        if (chunk.format !== CHUNK_FORMAT) {
+            console.warn(`Unknown chunk format: ${chunk.format}`);
+            return;
+        }
 
         const s = this.state;
+        // Ответ на запрос по предыдущему файлу
+        if (requestInfo && requestInfo.filename && s.filename && requestInfo.filename !== s.filename) {
+            return;
+        }
+
+        const decoded = this.decodeChunk(chunk);
+        console.log(`Received chunk: ${decoded.count} frames. Start: ${requestInfo?.start_row}`);
 
         // Если это первый чанк или новый seek (сброс буфера)
         if (requestInfo && requestInfo.reset) {
-            s.globalBuffer = batchData;
+            s.globalBuffer = [decoded];
             s.globalBufferStartRow = requestInfo.start_row;
-            s.isChunkRequested = false;
+            s.globalBufferLength = decoded.count;
         } else {
             // Append (последовательная подгрузка)
             // Проверяем, стыкуется ли конец текущего с началом нового
-            const currentEndRow = s.globalBufferStartRow + s.globalBuffer.length;
+            const currentEndRow = s.globalBufferStartRow + s.globalBufferLength;
             if (requestInfo && requestInfo.start_row === currentEndRow) {
-                s.globalBuffer = s.globalBuffer.concat(batchData);
-                s.isChunkRequested = false;
+                s.globalBuffer.push(decoded);
+                s.globalBufferLength += decoded.count;
             } else {
                 console.warn("Batch mismatch, resetting buffer");
-                s.globalBuffer = batchData;
+                s.globalBuffer = [decoded];
                 s.globalBufferStartRow = requestInfo ? requestInfo.start_row : 0;
-                s.isChunkRequested = false;
+                s.globalBufferLength = decoded.count;
             }
         }
+        s.isChunkRequested = false;
+
+        // Слайдер ждал этот чанк (перемотка за пределы буфера)
+        if (!s.isPlaying && s.scrubRow !== null) {
+            this.scheduleScrub();
+        }
+    },
+
+    // Сборка кадра (формат trace_data) из колоночного буфера
+    getFrame: function (row) {
+        const s = this.state;
+        let localIdx = row - s.globalBufferStartRow;
+        for (const chunk of s.globalBuffer) {
+            if (localIdx < chunk.count) {
+                return this.buildFrame(chunk, localIdx, row);
+            }
+            localIdx -= chunk.count;
+        }
+        return null;
+    },
+
+    buildFrame: function (chunk, i, row) {
+        const frame = {
+            timestamp: chunk.timestamp[i],
+            row_idx: row,
+            up_pressure: chunk.buyers[i * 2] ? 'BUYERS' : 'SELLERS',
+            down_pressure: chunk.buyers[i * 2 + 1] ? 'BUYERS' : 'SELLERS'
+        };
+
+        for (const [key, side, book, sign, baseColor, anomalyColor] of BOOK_TRACES) {
+            const trace = { y: [], x: [], text: [], colors: [] };
+            for (let level = 0; level < 5; level++) {
+                const bit = (i * LEVELS_PER_ROW) + (side * 2 + book) * 5 + level;
+                const price = chunk.levels[bit * 2];
+                const size = chunk.levels[bit * 2 + 1];
+                const isAnomaly = (chunk.anomaly[bit >> 3] >> (bit & 7)) & 1;
+
+                trace.y.push(isNaN(price) ? 'N/A' : price.toFixed(2));
+                trace.x.push(isNaN(size) ? 0 : sign * Math.abs(size) * chunk.barScale);
+                trace.text.push(isNaN(size) ? '' : '$' + SIZE_FORMAT.format(size));
+                trace.colors.push(isAnomaly ? anomalyColor : baseColor);
+            }
+            frame[key] = trace;
+        }
+
+        for (const name in chunk.markers) {
+            const values = chunk.markers[name];
+            const value = values[i];
+            // float32 -> 7 значащих цифр, чтобы hover не показывал артефакты округления
+            const y = values instanceof Float32Array ? parseFloat(value.toPrecision(7)) : value;
+            frame[`${name}_x`] = isNaN(value) ? [] : [row];
+            frame[`${name}_y`] = isNaN(value) ? [] : [y];
+        }
+
+        const seconds = chunk.secondsTillEnd[i];
+        frame.seconds_till_end = isNaN(seconds) ? null : seconds;
+        return frame;
     },
 
     // Callback: Управление состоянием (Play/Pause/Seek)
@@ -118,7 +241,7 @@ window.dash_clientside.playback = {
     isRowInBuffer: function (rowIdx) {
         const s = this.state;
         return rowIdx >= s.globalBufferStartRow &&
-            rowIdx < (s.globalBufferStartRow + s.globalBuffer.length);
+            rowIdx < (s.globalBufferStartRow + s.globalBufferLength);
     },
 
     // Запуск цикла воспроизведения (RAF или setInterval)
@@ -206,21 +329,22 @@ window.dash_clientside.playback = {
 
         // Получаем данные кадра
         const localIdx = row - s.globalBufferStartRow;
-        const frameData = s.globalBuffer[localIdx];
+        const frameData = this.getFrame(row);
 
         if (frameData) {
             this.updateCharts(frameData);
+            this.updateTimer(frameData);
             this.updateSlider(row); // Синхронизация слайдера
         }
 
         // Double buffering: если прошли 75% текущего буфера - грузим следующий
         // Но нужно считать не от начала глобального буфера, а от последнего подгруженного чанка?
         // Проще: если осталось меньше N кадров до конца буфера
-        const framesLeft = s.globalBuffer.length - localIdx;
+        const framesLeft = s.globalBufferLength - localIdx;
         const threshold = 150; // За 150 кадров (1.5 сек при x10)
 
         if (framesLeft < threshold && !s.isChunkRequested) {
-            const nextChunkStart = s.globalBufferStartRow + s.globalBuffer.length;
+            const nextChunkStart = s.globalBufferStartRow + s.globalBufferLength;
             if (nextChunkStart < s.totalRows) {
                 this.requestChunk(nextChunkStart, false);
             }
@@ -233,15 +357,76 @@ window.dash_clientside.playback = {
     requestChunk: function (startRow, reset) {
         console.log(`Requesting chunk: ${startRow}, reset=${reset}`);
         this.state.isChunkRequested = true;
+        this.state.requestedRange = [startRow, startRow + CHUNK_ROWS];
 
         // Используем dash_clientside.set_props для обновления Store
         // Требует Dash 2.11+
         window.dash_clientside.set_props(
             'playback-chunk-request',
-            { data: { start_row: startRow, count: 500, reset: reset } }
+            { data: { start_row: startRow, count: CHUNK_ROWS, reset: reset } }
         );
     },
 
+    // Callback: ручное движение слайдера (вне playback).
+    // Кадр берётся из буфера; если строки в нём нет - запрашивается чанк
+    // с центром в новой позиции, кадр отрисуется при его получении
+    scrub: function (row, filename, sliderMax) {
+        const s = this.state;
+        if (s.isPlaying || row === null || row === undefined) {
+            return;
+        }
+        s.totalRows = sliderMax || s.totalRows;
+        if (filename !== s.filename) {
+            // Новый файл: буфер и запросы старого файла недействительны
+            s.filename = filename;
+            s.globalBuffer = [];
+            s.globalBufferStartRow = 0;
+            s.globalBufferLength = 0;
+            s.requestedRange = null;
+            s.isChunkRequested = false;
+        }
+        if (!filename) {
+            return;
+        }
+
+        s.scrubRow = row;
+        if (this.isRowInBuffer(row)) {
+            this.scheduleScrub();
+
+            // Подгрузка вперёд, пока слайдер тянут к концу буфера
+            const bufferEnd = s.globalBufferStartRow + s.globalBufferLength;
+            if (bufferEnd - row < CHUNK_ROWS / 4 && bufferEnd < s.totalRows && !s.isChunkRequested) {
+                this.requestChunk(bufferEnd, false);
+            }
+            return;
+        }
+
+        const requested = s.requestedRange;
+        if (s.isChunkRequested && requested && row >= requested[0] && row < requested[1]) {
+            return; // Нужный чанк уже запрошен
+        }
+        this.requestChunk(Math.max(0, row - CHUNK_ROWS / 2), true);
+    },
+
+    // Кадр слайдера рисуется в requestAnimationFrame: при перетаскивании
+    // слайдера на кадр браузера приходится не больше одного restyle
+    scheduleScrub: function () {
+        const s = this.state;
+        if (s.scrubRafId !== null) {
+            return;
+        }
+        s.scrubRafId = requestAnimationFrame(() => {
+            s.scrubRafId = null;
+            const row = s.scrubRow;
+            if (s.isPlaying || row === null || !this.isRowInBuffer(row)) {
+                return;
+            }
+            s.scrubRow = null;
+            s.currentGlobalRow = row;
+            this.updateCharts(this.getFrame(row));
+        });
+    },
+
     // Обновление графиков через Plotly.restyle
     updateCharts: function (data) {
         // Orderbook Chart (chart-orderbook)
@@ -252,7 +437,7 @@ window.dash_clientside.playback = {
             // Подготовка массивов для restyle
             // Indices: 0=UP Bids, 1=UP Asks, 2=DOWN Bids, 3=DOWN Asks
             // Markers: 6=UP Ask M, 7=DOWN Ask M
-            // См. callbacks.py update_orderbook_on_slider
+            // См. callbacks.py, Callback 3
 
             const update = {
                 'x': [data.up_bids.x, data.up_asks.x, data.down_bids.x, data.down_asks.x],
@@ -273,8 +458,10 @@ window.dash_clientside.playback = {
             Plotly.restyle(obGraph, mUpdate, mTraces);
 
             // Заголовок (layout update)
+            // Plotly.update вместо relayout: plotly_relayout отправил бы relayoutData
+            // в связанный зум (assets/axis_link.js) на каждом кадре
             const title = `Orderbook @ ${data.timestamp}<br><sub>UP: ${data.up_pressure} | DOWN: ${data.down_pressure}</sub>`;
-            Plotly.relayout(obGraph, { 'title.text': title });
+            Plotly.update(obGraph, {}, { 'title.text': title });
         }
 
         // BTC Chart (chart-btc)
@@ -297,6 +484,14 @@ window.dash_clientside.playback = {
         // No dynamic markers to update - just static lines
     },
 
+    // Таймер до закрытия рынка (assets/market_timer.js), без запросов к серверу
+    updateTimer: function (data) {
+        const timer = window.dash_clientside.market_timer;
+        if (timer && timer.render) {
+            timer.render(data.seconds_till_end);
+        }
+    },
+
     // Синхронизация слайдера (визуальная)
     updateSlider: function (row) {
         // ОПТИМИЗАЦИЯ: Обновляем слайдер РЕДКО (раз в секунду), не каждый кадр!
@@ -0,0 +1,67 @@
+"""
+Время построения начальных фигур: полный create_*_chart против скелета виджета.
+
+Для каждого виджета фигура строится заново на свежем DataFrame (кеш рядов
+src/series.py пуст), скелеты при этом уже скомпилированы - как для второго
+и следующих файлов в процессе сервера.
+
+Использование:
+    python -m benchmarks.bench_figure_skeleton
+    python -m benchmarks.bench_figure_skeleton --file btc-updown-15m-1967869.csv --repeat 5
+"""
+
+import argparse
+import time
+
+from src.data_loader import FILES_DIR, get_csv_files, load_data
+from src.figure_cache import FIGURE_WIDGETS, build_figure_json
+
+
+def time_build(filename, widget, use_skeleton, repeat):
+    """Лучшее время построения JSON фигуры из repeat попыток (с чтением рядов)."""
+    best = float('inf')
+    figure_json = None
+    for _ in range(repeat):
+        df = load_data(filename)
+        start = time.perf_counter()
+        figure_json = build_figure_json(df, widget, use_skeleton=use_skeleton)
+        best = min(best, time.perf_counter() - start)
+    return best, figure_json
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Сравнение полного построения фигур и сборки по скелету'
+    )
+    parser.add_argument('--file', type=str, default=None, help='Имя файла в FILES_DIR (по умолчанию первый)')
+    parser.add_argument('--repeat', type=int, default=3, help='Попыток на виджет (берётся лучшая)')
+    args = parser.parse_args()
+
+    files = [args.file] if args.file else get_csv_files()[:1]
+    if not files:
+        print(f"Нет CSV файлов в {FILES_DIR}")
+        return
+
+    filename = files[0]
+    # Первый проход компилирует скелеты
+    warm_df = load_data(filename)
+    for widget in FIGURE_WIDGETS:
+        build_figure_json(warm_df, widget)
+
+    print(f"Файл: {filename} ({len(warm_df)} строк)\n")
+    print(f"{'widget':>20} {'full s':>9} {'skeleton s':>11} {'speedup':>8} {'identical':>10}")
+
+    total_full = total_skeleton = 0.0
+    for widget in FIGURE_WIDGETS:
+        full_time, full_json = time_build(filename, widget, False, args.repeat)
+        skeleton_time, skeleton_json = time_build(filename, widget, True, args.repeat)
+        total_full += full_time
+        total_skeleton += skeleton_time
+        print(f"{widget:>20} {full_time:>9.4f} {skeleton_time:>11.4f} "
+              f"{full_time / skeleton_time:>7.1f}x {str(full_json == skeleton_json):>10}")
+
+    print(f"{'total':>20} {total_full:>9.4f} {total_skeleton:>11.4f} {total_full / total_skeleton:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Сравнение времени загрузки рынка: CSV против колоночной (Parquet) копии.
+
+Использование:
+    python -m benchmarks.bench_load
+    python -m benchmarks.bench_load --file btc-updown-15m-1967869.csv --repeat 5
+"""
+
+import argparse
+import os
+import time
+
+import pandas as pd
+
+from src.data_loader import FILES_DIR, get_csv_files, get_columnar_path, convert_to_columnar
+
+
+def best_time(func, repeat):
+    """Минимальное время выполнения func из repeat запусков (секунды)."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_file(filename, repeat):
+    """Замерить загрузку одного файла из CSV и из Parquet копии."""
+    csv_path = os.path.join(FILES_DIR, filename)
+    columnar_path = get_columnar_path(filename)
+    if not os.path.exists(columnar_path):
+        convert_to_columnar(filename)
+
+    csv_time = best_time(lambda: pd.read_csv(csv_path), repeat)
+    columnar_time = best_time(lambda: pd.read_parquet(columnar_path), repeat)
+
+    return {
+        'filename': filename,
+        'csv_mb': os.path.getsize(csv_path) / 1e6,
+        'columnar_mb': os.path.getsize(columnar_path) / 1e6,
+        'csv_s': csv_time,
+        'columnar_s': columnar_time,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Сравнение загрузки CSV и Parquet копий рынков'
+    )
+    parser.add_argument('--file', type=str, default=None, help='Имя файла в FILES_DIR (по умолчанию все)')
+    parser.add_argument('--limit', type=int, default=10, help='Максимум файлов для замера')
+    parser.add_argument('--repeat', type=int, default=3, help='Число повторов на файл')
+    args = parser.parse_args()
+
+    files = [args.file] if args.file else get_csv_files()[:args.limit]
+    if not files:
+        print(f"Нет CSV файлов в {FILES_DIR}")
+        return
+
+    print(f"{'file':<40} {'csv MB':>8} {'pq MB':>8} {'csv s':>8} {'pq s':>8} {'speedup':>8}")
+    total_csv = total_columnar = 0.0
+    for filename in files:
+        r = bench_file(filename, args.repeat)
+        total_csv += r['csv_s']
+        total_columnar += r['columnar_s']
+        print(
+            f"{r['filename']:<40} {r['csv_mb']:>8.1f} {r['columnar_mb']:>8.1f} "
+            f"{r['csv_s']:>8.3f} {r['columnar_s']:>8.3f} {r['csv_s'] / r['columnar_s']:>7.1f}x"
+        )
+
+    print(f"\nИтого: CSV {total_csv:.3f} s, Parquet {total_columnar:.3f} s, "
+          f"ускорение {total_csv / total_columnar:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,11 +3,19 @@ Callbacks Module
 Callback функции для интерактивности Dash приложения
 """
 
+import json
 import time
-from dash import html, callback, Output, Input, State, ctx, no_update, Patch
-from .data_loader import load_data, compute_cumulative_times
-from .charts import create_orderbook_chart, create_arbitrage_indicator_chart, create_spread_chart, create_imbalance_chart, create_microprice_chart, create_slope_chart, create_eatflow_chart, create_depth_chart, create_btc_chart, create_latency_direction_chart, create_returns_chart, create_volume_chart, create_volatility_chart, create_volume_spike_chart, create_p_vwap_chart
+from dash import html, callback, Output, Input, State, ctx, no_update
+from .data_loader import compute_cumulative_times
 from .data_cache import get_data_cache
+from .wire_format import encode_trace_chunk, encode_market_timer
+from .catalog import get_market_info
+from .prefetch import get_prefetcher
+from .zoom import ZOOM_CHARTS, build_window_patch
+from .render_mode import line_trace_type, build_render_mode_patch
+from .figure_cache import get_figure_cache, widget_chart_id, FIGURE_WIDGETS
+from .widgets.market_header import MARKET_PHASES
+from .metrics import instrument_callbacks
 
 
 # Стили для кнопки Play/Pause
@@ -35,6 +43,9 @@ PAUSE_BTN_STYLE = {
     'minWidth': '100px'
 }
 
+# Оси X графиков с рядами для clientside Active-Track и связанного зума: id графика -> [оси]
+ACTIVE_TRACK_AXES = {chart_id: list(axes) for chart_id, (axes, _) in ZOOM_CHARTS.items()}
+
 def register_callbacks(app):
     """
     Зарегистрировать все callback функции
@@ -46,6 +57,7 @@ def register_callbacks(app):
     @callback(
         [
             Output('cumulative-times', 'data'),
+            Output('market-timer-data', 'data'),
             Output('time-slider', 'max'),
             Output('time-slider', 'marks'),
             Output('time-slider', 'value'),
@@ -65,17 +77,21 @@ def register_callbacks(app):
             Output('chart-volume-spike', 'figure'),
             Output('chart-p-vwap', 'figure')
         ],
-        Input('file-selector', 'value')
+        Input('file-selector', 'value'),
+        State('render-mode-selector', 'value')
     )
-    def init_on_file_change(filename):
+    def init_on_file_change(filename, render_mode):
         """Инициализировать все компоненты при смене файла"""
         if not filename:
             empty_fig = {'data': [], 'layout': {'paper_bgcolor': '#1e1e1e', 'plot_bgcolor': '#2d2d2d'}}
-            return [], 0, {}, 0, empty_fig, empty_fig, empty_fig, empty_fig, empty_fig, empty_fig, empty_fig, empty_fig, empty_fig, empty_fig, empty_fig, empty_fig, empty_fig, empty_fig, empty_fig
+            return [], None, 0, {}, 0, empty_fig, empty_fig, empty_fig, empty_fig, empty_fig, empty_fig, empty_fig, empty_fig, empty_fig, empty_fig, empty_fig, empty_fig, empty_fig, empty_fig, empty_fig
 
         cache = get_data_cache()
         df = cache.get_df(filename)
+        # Соседние и свежие рынки грузятся в фоне, пока строятся графики
+        get_prefetcher().schedule(filename)
         cumulative_times = compute_cumulative_times(df)
+        figure_cache = get_figure_cache()
 
         max_val = len(df) - 1
         # Создаем только 5 меток для лучшей читаемости
@@ -85,24 +101,15 @@ def register_callbacks(app):
             for i in range(0, max_val + 1, step)
         }
 
-        # Создаем начальные графики (десять независимых)
-        ob_fig = create_orderbook_chart(df, 0)
-        arbitrage_indicator_fig = create_arbitrage_indicator_chart(df, 0)
-        spread_fig = create_spread_chart(df, 0)
-        imbalance_fig = create_imbalance_chart(df, 0)
-        microprice_fig = create_microprice_chart(df, 0)
-        slope_fig = create_slope_chart(df, 0)
-        eatflow_fig = create_eatflow_chart(df, 0)
-        depth_fig = create_depth_chart(df, 0)
-        btc_fig = create_btc_chart(df, 0)
-        latency_direction_fig = create_latency_direction_chart(df, 0)
-        returns_fig = create_returns_chart(df, 0)
-        volume_fig = create_volume_chart(df, 0)
-        volatility_fig = create_volatility_chart(df, 0)
-        volume_spike_fig = create_volume_spike_chart(df, 0)
-        p_vwap_fig = create_p_vwap_chart(df, 0)
+        # Начальные графики: из кеша фигур (память -> диск), строятся только при промахе.
+        # Тип трасс линий (SVG/WebGL) входит в ключ кеша, JSON отдаётся без разбора
+        trace_types = {
+            widget: line_trace_type(df, widget_chart_id(widget), render_mode)
+            for widget in FIGURE_WIDGETS
+        }
+        figures = figure_cache.get_figures(filename, lambda: df, trace_types=trace_types)
 
-        return cumulative_times, max_val, marks, 0, ob_fig, arbitrage_indicator_fig, spread_fig, imbalance_fig, microprice_fig, slope_fig, eatflow_fig, depth_fig, btc_fig, latency_direction_fig, returns_fig, volume_fig, volatility_fig, volume_spike_fig, p_vwap_fig
+        return [cumulative_times, encode_market_timer(df), max_val, marks, 0, *figures]
 
     # ========================================
     # Callback 2: Обработка Play/Pause кнопки
@@ -158,7 +165,7 @@ def register_callbacks(app):
             return new_state, '▶ Play', PLAY_BTN_STYLE
 
     # ========================================
-    # Callback 3: Обновление Orderbook графика через Patch
+    # Callback 3: Clientside - Orderbook и BTC при ручном движении слайдера
     # ========================================
     #
     # Trace indices in orderbook chart (create_orderbook_figure):
@@ -171,365 +178,6 @@ def register_callbacks(app):
     #   6: Current UP Ask marker
     #   7: Current DOWN Ask marker
     #
-    @callback(
-        Output('chart-orderbook', 'figure', allow_duplicate=True),
-        Input('time-slider', 'value'),
-        [
-            State('file-selector', 'value'),
-            State('playback-state', 'data'),  # ДОБАВЛЕНО: проверка playback
-            State('active-track-checklist', 'value'),
-            State('active-track-zoom-slider', 'value')
-        ],
-        prevent_initial_call=True
-    )
-    def update_orderbook_on_slider(slider_value, filename, playback_state, active_track, zoom_level):
-        """Обновить Orderbook только при РУЧНОМ движении слайдера"""
-
-        # ДОБАВЛЕНО: Skip if playback is active (JS handles updates)
-        if playback_state and playback_state.get('is_playing'):
-            return no_update
-
-        if not filename:
-            return no_update
-
-        cache = get_data_cache()
-        trace_data = cache.compute_trace_data(filename, slider_value)
-
-        patched_fig = Patch()
-
-        # Active-Track: авто-скролл ask prices
-        if active_track and 'enabled' in active_track:
-            half_window = zoom_level if zoom_level else 150
-            x_min = max(0, slider_value - half_window)
-            x_max = slider_value + half_window
-            patched_fig['layout']['xaxis3']['range'] = [x_min, x_max]  # Ask prices chart (row 2)
-
-        # UP Bids (trace 0)
-        patched_fig['data'][0]['y'] = trace_data['up_bids']['y']
-        patched_fig['data'][0]['x'] = trace_data['up_bids']['x']
-        patched_fig['data'][0]['text'] = trace_data['up_bids']['text']
-        patched_fig['data'][0]['marker']['color'] = trace_data['up_bids']['colors']
-
-        # UP Asks (trace 1)
-        patched_fig['data'][1]['y'] = trace_data['up_asks']['y']
-        patched_fig['data'][1]['x'] = trace_data['up_asks']['x']
-        patched_fig['data'][1]['text'] = trace_data['up_asks']['text']
-        patched_fig['data'][1]['marker']['color'] = trace_data['up_asks']['colors']
-
-        # DOWN Bids (trace 2)
-        patched_fig['data'][2]['y'] = trace_data['down_bids']['y']
-        patched_fig['data'][2]['x'] = trace_data['down_bids']['x']
-        patched_fig['data'][2]['text'] = trace_data['down_bids']['text']
-        patched_fig['data'][2]['marker']['color'] = trace_data['down_bids']['colors']
-
-        # DOWN Asks (trace 3)
-        patched_fig['data'][3]['y'] = trace_data['down_asks']['y']
-        patched_fig['data'][3]['x'] = trace_data['down_asks']['x']
-        patched_fig['data'][3]['text'] = trace_data['down_asks']['text']
-        patched_fig['data'][3]['marker']['color'] = trace_data['down_asks']['colors']
-
-        # Current UP Ask marker (trace 6)
-        patched_fig['data'][6]['x'] = trace_data['up_ask_price_x']
-        patched_fig['data'][6]['y'] = trace_data['up_ask_price_y']
-
-        # Current DOWN Ask marker (trace 7)
-        patched_fig['data'][7]['x'] = trace_data['down_ask_price_x']
-        patched_fig['data'][7]['y'] = trace_data['down_ask_price_y']
-
-        # Заголовок
-        patched_fig['layout']['title']['text'] = "Orderbook"
-
-        return patched_fig
-
-    # ========================================
-    # Callback 4b: Обновление Arbitrage Indicator графика через Patch
-    # ========================================
-    @callback(
-        Output('chart-arbitrage-indicator', 'figure', allow_duplicate=True),
-        Input('time-slider', 'value'),
-        [
-            State('file-selector', 'value'),
-            State('playback-state', 'data'),
-            State('active-track-checklist', 'value'),
-            State('active-track-zoom-slider', 'value')
-        ],
-        prevent_initial_call=True
-    )
-    def update_arbitrage_indicator_on_slider(slider_value, filename, playback_state, active_track, zoom_level):
-        """
-        Обновить график Arbitrage Indicator при изменении слайдера.
-        Пропускает обновление во время playback.
-        """
-        # Пропустить если идёт playback
-        if playback_state and playback_state.get('is_playing'):
-            return no_update
-
-        if not filename:
-            return no_update
-
-        patched_fig = Patch()
-
-        # Active-Track: автопрокрутка по X
-        if active_track and 'enabled' in active_track:
-            half_window = zoom_level if zoom_level else 150
-            x_min = max(0, slider_value - half_window)
-            x_max = slider_value + half_window
-            patched_fig['layout']['xaxis']['range'] = [x_min, x_max]
-
-        # Обновить заголовок
-        patched_fig['layout']['title']['text'] = "Arbitrage Indicator (Арбитраж)"
-
-        return patched_fig
-
-
-    # ========================================
-    # Callback 4b-new: Обновление Spread графика через Patch
-    # ========================================
-    @callback(
-        Output('chart-spread', 'figure', allow_duplicate=True),
-        Input('time-slider', 'value'),
-        [
-            State('file-selector', 'value'),
-            State('playback-state', 'data'),
-            State('active-track-checklist', 'value'),
-            State('active-track-zoom-slider', 'value')
-        ],
-        prevent_initial_call=True
-    )
-    def update_spread_on_slider(slider_value, filename, playback_state, active_track, zoom_level):
-        """
-        Обновить график Spread при изменении слайдера.
-        Пропускает обновление во время playback.
-        """
-        # Пропустить если идёт playback
-        if playback_state and playback_state.get('is_playing'):
-            return no_update
-
-        if not filename:
-            return no_update
-
-        patched_fig = Patch()
-
-        # Active-Track: автопрокрутка по X
-        if active_track and 'enabled' in active_track:
-            half_window = zoom_level if zoom_level else 150
-            x_min = max(0, slider_value - half_window)
-            x_max = slider_value + half_window
-            patched_fig['layout']['xaxis']['range'] = [x_min, x_max]
-
-        # Обновить заголовок
-        patched_fig['layout']['title']['text'] = "Spread (Спред)"
-
-        return patched_fig
-
-
-    # ========================================
-    # Callback 4b-new2: Обновление Imbalance графика через Patch
-    # ========================================
-    @callback(
-        Output('chart-imbalance', 'figure', allow_duplicate=True),
-        Input('time-slider', 'value'),
-        [
-            State('file-selector', 'value'),
-            State('playback-state', 'data'),
-            State('active-track-checklist', 'value'),
-            State('active-track-zoom-slider', 'value')
-        ],
-        prevent_initial_call=True
-    )
-    def update_imbalance_on_slider(slider_value, filename, playback_state, active_track, zoom_level):
-        """
-        Обновить график Imbalance при изменении слайдера.
-        Пропускает обновление во время playback.
-        """
-        # Пропустить если идёт playback
-        if playback_state and playback_state.get('is_playing'):
-            return no_update
-
-        if not filename:
-            return no_update
-
-        patched_fig = Patch()
-
-        # Active-Track: автопрокрутка по X
-        if active_track and 'enabled' in active_track:
-            half_window = zoom_level if zoom_level else 150
-            x_min = max(0, slider_value - half_window)
-            x_max = slider_value + half_window
-            patched_fig['layout']['xaxis']['range'] = [x_min, x_max]
-
-        # Обновить заголовок
-        patched_fig['layout']['title']['text'] = "Imbalance (Имбаланс)"
-
-        return patched_fig
-
-
-    # ========================================
-    # Callback 4b-new3: Обновление Microprice графика через Patch
-    # ========================================
-    @callback(
-        Output('chart-microprice', 'figure', allow_duplicate=True),
-        Input('time-slider', 'value'),
-        [
-            State('file-selector', 'value'),
-            State('playback-state', 'data'),
-            State('active-track-checklist', 'value'),
-            State('active-track-zoom-slider', 'value')
-        ],
-        prevent_initial_call=True
-    )
-    def update_microprice_on_slider(slider_value, filename, playback_state, active_track, zoom_level):
-        """
-        Обновить график Microprice при изменении слайдера.
-        Пропускает обновление во время playback.
-        """
-        # Пропустить если идёт playback
-        if playback_state and playback_state.get('is_playing'):
-            return no_update
-
-        if not filename:
-            return no_update
-
-        patched_fig = Patch()
-
-        # Active-Track: автопрокрутка по X
-        if active_track and 'enabled' in active_track:
-            half_window = zoom_level if zoom_level else 150
-            x_min = max(0, slider_value - half_window)
-            x_max = slider_value + half_window
-            patched_fig['layout']['xaxis']['range'] = [x_min, x_max]
-
-        # Обновить заголовок
-        patched_fig['layout']['title']['text'] = "Microprice (Микроцена)"
-
-        return patched_fig
-
-
-    # ========================================
-    # Callback 4b-new4: Обновление Slope графика через Patch
-    # ========================================
-    @callback(
-        Output('chart-slope', 'figure', allow_duplicate=True),
-        Input('time-slider', 'value'),
-        [
-            State('file-selector', 'value'),
-            State('playback-state', 'data'),
-            State('active-track-checklist', 'value'),
-            State('active-track-zoom-slider', 'value')
-        ],
-        prevent_initial_call=True
-    )
-    def update_slope_on_slider(slider_value, filename, playback_state, active_track, zoom_level):
-        """
-        Обновить график Slope при изменении слайдера.
-        Пропускает обновление во время playback.
-        """
-        # Пропустить если идёт playback
-        if playback_state and playback_state.get('is_playing'):
-            return no_update
-
-        if not filename:
-            return no_update
-
-        patched_fig = Patch()
-
-        # Active-Track: автопрокрутка по X
-        if active_track and 'enabled' in active_track:
-            half_window = zoom_level if zoom_level else 150
-            x_min = max(0, slider_value - half_window)
-            x_max = slider_value + half_window
-            patched_fig['layout']['xaxis']['range'] = [x_min, x_max]
-
-        # Обновить заголовок
-        patched_fig['layout']['title']['text'] = "Slope (Наклон)"
-
-        return patched_fig
-
-
-    # ========================================
-    # Callback 4b-new5: Обновление EatFlow графика через Patch
-    # ========================================
-    @callback(
-        Output('chart-eatflow', 'figure', allow_duplicate=True),
-        Input('time-slider', 'value'),
-        [
-            State('file-selector', 'value'),
-            State('playback-state', 'data'),
-            State('active-track-checklist', 'value'),
-            State('active-track-zoom-slider', 'value')
-        ],
-        prevent_initial_call=True
-    )
-    def update_eatflow_on_slider(slider_value, filename, playback_state, active_track, zoom_level):
-        """
-        Обновить график EatFlow при изменении слайдера.
-        Пропускает обновление во время playback.
-        """
-        # Пропустить если идёт playback
-        if playback_state and playback_state.get('is_playing'):
-            return no_update
-
-        if not filename:
-            return no_update
-
-        patched_fig = Patch()
-
-        # Active-Track: автопрокрутка по X
-        if active_track and 'enabled' in active_track:
-            half_window = zoom_level if zoom_level else 150
-            x_min = max(0, slider_value - half_window)
-            x_max = slider_value + half_window
-            patched_fig['layout']['xaxis']['range'] = [x_min, x_max]
-
-        # Обновить заголовок
-        patched_fig['layout']['title']['text'] = "EatFlow (Скорость поедания)"
-
-        return patched_fig
-
-    # ========================================
-    # Callback 4b2: Обновление Depth графика через Patch
-    # ========================================
-    @callback(
-        Output('chart-depth', 'figure', allow_duplicate=True),
-        Input('time-slider', 'value'),
-        [
-            State('file-selector', 'value'),
-            State('playback-state', 'data'),
-            State('active-track-checklist', 'value'),
-            State('active-track-zoom-slider', 'value')
-        ],
-        prevent_initial_call=True
-    )
-    def update_depth_on_slider(slider_value, filename, playback_state, active_track, zoom_level):
-        """
-        Обновить график Depth при изменении слайдера.
-        Пропускает обновление во время playback.
-        """
-        # Пропустить если идёт playback
-        if playback_state and playback_state.get('is_playing'):
-            return no_update
-
-        if not filename:
-            return no_update
-
-        patched_fig = Patch()
-
-        # Active-Track: автопрокрутка по X
-        if active_track and 'enabled' in active_track:
-            half_window = zoom_level if zoom_level else 150
-            x_min = max(0, slider_value - half_window)
-            x_max = slider_value + half_window
-            patched_fig['layout']['xaxis']['range'] = [x_min, x_max]
-
-        # Обновить заголовок
-        patched_fig['layout']['title']['text'] = "Depth (Глубина ликвидности)"
-
-        return patched_fig
-
-    # ========================================
-    # Callback 4c: Обновление BTC графика через Patch
-    # ========================================
-    #
     # Trace indices in btc chart (create_btc_figure):
     #   0: Binance BTC line
     #   1: Oracle BTC line
@@ -538,313 +186,103 @@ def register_callbacks(app):
     #   4: Lag line
     #   5: Current Lag marker
     #
-    @callback(
-        Output('chart-btc', 'figure', allow_duplicate=True),
-        Input('time-slider', 'value'),
-        [
-            State('file-selector', 'value'),
-            State('playback-state', 'data'),  # ДОБАВЛЕНО: проверка playback
-            State('active-track-checklist', 'value'),
-            State('active-track-zoom-slider', 'value')
-        ],
-        prevent_initial_call=True
-    )
-    def update_btc_on_slider(slider_value, filename, playback_state, active_track, zoom_level):
-        """Обновить BTC только при РУЧНОМ движении слайдера"""
-
-        # ДОБАВЛЕНО: Skip if playback is active (JS handles updates)
-        if playback_state and playback_state.get('is_playing'):
-            return no_update
-
-        if not filename:
-            return no_update
-
-        cache = get_data_cache()
-        trace_data = cache.compute_trace_data(filename, slider_value)
-
-        patched_fig = Patch()
-
-        # Active-Track: авто-скролл btc price + lag
-        if active_track and 'enabled' in active_track:
-            half_window = zoom_level if zoom_level else 150
-            x_min = max(0, slider_value - half_window)
-            x_max = slider_value + half_window
-            patched_fig['layout']['xaxis']['range'] = [x_min, x_max]   # BTC price (row 1)
-            patched_fig['layout']['xaxis2']['range'] = [x_min, x_max]  # Lag (row 2)
-
-        # Current Binance marker (trace 2)
-        patched_fig['data'][2]['x'] = trace_data['binance_price_x']
-        patched_fig['data'][2]['y'] = trace_data['binance_price_y']
-
-        # Current Oracle marker (trace 3)
-        patched_fig['data'][3]['x'] = trace_data['oracle_price_x']
-        patched_fig['data'][3]['y'] = trace_data['oracle_price_y']
-
-        # Current Lag marker (trace 5)
-        patched_fig['data'][5]['x'] = trace_data['lag_x']
-        patched_fig['data'][5]['y'] = trace_data['lag_y']
-
-        # Заголовок BTC
-        patched_fig['layout']['title']['text'] = "BTC Price & Lag"
-
-        return patched_fig
-
-    # ========================================
-    # Callback 4c: Обновление Latency Direction графика через Patch
-    # ========================================
-    @callback(
-        Output('chart-latency-direction', 'figure', allow_duplicate=True),
-        Input('time-slider', 'value'),
-        [
-            State('file-selector', 'value'),
-            State('playback-state', 'data'),
-            State('active-track-checklist', 'value'),
-            State('active-track-zoom-slider', 'value')
-        ],
-        prevent_initial_call=True
-    )
-    def update_latency_direction_on_slider(slider_value, filename, playback_state, active_track, zoom_level):
-        """
-        Обновить график Latency Direction при изменении слайдера.
-        Пропускает обновление во время playback.
+    # Кадр (стаканы, маркеры, заголовок с давлением) рисует playback engine
+    # из буфера чанков - как при воспроизведении. Сервер нужен только при
+    # перемотке за пределы буфера: запрашивается чанк с центром в новой позиции
+    app.clientside_callback(
         """
-        # Пропустить если идёт playback
-        if playback_state and playback_state.get('is_playing'):
-            return no_update
-
-        if not filename:
-            return no_update
-
-        patched_fig = Patch()
-
-        # Active-Track: автопрокрутка по X
-        if active_track and 'enabled' in active_track:
-            half_window = zoom_level if zoom_level else 150
-            x_min = max(0, slider_value - half_window)
-            x_max = slider_value + half_window
-            patched_fig['layout']['xaxis']['range'] = [x_min, x_max]
-
-        # Обновить заголовок
-        patched_fig['layout']['title']['text'] = "Latency Direction (запаздывание оракула)"
-
-        return patched_fig
-
-    # ========================================
-    # Callback 4d: Обновление Returns графика через Patch
-    # ========================================
-    #
-    # Trace indices in returns chart (create_returns_figure):
-    #   0: Ret5s line (сглаженный тренд)
-    #   1: Ret1s line (быстрый сигнал)
-    #
-    @callback(
-        Output('chart-returns', 'figure', allow_duplicate=True),
+        function(sliderValue, filename, playbackState, sliderMax) {
+            const engine = window.dash_clientside.playback;
+            if (playbackState && playbackState.is_playing) {
+                return window.dash_clientside.no_update;
+            }
+            if (engine && engine.scrub) {
+                engine.scrub(sliderValue, filename, sliderMax);
+            }
+            return window.dash_clientside.no_update;
+        }
+        """,
+        Output('_scrub-dummy', 'children'),
         Input('time-slider', 'value'),
         [
             State('file-selector', 'value'),
             State('playback-state', 'data'),
-            State('active-track-checklist', 'value'),
-            State('active-track-zoom-slider', 'value')
+            State('time-slider', 'max')
         ],
         prevent_initial_call=True
     )
-    def update_returns_on_slider(slider_value, filename, playback_state, active_track, zoom_level):
-        """Обновить Returns только при РУЧНОМ движении слайдера"""
-
-        # Skip if playback is active (JS handles updates)
-        if playback_state and playback_state.get('is_playing'):
-            return no_update
-
-        if not filename:
-            return no_update
-
-        patched_fig = Patch()
-
-        # Active-Track: авто-скролл returns
-        if active_track and 'enabled' in active_track:
-            half_window = zoom_level if zoom_level else 150
-            x_min = max(0, slider_value - half_window)
-            x_max = slider_value + half_window
-            patched_fig['layout']['xaxis']['range'] = [x_min, x_max]
-
-        # Заголовок Returns
-        patched_fig['layout']['title']['text'] = "Ret1s & Ret5s"
-
-        return patched_fig
 
     # ========================================
-    # Callback 4d: Обновление Volume графика через Patch
+    # Callback 4: Clientside - Active-Track окно на всех графиках
     # ========================================
-    #
-    # Trace indices in volume chart (create_volume_figure):
-    #   0: Volume 5s line
-    #   1: Volume 1s line
-    #   2: VolMA 30s line
-    #
-    @callback(
-        Output('chart-volume', 'figure', allow_duplicate=True),
-        Input('time-slider', 'value'),
+    # Один callback на шаг слайдера вместо отдельного серверного на каждый график:
+    # диапазоны осей ставятся в браузере (assets/active_track.js) за один кадр,
+    # запрос к серверу уходит, только если окно вышло за загруженные точки
+    app.clientside_callback(
+        """
+        function(sliderValue, activeTrack, zoomLevel, filename, playbackState) {
+            const tracker = window.dash_clientside.active_track;
+            if (!tracker) {
+                return window.dash_clientside.no_update;
+            }
+            return tracker.update(sliderValue, filename, playbackState, activeTrack, zoomLevel,
+                                  CHART_AXES);
+        }
+        """.replace('CHART_AXES', json.dumps(ACTIVE_TRACK_AXES)),
+        Output('active-track-request', 'data'),
         [
-            State('file-selector', 'value'),
-            State('playback-state', 'data'),
-            State('active-track-checklist', 'value'),
-            State('active-track-zoom-slider', 'value')
+            Input('time-slider', 'value'),
+            Input('active-track-checklist', 'value'),
+            Input('active-track-zoom-slider', 'value')
         ],
-        prevent_initial_call=True
-    )
-    def update_volume_on_slider(slider_value, filename, playback_state, active_track, zoom_level):
-        """Обновить Volume только при РУЧНОМ движении слайдера"""
-
-        # Skip if playback is active (JS handles updates)
-        if playback_state and playback_state.get('is_playing'):
-            return no_update
-
-        if not filename:
-            return no_update
-
-        patched_fig = Patch()
-
-        # Active-Track: авто-скролл volume
-        if active_track and 'enabled' in active_track:
-            half_window = zoom_level if zoom_level else 150
-            x_min = max(0, slider_value - half_window)
-            x_max = slider_value + half_window
-            patched_fig['layout']['xaxis']['range'] = [x_min, x_max]
-
-        # Заголовок Volume
-        patched_fig['layout']['title']['text'] = "Volume (USDT)"
-
-        return patched_fig
-
-    # ========================================
-    # Callback 4e: Обновление Volatility графика через Patch
-    # ========================================
-    #
-    # Trace indices in volatility chart (create_volatility_figure):
-    #   0: ATR 5s line (subplot 1)
-    #   1: ATR 30s line (subplot 1)
-    #   2: RVol 30s line (subplot 2)
-    #
-    @callback(
-        Output('chart-volatility', 'figure', allow_duplicate=True),
-        Input('time-slider', 'value'),
         [
             State('file-selector', 'value'),
-            State('playback-state', 'data'),
-            State('active-track-checklist', 'value'),
-            State('active-track-zoom-slider', 'value')
+            State('playback-state', 'data')
         ],
         prevent_initial_call=True
     )
-    def update_volatility_on_slider(slider_value, filename, playback_state, active_track, zoom_level):
-        """Обновить Volatility только при РУЧНОМ движении слайдера"""
-
-        # Skip if playback is active (JS handles updates)
-        if playback_state and playback_state.get('is_playing'):
-            return no_update
-
-        if not filename:
-            return no_update
-
-        patched_fig = Patch()
-
-        # Active-Track: авто-скролл volatility (оба подграфика)
-        if active_track and 'enabled' in active_track:
-            half_window = zoom_level if zoom_level else 150
-            x_min = max(0, slider_value - half_window)
-            x_max = slider_value + half_window
-            patched_fig['layout']['xaxis']['range'] = [x_min, x_max]
-            patched_fig['layout']['xaxis2']['range'] = [x_min, x_max]
-
-        # Заголовок Volatility
-        patched_fig['layout']['title']['text'] = "Volatility (ATR & RVol)"
-
-        return patched_fig
 
     # ========================================
-    # Callback 4f: Обновление Volume Spike графика через Patch
+    # Callback 4a: Точки окна Active-Track
     # ========================================
-    #
-    # Trace indices in volume spike chart (create_volume_spike_figure):
-    #   0: Volume Spike line
-    #
+    # request = {data_range} - линии в диапазоне data_range
+    #           {reset: True} - Active-Track выключен: обзорные ряды
+    # Оси в Patch не пишутся: окно на момент запроса к приходу ответа могло
+    # уйти дальше (слайдер в режиме drag), диапазоны держит браузер
     @callback(
-        Output('chart-volume-spike', 'figure', allow_duplicate=True),
-        Input('time-slider', 'value'),
-        [
-            State('file-selector', 'value'),
-            State('playback-state', 'data'),
-            State('active-track-checklist', 'value'),
-            State('active-track-zoom-slider', 'value')
-        ],
+        [Output(chart_id, 'figure', allow_duplicate=True) for chart_id in ZOOM_CHARTS],
+        Input('active-track-request', 'data'),
+        State('file-selector', 'value'),
         prevent_initial_call=True
     )
-    def update_volume_spike_on_slider(slider_value, filename, playback_state, active_track, zoom_level):
-        """Обновить Volume Spike только при РУЧНОМ движении слайдера"""
-
-        # Skip if playback is active (JS handles updates)
-        if playback_state and playback_state.get('is_playing'):
-            return no_update
-
-        if not filename:
-            return no_update
-
-        patched_fig = Patch()
+    def load_active_track_window(request, filename):
+        """Догрузить ряды окна Active-Track на все графики"""
+        if not request or not filename:
+            return [no_update] * len(ZOOM_CHARTS)
 
-        # Active-Track: авто-скролл volume spike
-        if active_track and 'enabled' in active_track:
-            half_window = zoom_level if zoom_level else 150
-            x_min = max(0, slider_value - half_window)
-            x_max = slider_value + half_window
-            patched_fig['layout']['xaxis']['range'] = [x_min, x_max]
-
-        # Заголовок Volume Spike
-        patched_fig['layout']['title']['text'] = "Volume Spike"
-
-        return patched_fig
+        df = get_data_cache().get_df(filename)
+        data_range = None if request.get('reset') else request['data_range']
+        return [build_window_patch(df, chart_id, data_range) for chart_id in ZOOM_CHARTS]
 
     # ========================================
-    # Callback 4g: Обновление P/VWAP графика через Patch
+    # Callback 4b: Clientside - сброс диапазонов при смене файла
     # ========================================
-    #
-    # Trace indices in p_vwap chart (create_p_vwap_figure):
-    #   0: P/VWAP 30s line (тренд)
-    #   1: P/VWAP 5s line (сигнал)
-    #
-    @callback(
-        Output('chart-p-vwap', 'figure', allow_duplicate=True),
-        Input('time-slider', 'value'),
-        [
-            State('file-selector', 'value'),
-            State('playback-state', 'data'),
-            State('active-track-checklist', 'value'),
-            State('active-track-zoom-slider', 'value')
-        ],
+    # Диапазоны, выставленные в браузере (assets/axis_pins.js), относятся к
+    # графикам прежнего файла и не должны переноситься на новые фигуры
+    app.clientside_callback(
+        """
+        function(filename) {
+            const pins = window.dash_clientside.axis_pins;
+            if (pins) {
+                pins.clear();
+            }
+            return window.dash_clientside.no_update;
+        }
+        """,
+        Output('_axis-link-dummy', 'children', allow_duplicate=True),
+        Input('file-selector', 'value'),
         prevent_initial_call=True
     )
-    def update_p_vwap_on_slider(slider_value, filename, playback_state, active_track, zoom_level):
-        """Обновить P/VWAP только при РУЧНОМ движении слайдера"""
-
-        # Skip if playback is active (JS handles updates)
-        if playback_state and playback_state.get('is_playing'):
-            return no_update
-
-        if not filename:
-            return no_update
-
-        patched_fig = Patch()
-
-        # Active-Track: авто-скролл p/vwap
-        if active_track and 'enabled' in active_track:
-            half_window = zoom_level if zoom_level else 150
-            x_min = max(0, slider_value - half_window)
-            x_max = slider_value + half_window
-            patched_fig['layout']['xaxis']['range'] = [x_min, x_max]
-
-        # Заголовок P/VWAP
-        patched_fig['layout']['title']['text'] = "P/VWAP (% отклонение от VWAP)"
-
-        return patched_fig
 
     # ========================================
     # Callback 5: Синхронизация осей Orderbook chart
@@ -853,112 +291,87 @@ def register_callbacks(app):
     # Нет других timeseries осей для синхронизации внутри этого чарта.
 
     # ========================================
-    # Callback 6b: Синхронизация осей BTC chart
+    # Callback 6: Clientside - связанный зум графиков с временными рядами
     # ========================================
-    # В btc chart (2-row, 1-col): xaxis = BTC price (row 1), xaxis2 = Lag (row 2)
-    @callback(
-        Output('chart-btc', 'figure', allow_duplicate=True),
-        Input('chart-btc', 'relayoutData'),
+    # Зум любого графика переносится на все оси X графика (btc: price + lag,
+    # volatility: ATR + RVol) и на графики, выбранные в панели Linked Zoom,
+    # через Plotly.relayout в браузере (assets/axis_link.js), без HTTP.
+    # Сброс зума (autorange) распространяется так же.
+    app.clientside_callback(
+        """
+        function() {
+            const link = window.dash_clientside.axis_link;
+            const context = window.dash_clientside.callback_context;
+            const [activeTrack, playbackState, linkedCharts] = Array.from(arguments).slice(-3);
+            if (!link || !context.triggered.length) {
+                return window.dash_clientside.no_update;
+            }
+            // Во время playback и Active-Track оси ведут playback engine и слайдер
+            if (playbackState && playbackState.is_playing) {
+                return window.dash_clientside.no_update;
+            }
+            if (activeTrack && activeTrack.includes('enabled')) {
+                return window.dash_clientside.no_update;
+            }
+            const trigger = context.triggered[0];
+            const chartId = trigger.prop_id.split('.')[0];
+            link.onRelayout(chartId, trigger.value, CHART_AXES, linkedCharts);
+            return window.dash_clientside.no_update;
+        }
+        """.replace('CHART_AXES', json.dumps(ACTIVE_TRACK_AXES)),
+        Output('_axis-link-dummy', 'children'),
+        [Input(chart_id, 'relayoutData') for chart_id in ZOOM_CHARTS],
         [
             State('active-track-checklist', 'value'),
-            State('playback-state', 'data')
+            State('playback-state', 'data'),
+            State('axis-link-charts', 'value')
         ],
         prevent_initial_call=True
     )
-    def sync_btc_chart_axes(relayout_data, active_track, playback_state):
-        """Синхронизация осей xaxis (btc) и xaxis2 (lag) при зуме"""
-        # Skip during playback - JS handles updates
-        if playback_state and playback_state.get('is_playing'):
-            return no_update
-
-        if active_track and 'enabled' in active_track:
-            return no_update
-        if not relayout_data:
-            return no_update
-
-        patched_fig = Patch()
-
-        # Зум на BTC price (xaxis) -> обновить lag
-        if 'xaxis.range[0]' in relayout_data and 'xaxis.range[1]' in relayout_data:
-            patched_fig['layout']['xaxis2']['range'] = [
-                relayout_data['xaxis.range[0]'],
-                relayout_data['xaxis.range[1]']
-            ]
-            return patched_fig
-
-        # Зум на Lag (xaxis2) -> обновить btc price
-        if 'xaxis2.range[0]' in relayout_data and 'xaxis2.range[1]' in relayout_data:
-            patched_fig['layout']['xaxis']['range'] = [
-                relayout_data['xaxis2.range[0]'],
-                relayout_data['xaxis2.range[1]']
-            ]
-            return patched_fig
-
-        # Сброс зума на BTC price
-        if 'xaxis.autorange' in relayout_data:
-            patched_fig['layout']['xaxis2']['autorange'] = True
-            return patched_fig
-
-        # Сброс зума на Lag
-        if 'xaxis2.autorange' in relayout_data:
-            patched_fig['layout']['xaxis']['autorange'] = True
-            return patched_fig
-
-        return no_update
 
     # ========================================
-    # Callback 6c: Синхронизация осей Volatility chart
+    # Callback 6b: Точки диапазона связанного зума
     # ========================================
-    # В volatility chart (2-row, 1-col): xaxis = ATR (row 1), xaxis2 = RVol (row 2)
+    # Начальные фигуры содержат прореженные ряды. После зума графики группы
+    # получают точки только видимого диапазона - одним запросом на все графики.
+    # Диапазоны осей уже выставлены в браузере, Patch содержит только точки
+    # request = {range: [x_min, x_max] или None (сброс зума - обзор), charts: [id]}
     @callback(
-        Output('chart-volatility', 'figure', allow_duplicate=True),
-        Input('chart-volatility', 'relayoutData'),
-        [
-            State('active-track-checklist', 'value'),
-            State('playback-state', 'data')
-        ],
+        [Output(chart_id, 'figure', allow_duplicate=True) for chart_id in ZOOM_CHARTS],
+        Input('linked-zoom-request', 'data'),
+        State('file-selector', 'value'),
         prevent_initial_call=True
     )
-    def sync_volatility_chart_axes(relayout_data, active_track, playback_state):
-        """Синхронизация осей xaxis (ATR) и xaxis2 (RVol) при зуме"""
-        # Skip during playback - JS handles updates
-        if playback_state and playback_state.get('is_playing'):
-            return no_update
-
-        if active_track and 'enabled' in active_track:
-            return no_update
-        if not relayout_data:
-            return no_update
-
-        patched_fig = Patch()
-
-        # Зум на ATR (xaxis) -> обновить RVol
-        if 'xaxis.range[0]' in relayout_data and 'xaxis.range[1]' in relayout_data:
-            patched_fig['layout']['xaxis2']['range'] = [
-                relayout_data['xaxis.range[0]'],
-                relayout_data['xaxis.range[1]']
-            ]
-            return patched_fig
-
-        # Зум на RVol (xaxis2) -> обновить ATR
-        if 'xaxis2.range[0]' in relayout_data and 'xaxis2.range[1]' in relayout_data:
-            patched_fig['layout']['xaxis']['range'] = [
-                relayout_data['xaxis2.range[0]'],
-                relayout_data['xaxis2.range[1]']
-            ]
-            return patched_fig
-
-        # Сброс зума на ATR
-        if 'xaxis.autorange' in relayout_data:
-            patched_fig['layout']['xaxis2']['autorange'] = True
-            return patched_fig
+    def load_linked_zoom(request, filename):
+        """Догрузить ряды видимого диапазона на графики группы"""
+        if not request or not filename:
+            return [no_update] * len(ZOOM_CHARTS)
+
+        df = get_data_cache().get_df(filename)
+        x_range = request.get('range')
+        charts = set(request.get('charts') or [])
+        return [
+            build_window_patch(df, chart_id, x_range) if chart_id in charts else no_update
+            for chart_id in ZOOM_CHARTS
+        ]
 
-        # Сброс зума на RVol
-        if 'xaxis2.autorange' in relayout_data:
-            patched_fig['layout']['xaxis']['autorange'] = True
-            return patched_fig
+    # ========================================
+    # Callback 6a: Переключение SVG/WebGL
+    # ========================================
+    # Меняется только тип трасс линий, индексы трасс (и restyle в JS) прежние
+    @callback(
+        [Output(chart_id, 'figure', allow_duplicate=True) for chart_id in ZOOM_CHARTS],
+        Input('render-mode-selector', 'value'),
+        State('file-selector', 'value'),
+        prevent_initial_call=True
+    )
+    def update_render_mode(render_mode, filename):
+        """Переключить тип трасс линий на всех графиках"""
+        if not filename:
+            return [no_update] * len(ZOOM_CHARTS)
 
-        return no_update
+        df = get_data_cache().get_df(filename)
+        return [build_render_mode_patch(df, chart_id, render_mode) for chart_id in ZOOM_CHARTS]
 
     # ========================================
     # Callback 7: Обновление info текста zoom slider
@@ -995,26 +408,19 @@ def register_callbacks(app):
         count = chunk_request.get('count', 200)
         reset = chunk_request.get('reset', False)
 
-        from .data_loader import load_data
-        from .data_cache import get_data_cache
-
-        df = load_data(filename)
         cache = get_data_cache()
+        df = cache.get_df(filename)
 
-        # Extract batch of trace data
-        batch = []
-        max_row = len(df) - 1
-        end_row = min(start_row + count, max_row + 1)
-
-        for row_idx in range(start_row, end_row):
-            trace_data = cache.compute_trace_data(filename, row_idx)
-            batch.append(trace_data)
+        # Колоночный чанк: typed arrays в base64, форматирование на клиенте
+        end_row = min(start_row + count, len(df))
+        chunk = encode_trace_chunk(df, start_row, end_row)
 
         return {
-            'batch': batch,
+            'chunk': chunk,
             'start_row': start_row,
-            'count': len(batch),
-            'reset': reset
+            'count': chunk['count'],
+            'reset': reset,
+            'filename': filename
         }
 
     # ========================================
@@ -1023,15 +429,16 @@ def register_callbacks(app):
     app.clientside_callback(
         """
         function(chunkData) {
-            if (!chunkData || !chunkData.batch) {
+            if (!chunkData || !chunkData.chunk) {
                 return window.dash_clientside.no_update;
             }
 
             const engine = window.dash_clientside.playback;
             if (engine && engine.receiveBatch) {
-                engine.receiveBatch(chunkData.batch, {
+                engine.receiveBatch(chunkData.chunk, {
                     start_row: chunkData.start_row,
-                    reset: chunkData.reset
+                    reset: chunkData.reset,
+                    filename: chunkData.filename
                 });
             }
 
@@ -1098,37 +505,72 @@ def register_callbacks(app):
     )
 
     # ========================================
-    # Callback 9: Update Market Timer
+    # Callback 9: Clientside - Market Timer
     # ========================================
-    @callback(
+    # seconds_till_end всего файла приходит в market-timer-data при открытии,
+    # отсчёт и фаза считаются в браузере (assets/market_timer.js).
+    # Во время playback таймер выставляет playback engine по кадрам
+    app.clientside_callback(
+        """
+        function(rowIdx, timerData) {
+            const timer = window.dash_clientside.market_timer;
+            if (!timer) {
+                return Array(4).fill(window.dash_clientside.no_update);
+            }
+            return timer.update(rowIdx, timerData, MARKET_PHASES);
+        }
+        """.replace('MARKET_PHASES', json.dumps(MARKET_PHASES)),
         [
             Output('countdown-display', 'children'),
-            Output('countdown-seconds', 'children')
+            Output('countdown-seconds', 'children'),
+            Output('market-phase', 'children'),
+            Output('market-phase', 'style')
         ],
         [
-            Input('file-selector', 'value'),
-            Input('time-slider', 'value')
+            Input('time-slider', 'value'),
+            Input('market-timer-data', 'data')
         ]
     )
-    def update_market_timer(filename, row_idx):
-        """Обновить таймер времени до закрытия рынка"""
-        if not filename or row_idx is None:
-            return '--:--', '(--- сек)'
-
-        try:
-            # Получить данные для текущей строки
-            cache = get_data_cache()
-            trace_data = cache.compute_trace_data(filename, row_idx)
 
-            # Извлечь временные данные
-            seconds_till_end = trace_data.get('seconds_till_end', None)
-            time_till_end = trace_data.get('time_till_end', '--:--')
+    # ========================================
+    # Callback 10: Информация о файле из каталога
+    # ========================================
+    @callback(
+        Output('file-info', 'children'),
+        Input('file-selector', 'value')
+    )
+    def update_file_info(filename):
+        """Показать сводку рынка из каталога (без чтения CSV)"""
+        if not filename:
+            return "No file selected"
 
-            # Форматировать отображение секунд
-            seconds_display = f"({seconds_till_end} сек)" if seconds_till_end is not None else "(--- сек)"
+        info = get_market_info(filename)
+        if info is None:
+            return f"{filename}: нет в каталоге"
 
-            return str(time_till_end), seconds_display
+        if info['first_ts_ms'] is not None and info['last_ts_ms'] is not None:
+            duration = f"{(info['last_ts_ms'] - info['first_ts_ms']) / 1000:.0f} s"
+        else:
+            duration = 'N/A'
+        strike = f"${info['strike']:,.2f}" if info['strike'] is not None else 'N/A'
+
+        lines = [
+            ('Market', info['market_slug'] or 'N/A'),
+            ('Rows', f"{info['rows']:,}"),
+            ('Columns', str(len(info['columns']))),
+            ('Start', info['time_start'] or 'N/A'),
+            ('End', info['time_end'] or 'N/A'),
+            ('Duration', duration),
+            ('Strike', strike),
+            ('Outcome', info['outcome'] or 'N/A'),
+        ]
+        return [
+            html.Div([
+                html.Span(f"{label}: ", style={'color': '#888'}),
+                html.Span(value, style={'color': 'white'})
+            ], style={'fontSize': '12px', 'marginBottom': '3px'})
+            for label, value in lines
+        ]
 
-        except Exception as e:
-            print(f"Error updating market timer: {e}")
-            return '--:--', '(--- сек)'
+    # Метрики всех серверных callbacks выше (/metrics, src/metrics.py)
+    instrument_callbacks(app)
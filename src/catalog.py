@@ -0,0 +1,281 @@
+"""
+Catalog Module
+Каталог рынков FILES_DIR в SQLite: сводка по каждому файлу без чтения CSV
+"""
+
+import os
+import json
+import sqlite3
+import threading
+import time
+from contextlib import closing
+import pandas as pd
+from .data_loader import FILES_DIR, CACHE_DIR, get_csv_files
+from .config import CATALOG_REFRESH_SECONDS
+
+# Путь к файлу каталога
+CATALOG_PATH = os.path.join(CACHE_DIR, 'catalog.sqlite')
+
+# Колонки CSV, которые читаются при сканировании рынка
+SCAN_COLUMNS = ('market_slug', 'timestamp_ms', 'timestamp_et', 'oracle_btc_price')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS markets (
+    filename     TEXT PRIMARY KEY,
+    mtime_ns     INTEGER NOT NULL,
+    size         INTEGER NOT NULL,
+    rows         INTEGER NOT NULL,
+    first_ts_ms  INTEGER,
+    last_ts_ms   INTEGER,
+    time_start   TEXT,
+    time_end     TEXT,
+    market_slug  TEXT,
+    strike       REAL,
+    outcome      TEXT,
+    columns      TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ingest_stats (
+    filename      TEXT PRIMARY KEY,
+    csv_bytes     INTEGER NOT NULL,
+    columnar_path TEXT,
+    columnar_bytes INTEGER,
+    rows          INTEGER NOT NULL,
+    seconds       REAL NOT NULL,
+    ingested_at   REAL NOT NULL
+);
+"""
+
+# Одно сканирование каталога за раз (startup, ingest, фоновое обновление)
+_refresh_lock = threading.Lock()
+
+# Таблицы создаются один раз на процесс, а не на каждое соединение
+_schema_ready = False
+_schema_lock = threading.Lock()
+
+# Поток фонового обновления каталога (start_catalog_refresher)
+_refresher = None
+
+
+def connect():
+    """Открыть соединение с каталогом, создав таблицы при первом открытии в процессе"""
+    global _schema_ready
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    conn = sqlite3.connect(CATALOG_PATH, timeout=30)
+    conn.row_factory = sqlite3.Row
+    if not _schema_ready:
+        with _schema_lock:
+            if not _schema_ready:
+                conn.executescript(_SCHEMA)
+                _schema_ready = True
+    return conn
+
+
+def _first_valid(series):
+    """Первое не-NaN значение колонки или None"""
+    idx = series.first_valid_index()
+    return None if idx is None else series.loc[idx]
+
+
+def _last_valid(series):
+    """Последнее не-NaN значение колонки или None"""
+    idx = series.last_valid_index()
+    return None if idx is None else series.loc[idx]
+
+
+def summarize_market(df, columns):
+    """
+    Сводка рынка для каталога.
+
+    Args:
+        df: DataFrame с колонками SCAN_COLUMNS (те, что есть в файле)
+        columns: полный список колонок файла
+
+    Returns:
+        dict: rows, first/last timestamp_ms, time_start/time_end, market_slug,
+              strike (первая цена оракула), outcome ('UP'/'DOWN' по последней
+              цене оракула относительно strike), columns
+    """
+    info = {
+        'rows': len(df),
+        'first_ts_ms': None,
+        'last_ts_ms': None,
+        'time_start': None,
+        'time_end': None,
+        'market_slug': None,
+        'strike': None,
+        'outcome': None,
+        'columns': list(columns),
+    }
+    if len(df) == 0:
+        return info
+
+    if 'timestamp_ms' in df.columns:
+        info['first_ts_ms'] = int(df['timestamp_ms'].iloc[0])
+        info['last_ts_ms'] = int(df['timestamp_ms'].iloc[-1])
+    if 'timestamp_et' in df.columns:
+        info['time_start'] = str(df['timestamp_et'].iloc[0])
+        info['time_end'] = str(df['timestamp_et'].iloc[-1])
+    if 'market_slug' in df.columns:
+        slug = _first_valid(df['market_slug'])
+        info['market_slug'] = None if slug is None else str(slug)
+    if 'oracle_btc_price' in df.columns:
+        strike = _first_valid(df['oracle_btc_price'])
+        final = _last_valid(df['oracle_btc_price'])
+        if strike is not None:
+            info['strike'] = float(strike)
+            info['outcome'] = 'UP' if float(final) >= float(strike) else 'DOWN'
+    return info
+
+
+def scan_market(filename):
+    """Прочитать из CSV только колонки, нужные для сводки рынка"""
+    filepath = os.path.join(FILES_DIR, filename)
+    columns = pd.read_csv(filepath, nrows=0).columns.tolist()
+    usecols = [col for col in SCAN_COLUMNS if col in columns]
+    df = pd.read_csv(filepath, usecols=usecols)
+    return summarize_market(df, columns)
+
+
+def upsert_market(conn, filename, stat, info):
+    """Записать сводку рынка в каталог"""
+    conn.execute(
+        """
+        INSERT OR REPLACE INTO markets
+            (filename, mtime_ns, size, rows, first_ts_ms, last_ts_ms, time_start, time_end,
+             market_slug, strike, outcome, columns)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            filename, stat.st_mtime_ns, stat.st_size, info['rows'],
+            info['first_ts_ms'], info['last_ts_ms'], info['time_start'], info['time_end'],
+            info['market_slug'], info['strike'], info['outcome'], json.dumps(info['columns']),
+        )
+    )
+
+
+def remove_markets(conn, filenames):
+    """Удалить записи файлов (и их статистику ingest) из каталога"""
+    params = [(f,) for f in filenames]
+    conn.executemany("DELETE FROM markets WHERE filename = ?", params)
+    conn.executemany("DELETE FROM ingest_stats WHERE filename = ?", params)
+
+
+def record_ingest(conn, filename, csv_bytes, columnar_path, columnar_bytes, rows, seconds):
+    """Записать статистику конвертации файла в колоночный формат"""
+    conn.execute(
+        """
+        INSERT OR REPLACE INTO ingest_stats
+            (filename, csv_bytes, columnar_path, columnar_bytes, rows, seconds, ingested_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        (filename, csv_bytes, columnar_path, columnar_bytes, rows, seconds, time.time())
+    )
+
+
+def find_stale_files(conn):
+    """
+    Сравнить FILES_DIR с каталогом по mtime и размеру.
+
+    Returns:
+        tuple: (changed - список (filename, stat) новых или изменённых файлов,
+                removed - имена файлов, которых больше нет на диске)
+    """
+    known = {
+        row['filename']: (row['mtime_ns'], row['size'])
+        for row in conn.execute("SELECT filename, mtime_ns, size FROM markets")
+    }
+    changed = []
+    present = set()
+    for filename in get_csv_files():
+        stat = os.stat(os.path.join(FILES_DIR, filename))
+        present.add(filename)
+        if known.get(filename) != (stat.st_mtime_ns, stat.st_size):
+            changed.append((filename, stat))
+    removed = [filename for filename in known if filename not in present]
+    return changed, removed
+
+
+def refresh_catalog(verbose=False):
+    """
+    Инкрементально обновить каталог: пересканировать только новые и изменённые
+    файлы, удалить записи исчезнувших.
+
+    Returns:
+        dict: {'scanned', 'removed', 'total'}
+    """
+    with _refresh_lock, closing(connect()) as conn:
+        changed, removed = find_stale_files(conn)
+        for filename, stat in changed:
+            try:
+                info = scan_market(filename)
+            except Exception as e:
+                print(f"Error scanning {filename}: {e}")
+                continue
+            upsert_market(conn, filename, stat, info)
+            if verbose:
+                print(f"Catalog: {filename} ({info['rows']} rows)")
+        remove_markets(conn, removed)
+        conn.commit()
+        total = conn.execute("SELECT COUNT(*) FROM markets").fetchone()[0]
+
+    if changed or removed:
+        print(f"Catalog updated: {len(changed)} scanned, {len(removed)} removed, {total} markets")
+    return {'scanned': len(changed), 'removed': len(removed), 'total': total}
+
+
+def start_catalog_refresher(interval=CATALOG_REFRESH_SECONDS):
+    """
+    Обновлять каталог в фоновом потоке раз в interval секунд (0 - выключено):
+    новые файлы в FILES_DIR появляются в селекторе после перезагрузки страницы,
+    а построение layout только читает каталог.
+
+    Под gunicorn (preload_app) поток работает в главном процессе, воркеры
+    читают общий файл каталога.
+    """
+    global _refresher
+    if interval <= 0 or _refresher is not None:
+        return
+
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                refresh_catalog()
+            except Exception as e:
+                print(f"Error refreshing catalog: {e}")
+
+    _refresher = threading.Thread(target=run, name='catalog-refresh', daemon=True)
+    _refresher.start()
+
+
+def _row_to_info(row):
+    info = dict(row)
+    info['columns'] = json.loads(info['columns'])
+    return info
+
+
+def list_markets():
+    """Имена файлов рынков из каталога (отсортированы)"""
+    with closing(connect()) as conn:
+        return [row['filename'] for row in conn.execute("SELECT filename FROM markets ORDER BY filename")]
+
+
+def get_market_info(filename):
+    """
+    Сводка рынка из каталога.
+
+    Returns:
+        dict или None, если файла нет в каталоге
+    """
+    with closing(connect()) as conn:
+        row = conn.execute("SELECT * FROM markets WHERE filename = ?", (filename,)).fetchone()
+    return None if row is None else _row_to_info(row)
+
+
+def list_recent_markets(limit):
+    """Имена файлов limit самых свежих рынков (по последнему timestamp_ms)"""
+    with closing(connect()) as conn:
+        rows = conn.execute(
+            "SELECT filename FROM markets ORDER BY last_ts_ms DESC, filename DESC LIMIT ?", (limit,)
+        )
+        return [row['filename'] for row in rows]
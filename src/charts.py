@@ -4,7 +4,6 @@ Charts Module
 """
 
 import pandas as pd
-import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
@@ -14,6 +13,7 @@ from .data_loader import (
     calculate_pressure,
     calculate_orderbook_range,
 )
+from .series import get_plot_series, get_value
 from .config import BAR_SCALE_COEFF
 from .widgets.orderbook import add_orderbook_traces
 from .widgets.ask_prices_chart import add_ask_prices_traces
@@ -34,6 +34,12 @@ from .widgets.spread_chart import create_spread_figure
 
 from .widgets.depth_chart import create_depth_figure
 
+# Линии по индексам трасс: ключ ряда для догрузки при зуме (src/zoom.py)
+ORDERBOOK_SERIES_TRACES = {4: 'up_ask_1_price', 5: 'down_ask_1_price'}
+BTC_SERIES_TRACES = {0: 'binance_btc_price', 1: 'oracle_btc_price', 4: 'lag'}
+# Маркеры текущей строки по индексам трасс (src/skeleton.py)
+BTC_MARKER_TRACES = {2: 'binance_btc_price', 3: 'oracle_btc_price', 5: 'lag'}
+
 
 def create_orderbook_chart(df, row_idx):
     """
@@ -230,14 +236,9 @@ def create_orderbook_figure(df, row_idx):
     Returns:
         go.Figure: Plotly фигура со стаканами и графиком ask prices
     """
-    row = df.iloc[row_idx]
-    data = get_orderbook_data(row)
+    data = get_orderbook_data(df, row_idx)
 
-    all_sizes = (
-        data['up']['bid_sizes'] + data['up']['ask_sizes'] +
-        data['down']['bid_sizes'] + data['down']['ask_sizes']
-    )
-    anomaly_threshold = calculate_anomaly_threshold(all_sizes)
+    anomaly_threshold = calculate_anomaly_threshold(data['sizes'])
     range_data = calculate_orderbook_range(df)
     global_max = range_data['max_size']
 
@@ -322,12 +323,11 @@ def create_btc_figure(df, row_idx):
 def _add_ask_prices(fig, df, row_idx):
     """Добавить ask prices график (row 2)"""
     # UP Ask Price - зеленая
-    up_ask_prices = df['up_ask_1_price'].values if 'up_ask_1_price' in df.columns else np.array([np.nan] * len(df))
-    up_mask = ~pd.isna(up_ask_prices)
+    up_ask_prices_x, up_ask_prices_y = get_plot_series(df, 'up_ask_1_price')
     fig.add_trace(
         go.Scatter(
-            x=[i for i, m in enumerate(up_mask) if m],
-            y=[float(p) for p, m in zip(up_ask_prices, up_mask) if m],
+            x=up_ask_prices_x,
+            y=up_ask_prices_y,
             mode='lines', name='UP Ask Price',
             line=dict(color='#00C853', width=2),
             hovertemplate='UP Ask: $%{y:.4f}<extra></extra>'
@@ -336,12 +336,11 @@ def _add_ask_prices(fig, df, row_idx):
     )
 
     # DOWN Ask Price - красная
-    down_ask_prices = df['down_ask_1_price'].values if 'down_ask_1_price' in df.columns else np.array([np.nan] * len(df))
-    down_mask = ~pd.isna(down_ask_prices)
+    down_ask_prices_x, down_ask_prices_y = get_plot_series(df, 'down_ask_1_price')
     fig.add_trace(
         go.Scatter(
-            x=[i for i, m in enumerate(down_mask) if m],
-            y=[float(p) for p, m in zip(down_ask_prices, down_mask) if m],
+            x=down_ask_prices_x,
+            y=down_ask_prices_y,
             mode='lines', name='DOWN Ask Price',
             line=dict(color='#F44336', width=2),
             hovertemplate='DOWN Ask: $%{y:.4f}<extra></extra>'
@@ -350,7 +349,7 @@ def _add_ask_prices(fig, df, row_idx):
     )
 
     # Текущие маркеры
-    current_up = up_ask_prices[row_idx] if row_idx < len(up_ask_prices) else np.nan
+    current_up = get_value(df, 'up_ask_1_price', row_idx)
     fig.add_trace(
         go.Scatter(
             x=[row_idx] if pd.notna(current_up) else [],
@@ -362,7 +361,7 @@ def _add_ask_prices(fig, df, row_idx):
         row=2, col=1
     )
 
-    current_down = down_ask_prices[row_idx] if row_idx < len(down_ask_prices) else np.nan
+    current_down = get_value(df, 'down_ask_1_price', row_idx)
     fig.add_trace(
         go.Scatter(
             x=[row_idx] if pd.notna(current_down) else [],
@@ -381,13 +380,11 @@ def _add_ask_prices(fig, df, row_idx):
 
 def _add_btc(fig, df, row_idx):
     """Добавить BTC price график (row 1)"""
-    x_indices = list(range(len(df)))
-
     # Binance BTC
-    binance_prices = df['binance_btc_price'].values
+    binance_prices_x, binance_prices_y = get_plot_series(df, 'binance_btc_price')
     fig.add_trace(
         go.Scatter(
-            x=x_indices, y=binance_prices,
+            x=binance_prices_x, y=binance_prices_y,
             mode='lines', name='Binance BTC',
             line=dict(color='#FF6B00', width=2),
             hovertemplate='Binance: $%{y:,.2f}<extra></extra>'
@@ -396,12 +393,11 @@ def _add_btc(fig, df, row_idx):
     )
 
     # Oracle BTC
-    oracle_prices = df['oracle_btc_price'].values if 'oracle_btc_price' in df.columns else np.array([np.nan] * len(df))
-    oracle_mask = ~pd.isna(oracle_prices)
+    oracle_prices_x, oracle_prices_y = get_plot_series(df, 'oracle_btc_price')
     fig.add_trace(
         go.Scatter(
-            x=[i for i, m in enumerate(oracle_mask) if m],
-            y=[float(p) for p, m in zip(oracle_prices, oracle_mask) if m],
+            x=oracle_prices_x,
+            y=oracle_prices_y,
             mode='lines', name='Oracle BTC',
             line=dict(color='#2196F3', width=2),
             hovertemplate='Oracle: $%{y:,.2f}<extra></extra>'
@@ -410,7 +406,7 @@ def _add_btc(fig, df, row_idx):
     )
 
     # Текущие маркеры
-    current_binance = binance_prices[row_idx]
+    current_binance = get_value(df, 'binance_btc_price', row_idx)
     fig.add_trace(
         go.Scatter(
             x=[row_idx] if pd.notna(current_binance) else [],
@@ -422,7 +418,7 @@ def _add_btc(fig, df, row_idx):
         row=1, col=1
     )
 
-    current_oracle = oracle_prices[row_idx] if row_idx < len(oracle_prices) else np.nan
+    current_oracle = get_value(df, 'oracle_btc_price', row_idx)
     fig.add_trace(
         go.Scatter(
             x=[row_idx] if pd.notna(current_oracle) else [],
@@ -441,13 +437,12 @@ def _add_btc(fig, df, row_idx):
 
 def _add_lag(fig, df, row_idx):
     """Добавить Lag график (row 2)"""
-    lag_values = df['lag'].values if 'lag' in df.columns else np.array([np.nan] * len(df))
-    lag_mask = ~pd.isna(lag_values)
+    lag_values_x, lag_values_y = get_plot_series(df, 'lag')
 
     fig.add_trace(
         go.Scatter(
-            x=[i for i, m in enumerate(lag_mask) if m],
-            y=[float(lag) for lag, m in zip(lag_values, lag_mask) if m],
+            x=lag_values_x,
+            y=lag_values_y,
             mode='lines', name='Price Lag',
             line=dict(color='#FFC107', width=2),
             fill='tozeroy',
@@ -459,7 +454,7 @@ def _add_lag(fig, df, row_idx):
 
     fig.add_hline(y=0, line_dash="solid", line_color="rgba(255,255,255,0.3)", line_width=1, row=2, col=1)
 
-    current_lag = lag_values[row_idx] if row_idx < len(lag_values) else np.nan
+    current_lag = get_value(df, 'lag', row_idx)
     fig.add_trace(
         go.Scatter(
             x=[row_idx] if pd.notna(current_lag) else [],
@@ -2,5 +2,65 @@
 Configuration constants for the application
 """
 
+import os
+
 # Коэффициент масштабирования длины полосок в стакане
 BAR_SCALE_COEFF = 1.0
+
+# Бюджет памяти кеша DataFrame (МБ), переопределяется переменной FASTSCAN_CACHE_MB
+CACHE_BUDGET_MB = int(os.environ.get('FASTSCAN_CACHE_MB', '2048'))
+
+# Фоновая подгрузка рынков при открытии файла (src/prefetch.py)
+# Число потоков подгрузки, переопределяется переменной FASTSCAN_PREFETCH_WORKERS (0 - выключено)
+PREFETCH_WORKERS = int(os.environ.get('FASTSCAN_PREFETCH_WORKERS', '2'))
+# Сколько соседних рынков в отсортированном списке подгружать в каждую сторону
+PREFETCH_NEIGHBOURS = 1
+# Сколько самых свежих рынков (по последнему timestamp_ms) держать подгруженными
+PREFETCH_RECENT = 3
+
+# Фоновое обновление каталога рынков (src/catalog.py): раз в сколько секунд
+# пересканировать FILES_DIR (FASTSCAN_CATALOG_REFRESH_SECONDS, 0 - только при старте и ingest)
+CATALOG_REFRESH_SECONDS = int(os.environ.get('FASTSCAN_CATALOG_REFRESH_SECONDS', '30'))
+
+# Бюджет памяти кеша начальных фигур (МБ), переопределяется переменной FASTSCAN_FIGURE_CACHE_MB
+FIGURE_CACHE_MB = int(os.environ.get('FASTSCAN_FIGURE_CACHE_MB', '256'))
+
+# Прореживание рядов графиков (src/series.py): ширина области графика в пикселях,
+# переопределяется переменной FASTSCAN_PLOT_WIDTH_PX. На каждый пиксель
+# приходится пара точек (min и max), поэтому всплески не теряются.
+PLOT_WIDTH_PX = int(os.environ.get('FASTSCAN_PLOT_WIDTH_PX', '1000'))
+PLOT_MAX_POINTS = 2 * PLOT_WIDTH_PX
+
+# Отрисовка линий графиков: 'svg' (go.Scatter), 'webgl' (go.Scattergl) или 'auto' -
+# WebGL для графиков, где во всех линиях после прореживания больше WEBGL_AUTO_POINTS точек
+# (каждая линия - до PLOT_MAX_POINTS, так что обычно это графики с тремя линиями и больше).
+# Переопределяется переменной FASTSCAN_RENDER_MODE, меняется в панели Performance
+RENDER_MODE = os.environ.get('FASTSCAN_RENDER_MODE', 'auto')
+WEBGL_AUTO_POINTS = 5000
+
+# Параллельное построение начальных фигур (src/figure_cache.py)
+# Режим: 'thread' - пул потоков, 'process' - пул процессов с DataFrame в shared memory
+# (обходит GIL). Переопределяется переменной FASTSCAN_FIGURE_BUILD_MODE
+FIGURE_BUILD_MODE = os.environ.get('FASTSCAN_FIGURE_BUILD_MODE', 'thread')
+# Число воркеров, переопределяется переменной FASTSCAN_FIGURE_WORKERS (0 - последовательно)
+FIGURE_BUILD_WORKERS = int(os.environ.get('FASTSCAN_FIGURE_WORKERS', str(min(4, os.cpu_count() or 1))))
+
+# Production запуск (python app.py --serve, src/server.py): gunicorn, процессы-воркеры
+# и потоки в каждом. Переопределяются переменными FASTSCAN_SERVER_WORKERS / FASTSCAN_SERVER_THREADS
+SERVER_WORKERS = int(os.environ.get('FASTSCAN_SERVER_WORKERS', str(min(4, os.cpu_count() or 1))))
+SERVER_THREADS = int(os.environ.get('FASTSCAN_SERVER_THREADS', '4'))
+# Сколько самых свежих рынков загрузить до старта воркеров (FASTSCAN_WARMUP_MARKETS)
+WARMUP_MARKETS = int(os.environ.get('FASTSCAN_WARMUP_MARKETS', str(PREFETCH_RECENT)))
+
+# Хранилище DataFrame (src/shared_store.py): 'memory' - каждый процесс держит свою копию,
+# 'shared' - числовые колонки отображаются из файлов общего хранилища (mmap), и все
+# воркеры используют одни страницы памяти. Переопределяется переменной FASTSCAN_DATA_STORE,
+# python app.py --serve включает 'shared'
+DATA_STORE = os.environ.get('FASTSCAN_DATA_STORE', 'memory')
+# Каталог общего хранилища (FASTSCAN_SHARED_STORE_DIR), по умолчанию cache/shared.
+# На Linux /dev/shm держит файлы в RAM без записи на диск
+SHARED_STORE_DIR = os.environ.get('FASTSCAN_SHARED_STORE_DIR')
+
+# Метрики callbacks (/metrics, src/metrics.py): квантили p50/p95/p99 считаются
+# по последним METRICS_WINDOW вызовам каждого callback (FASTSCAN_METRICS_WINDOW)
+METRICS_WINDOW = int(os.environ.get('FASTSCAN_METRICS_WINDOW', '1024'))
@@ -1,123 +1,259 @@
 """
-Minimal server-side cache - only DataFrames, no trace caching
-Упрощенная версия без LRU кеша для clientside playback
+Server-side DataFrame cache - LRU with a byte budget, no trace caching
+Кеш DataFrame с вытеснением давно неиспользуемых файлов по бюджету памяти
 """
 
+import threading
+from concurrent.futures import Future
+import numpy as np
 import pandas as pd
+from collections import OrderedDict
 from typing import Dict
-from .data_loader import get_orderbook_data, calculate_anomaly_threshold, calculate_pressure
-from .config import BAR_SCALE_COEFF
+from .data_loader import get_orderbook_levels
+from .metrics import record_cache_lookup
+from .config import CACHE_BUDGET_MB, DATA_STORE
+
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    """Memory held by a cached DataFrame: deep memory_usage plus its level tensor"""
+    return int(df.memory_usage(index=True, deep=True).sum()) + get_orderbook_levels(df).nbytes
 
 
 class SimpleDataFrameCache:
-    """Cache loaded DataFrames only"""
+    """
+    Cache loaded DataFrames with LRU eviction by byte budget.
+    The most recently used file is never evicted, even if it alone exceeds the budget.
+    A prefetch may evict older files the user opened, but never the most recently
+    used one and never another prefetched file that has not been opened yet.
+    """
 
-    def __init__(self):
-        self.df_cache: Dict[str, pd.DataFrame] = {}
+    def __init__(self, budget_bytes: int = None, loader=None):
+        # Функция загрузки файла (None - load_data, см. src/shared_store.py)
+        self.loader = loader
+        self.df_cache: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+        self.df_sizes: Dict[str, int] = {}
+        self.budget_bytes = budget_bytes if budget_bytes is not None else CACHE_BUDGET_MB * 1024 * 1024
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.prefetched = 0
+        self.collapsed_loads = 0
+        # Загрузки в процессе: один загрузчик на файл, остальные ждут его Future
+        self.inflight: Dict[str, Future] = {}
+        # Файлы в процессе подгрузки, которые уже запросил пользователь
+        self.demanded = set()
+        # Подгруженные файлы, которые пользователь ещё не открывал
+        self.unopened = set()
+        # Защищает df_cache, inflight и счётчики: к кешу обращаются потоки Flask и подгрузки
+        self.lock = threading.RLock()
+
+    def __contains__(self, filename: str) -> bool:
+        with self.lock:
+            return filename in self.df_cache
 
     def get_df(self, filename: str) -> pd.DataFrame:
-        """Get or load DataFrame"""
-        if filename not in self.df_cache:
+        """Get or load DataFrame (single-flight: one load per file at a time)"""
+        return self._load(filename, prefetch=False)
+
+    def prefetch(self, filename: str) -> bool:
+        """
+        Load a file in the background. Returns True if it is in the cache afterwards
+        (it is dropped if it does not fit even after evictions, see _offer).
+        """
+        self._load(filename, prefetch=True)
+        return filename in self
+
+    def _load(self, filename: str, prefetch: bool) -> pd.DataFrame:
+        """
+        Single-flight load: the first caller for a cold file loads it,
+        concurrent callers for the same file wait on its Future.
+        """
+        with self.lock:
+            df = self.df_cache.get(filename)
+            if df is not None:
+                if not prefetch:
+                    self.hits += 1
+                    record_cache_lookup(True)
+                    self.df_cache.move_to_end(filename)
+                    self.unopened.discard(filename)
+                return df
+
+            future = self.inflight.get(filename)
+            leader = future is None
+            if leader:
+                future = Future()
+                self.inflight[filename] = future
+            else:
+                self.collapsed_loads += 1
+            if not prefetch:
+                self.misses += 1
+                record_cache_lookup(False)
+                self.demanded.add(filename)
+
+        if not leader:
+            return future.result()
+
+        try:
             from .data_loader import load_data
-            self.df_cache[filename] = load_data(filename)
-        return self.df_cache[filename]
+            df = (self.loader or load_data)(filename)
+            nbytes = frame_nbytes(df)
+            with self.lock:
+                # Подгрузку, которую успел запросить пользователь, кладём как обычную загрузку
+                if filename in self.demanded:
+                    self._store(filename, df, nbytes)
+                else:
+                    self._offer(filename, df, nbytes)
+                self._finish(filename)
+            future.set_result(df)
+            return df
+        except BaseException as e:
+            with self.lock:
+                self._finish(filename)
+            future.set_exception(e)
+            raise
+
+    def _finish(self, filename: str):
+        """Снять отметку загрузки (вызывается под self.lock)"""
+        self.inflight.pop(filename, None)
+        self.demanded.discard(filename)
+
+    def _store(self, filename: str, df: pd.DataFrame, nbytes: int):
+        """Put DataFrame into the cache and evict LRU files over budget (under self.lock)"""
+        if filename in self.df_cache:
+            self.bytes_used -= self.df_sizes[filename]
+        self.df_cache[filename] = df
+        self.df_cache.move_to_end(filename)
+        self.df_sizes[filename] = nbytes
+        self.bytes_used += nbytes
 
-    def compute_trace_data(self, filename: str, row_idx: int) -> Dict:
-        """Compute trace data on-the-fly, no caching"""
-        df = self.get_df(filename)
-        return extract_trace_data(df, row_idx)
+        while self.bytes_used > self.budget_bytes and len(self.df_cache) > 1:
+            oldest = next(iter(self.df_cache))
+            self._evict(oldest)
 
+    def _evict(self, filename: str):
+        """Drop a file from the cache (under self.lock)"""
+        del self.df_cache[filename]
+        self.bytes_used -= self.df_sizes.pop(filename)
+        self.unopened.discard(filename)
+        self.evictions += 1
 
-def extract_trace_data(df: pd.DataFrame, row_idx: int) -> Dict:
+    def _prefetch_evictable(self):
+        """
+        Files a prefetch may evict, oldest first (under self.lock): everything
+        except the most recently used file and prefetched files not opened yet.
+        """
+        names = list(self.df_cache)[:-1]
+        return [name for name in names if name not in self.unopened]
+
+    def prefetch_room(self) -> int:
+        """Bytes a prefetched file may occupy after evicting everything it is allowed to"""
+        with self.lock:
+            evictable = sum(self.df_sizes[name] for name in self._prefetch_evictable())
+            return self.budget_bytes - self.bytes_used + evictable
+
+    def estimate_nbytes(self, rows: int):
+        """Expected memory of a file with `rows` rows, by the cached files (None if empty)"""
+        with self.lock:
+            cached_rows = sum(len(df) for df in self.df_cache.values())
+            if cached_rows == 0:
+                return None
+            return int(self.bytes_used / cached_rows * rows)
+
+    def _offer(self, filename: str, df: pd.DataFrame, nbytes: int) -> bool:
+        """
+        Put a prefetched DataFrame into the cache (under self.lock), evicting older
+        files if needed (see _prefetch_evictable). Dropped if it does not fit even then.
+        Prefetched files are placed at the LRU end, so they are the first to go
+        when a file the user opened needs room.
+        """
+        if filename in self.df_cache:
+            return False
+        evictable = self._prefetch_evictable()
+        if nbytes > self.budget_bytes - self.bytes_used + sum(self.df_sizes[name] for name in evictable):
+            return False
+        for name in evictable:
+            if self.bytes_used + nbytes <= self.budget_bytes:
+                break
+            self._evict(name)
+        self.df_cache[filename] = df
+        self.df_cache.move_to_end(filename, last=False)
+        self.df_sizes[filename] = nbytes
+        self.bytes_used += nbytes
+        self.unopened.add(filename)
+        self.prefetched += 1
+        return True
+
+    def stats(self) -> Dict:
+        """Hit/miss/eviction counters and memory usage"""
+        with self.lock:
+            return {
+                'entries': len(self.df_cache),
+                'bytes_used': self.bytes_used,
+                'budget_bytes': self.budget_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'prefetched': self.prefetched,
+                'collapsed_loads': self.collapsed_loads,
+                'inflight': len(self.inflight),
+            }
+
+
+# Маркеры текущей позиции: имя маркера в чанке playback -> колонка DataFrame
+MARKER_COLUMNS = {
+    'up_ask_price': 'up_ask_1_price',
+    'down_ask_price': 'down_ask_1_price',
+    'binance_price': 'binance_btc_price',
+    'oracle_price': 'oracle_btc_price',
+    'lag': 'lag',
+    'ret1s': 'binance_ret1s_x100',
+    'ret5s': 'binance_ret5s_x100',
+}
+
+
+def compute_batch_flags(levels):
     """
-    Extract trace data from DataFrame row
-    Moved from buffer.py _extract_trace_data
+    Флаги аномалий и давления для диапазона строк тензора уровней.
+
+    Args:
+        levels: тензор уровней формы (n, 2, 2, 5, 2)
+
+    Returns:
+        tuple: (anomaly (n, 2, 2, 5) bool,
+                totals (n, 2, 2) float64 суммы размеров по книгам,
+                buyers (n, 2) bool: bid_total > ask_total по сторонам UP/DOWN)
     """
-    row = df.iloc[row_idx]
-    ob_data = get_orderbook_data(row)
-
-    all_sizes = (
-        ob_data['up']['bid_sizes'] + ob_data['up']['ask_sizes'] +
-        ob_data['down']['bid_sizes'] + ob_data['down']['ask_sizes']
-    )
-    anomaly_threshold = calculate_anomaly_threshold(all_sizes)
-
-    up_pressure, up_bid_total, up_ask_total = calculate_pressure(
-        ob_data['up']['bid_sizes'], ob_data['up']['ask_sizes']
-    )
-    down_pressure, down_bid_total, down_ask_total = calculate_pressure(
-        ob_data['down']['bid_sizes'], ob_data['down']['ask_sizes']
-    )
-
-    def get_colors(sizes, base_color, anomaly_color):
-        colors = []
-        for s in sizes:
-            if pd.notna(s) and s > anomaly_threshold:
-                colors.append(anomaly_color)
-            else:
-                colors.append(base_color)
-        return colors
-
-    trace_data = {
-        'up_bids': {
-            'y': [f"{p:.2f}" if pd.notna(p) else "N/A" for p in ob_data['up']['bid_prices']],
-            'x': [-abs(s) * BAR_SCALE_COEFF if pd.notna(s) else 0 for s in ob_data['up']['bid_sizes']],
-            'text': [f"${s:,.0f}" if pd.notna(s) else "" for s in ob_data['up']['bid_sizes']],
-            'colors': get_colors(ob_data['up']['bid_sizes'], 'rgba(0, 200, 83, 0.7)', 'rgba(0, 255, 100, 1)')
-        },
-        'up_asks': {
-            'y': [f"{p:.2f}" if pd.notna(p) else "N/A" for p in ob_data['up']['ask_prices']],
-            'x': [abs(s) * BAR_SCALE_COEFF if pd.notna(s) else 0 for s in ob_data['up']['ask_sizes']],
-            'text': [f"${s:,.0f}" if pd.notna(s) else "" for s in ob_data['up']['ask_sizes']],
-            'colors': get_colors(ob_data['up']['ask_sizes'], 'rgba(244, 67, 54, 0.7)', 'rgba(255, 100, 100, 1)')
-        },
-        'down_bids': {
-            'y': [f"{p:.2f}" if pd.notna(p) else "N/A" for p in ob_data['down']['bid_prices']],
-            'x': [-abs(s) * BAR_SCALE_COEFF if pd.notna(s) else 0 for s in ob_data['down']['bid_sizes']],
-            'text': [f"${s:,.0f}" if pd.notna(s) else "" for s in ob_data['down']['bid_sizes']],
-            'colors': get_colors(ob_data['down']['bid_sizes'], 'rgba(0, 200, 83, 0.7)', 'rgba(0, 255, 100, 1)')
-        },
-        'down_asks': {
-            'y': [f"{p:.2f}" if pd.notna(p) else "N/A" for p in ob_data['down']['ask_prices']],
-            'x': [abs(s) * BAR_SCALE_COEFF if pd.notna(s) else 0 for s in ob_data['down']['ask_sizes']],
-            'text': [f"${s:,.0f}" if pd.notna(s) else "" for s in ob_data['down']['ask_sizes']],
-            'colors': get_colors(ob_data['down']['ask_sizes'], 'rgba(244, 67, 54, 0.7)', 'rgba(255, 100, 100, 1)')
-        },
-        'timestamp': ob_data['timestamp'],
-        'seconds_till_end': ob_data['seconds_till_end'],
-        'time_till_end': ob_data['time_till_end'],
-        'row_idx': row_idx,
-        'up_pressure': up_pressure,
-        'up_bid_total': up_bid_total,
-        'up_ask_total': up_ask_total,
-        'down_pressure': down_pressure,
-        'down_bid_total': down_bid_total,
-        'down_ask_total': down_ask_total,
-        'up_ask_price_x': [row_idx] if pd.notna(row.get('up_ask_1_price')) else [],
-        'up_ask_price_y': [float(row.get('up_ask_1_price'))] if pd.notna(row.get('up_ask_1_price')) else [],
-        'down_ask_price_x': [row_idx] if pd.notna(row.get('down_ask_1_price')) else [],
-        'down_ask_price_y': [float(row.get('down_ask_1_price'))] if pd.notna(row.get('down_ask_1_price')) else [],
-        'binance_price_x': [row_idx] if pd.notna(row.get('binance_btc_price')) else [],
-        'binance_price_y': [float(row.get('binance_btc_price'))] if pd.notna(row.get('binance_btc_price')) else [],
-        'oracle_price_x': [row_idx] if pd.notna(row.get('oracle_btc_price')) else [],
-        'oracle_price_y': [float(row.get('oracle_btc_price'))] if pd.notna(row.get('oracle_btc_price')) else [],
-        'lag_x': [row_idx] if pd.notna(row.get('lag')) else [],
-        'lag_y': [float(row.get('lag'))] if pd.notna(row.get('lag')) else [],
-        'ret1s_x': [row_idx] if pd.notna(row.get('binance_ret1s_x100')) else [],
-        'ret1s_y': [float(row.get('binance_ret1s_x100'))] if pd.notna(row.get('binance_ret1s_x100')) else [],
-        'ret5s_x': [row_idx] if pd.notna(row.get('binance_ret5s_x100')) else [],
-        'ret5s_y': [float(row.get('binance_ret5s_x100'))] if pd.notna(row.get('binance_ret5s_x100')) else []
-    }
-    return trace_data
+    sizes = levels[..., 1]
+
+    # Порог аномалии: 2x среднего положительного размера по всем 20 уровням строки
+    positive = sizes > 0
+    counts = positive.sum(axis=(1, 2, 3))
+    sums = np.where(positive, sizes, 0).sum(axis=(1, 2, 3), dtype=np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        thresholds = np.where(counts > 0, sums / counts * 2, np.inf)
+    anomaly = sizes > thresholds[:, None, None, None]
+
+    # Давление: суммы размеров по книгам (n, сторона, книга)
+    totals = np.nansum(sizes, axis=-1, dtype=np.float64)
+    buyers = totals[:, :, 0] > totals[:, :, 1]
+    return anomaly, totals, buyers
 
 
 # Global instance
 _cache = None
+_cache_lock = threading.Lock()
 
 
 def get_data_cache():
-    """Get global cache instance"""
+    """Get global cache instance (created once, safe to call from any thread)"""
     global _cache
     if _cache is None:
-        _cache = SimpleDataFrameCache()
+        with _cache_lock:
+            if _cache is None:
+                loader = None
+                if DATA_STORE == 'shared':
+                    from .shared_store import open_frame
+                    loader = open_frame
+                _cache = SimpleDataFrameCache(loader=loader)
     return _cache
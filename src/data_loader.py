@@ -4,12 +4,34 @@ Data Loader Module
 """
 
 import os
+import glob
+import hashlib
+import weakref
 import pandas as pd
 import numpy as np
+import pyarrow.parquet as pq
+from .schema import (
+    SCHEMA_VERSION,
+    ORDERBOOK_SIDES,
+    ORDERBOOK_BOOKS,
+    ORDERBOOK_DEPTH,
+    ORDERBOOK_FIELDS,
+    ORDERBOOK_LEVEL_COLUMNS,
+    DERIVED_COLUMNS,
+    get_csv_dtypes,
+    derive_column,
+    format_time_till_end,
+)
 
 # Путь к директории с файлами
 FILES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'files')
 
+# Путь к директории с колоночными (Parquet) копиями CSV файлов
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache')
+
+# Тензоры уровней по id(DataFrame), удаляются вместе с DataFrame
+_levels_cache = {}
+
 
 def get_csv_files():
     """Получить список CSV файлов в директории"""
@@ -17,36 +39,193 @@ def get_csv_files():
     return sorted(files)
 
 
-def load_data(filename):
-    """Загрузить данные из CSV файла"""
+def file_fingerprint(filename):
+    """
+    Отпечаток CSV файла: путь + mtime + размер.
+    Меняется при любом изменении файла на диске.
+
+    Returns:
+        str: короткий sha1-хеш
+    """
+    filepath = os.path.abspath(os.path.join(FILES_DIR, filename))
+    stat = os.stat(filepath)
+    key = f"{filepath}|{stat.st_mtime_ns}|{stat.st_size}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+
+def get_columnar_path(filename):
+    """Путь к Parquet копии CSV файла для текущей версии файла и схемы"""
+    stem = os.path.splitext(filename)[0]
+    key = f"{file_fingerprint(filename)}|schema={SCHEMA_VERSION}"
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, f"{stem}.{digest}.parquet")
+
+
+def read_csv_with_schema(filepath):
+    """
+    Прочитать CSV с типами из схемы (src/schema.py).
+    Производные колонки (time_till_end) не загружаются.
+    """
+    header = pd.read_csv(filepath, nrows=0).columns
+    usecols = [col for col in header if col not in DERIVED_COLUMNS]
+    return pd.read_csv(filepath, usecols=usecols, dtype=get_csv_dtypes(usecols))
+
+
+def convert_to_columnar(filename):
+    """
+    Прочитать CSV и сохранить его Parquet копию в CACHE_DIR.
+    Запись атомарная (через временный файл), старые версии копии удаляются.
+
+    Returns:
+        pd.DataFrame: данные, прочитанные из CSV
+    """
     filepath = os.path.join(FILES_DIR, filename)
-    df = pd.read_csv(filepath)
+    columnar_path = get_columnar_path(filename)
+    df = read_csv_with_schema(filepath)
+
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{columnar_path}.{os.getpid()}.tmp"
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, columnar_path)
+    except OSError as e:
+        print(f"Error writing columnar cache for {filename}: {e}")
+        return df
+
+    # Удаляем устаревшие копии этого файла (другой mtime/размер)
+    stem = os.path.splitext(filename)[0]
+    pattern = f"{glob.escape(stem)}.{'[0-9a-f]' * 16}.parquet"
+    for stale_path in glob.glob(os.path.join(CACHE_DIR, pattern)):
+        if stale_path != columnar_path:
+            try:
+                os.remove(stale_path)
+            except OSError:
+                pass
+
     return df
 
 
-def get_orderbook_data(row):
+def load_data(filename, columns=None):
+    """
+    Загрузить данные файла.
+    Первая загрузка читает CSV и сохраняет Parquet копию,
+    все последующие открывают Parquet копию.
+
+    Args:
+        filename: имя файла в FILES_DIR
+        columns: список нужных колонок (None - все). Читаются только они;
+            производные колонки (time_till_end) вычисляются из исходных.
+    """
+    source_columns = None
+    if columns is not None:
+        source_columns = []
+        for col in columns:
+            for source in DERIVED_COLUMNS.get(col, (col,)):
+                if source not in source_columns:
+                    source_columns.append(source)
+
+    columnar_path = get_columnar_path(filename)
+    if os.path.exists(columnar_path):
+        if source_columns is not None:
+            available = set(pq.read_schema(columnar_path).names)
+            source_columns = [col for col in source_columns if col in available]
+        df = pd.read_parquet(columnar_path, columns=source_columns)
+    else:
+        df = convert_to_columnar(filename)
+        if source_columns is not None:
+            df = df[[col for col in source_columns if col in df.columns]]
+
+    if columns is None:
+        # Тензор уровней стакана строится один раз при загрузке
+        get_orderbook_levels(df)
+        return df
+
+    for col in columns:
+        if col in DERIVED_COLUMNS and all(source in df.columns for source in DERIVED_COLUMNS[col]):
+            df[col] = derive_column(df, col)
+    return df[[col for col in columns if col in df.columns]]
+
+
+def build_orderbook_levels(df):
+    """
+    Собрать 40 колонок стакана (UP/DOWN, bid/ask, 5 уровней, price/size)
+    в один непрерывный float32 массив формы (N, 2, 2, 5, 2).
+    Отсутствующие колонки заполняются NaN.
+
+    Returns:
+        np.ndarray: тензор уровней стакана
+    """
+    values = df.reindex(columns=ORDERBOOK_LEVEL_COLUMNS).to_numpy(dtype=np.float32, na_value=np.nan)
+    shape = (len(df), len(ORDERBOOK_SIDES), len(ORDERBOOK_BOOKS), ORDERBOOK_DEPTH, len(ORDERBOOK_FIELDS))
+    return np.ascontiguousarray(values).reshape(shape)
+
+
+def get_orderbook_levels(df):
+    """
+    Получить тензор уровней стакана для DataFrame (строится один раз).
+    Кадр стакана для строки - это view: get_orderbook_levels(df)[row_idx].
+
+    Returns:
+        np.ndarray: тензор формы (N, 2, 2, 5, 2), float32
+    """
+    key = id(df)
+    levels = _levels_cache.get(key)
+    if levels is None:
+        levels = build_orderbook_levels(df)
+        _levels_cache[key] = levels
+        weakref.finalize(df, _levels_cache.pop, key, None)
+    return levels
+
+
+def register_orderbook_levels(df, levels):
+    """
+    Привязать к DataFrame готовый тензор уровней (например, отображённый
+    из общего хранилища src/shared_store.py), чтобы он не строился заново.
     """
-    Извлечь данные стакана ордеров из строки DataFrame
+    key = id(df)
+    if key not in _levels_cache:
+        _levels_cache[key] = levels
+        weakref.finalize(df, _levels_cache.pop, key, None)
+
+
+def _get_cell(df, column, row_idx, default):
+    """Значение одной ячейки без построения строки DataFrame (NaN/NA -> default)"""
+    if column not in df.columns:
+        return default
+    value = df[column].iat[row_idx]
+    return default if pd.isna(value) else value
+
+
+def get_orderbook_data(df, row_idx):
+    """
+    Извлечь данные стакана ордеров для строки DataFrame.
+    Цены и размеры - views тензора уровней, без копирования.
 
     Returns:
         dict: Словарь с данными UP и DOWN стаканов
     """
+    frame = get_orderbook_levels(df)[row_idx]
+    timestamp = _get_cell(df, 'timestamp_et', row_idx, None)
+    if timestamp is None:
+        timestamp = _get_cell(df, 'timestamp_ms', row_idx, 'N/A')
+    seconds_till_end = _get_cell(df, 'seconds_till_end', row_idx, None)
     data = {
         'up': {
-            'bid_prices': [row.get(f'up_bid_{i}_price', np.nan) for i in range(1, 6)],
-            'bid_sizes': [row.get(f'up_bid_{i}_size', np.nan) for i in range(1, 6)],
-            'ask_prices': [row.get(f'up_ask_{i}_price', np.nan) for i in range(1, 6)],
-            'ask_sizes': [row.get(f'up_ask_{i}_size', np.nan) for i in range(1, 6)],
+            'bid_prices': frame[0, 0, :, 0],
+            'bid_sizes': frame[0, 0, :, 1],
+            'ask_prices': frame[0, 1, :, 0],
+            'ask_sizes': frame[0, 1, :, 1],
         },
         'down': {
-            'bid_prices': [row.get(f'down_bid_{i}_price', np.nan) for i in range(1, 6)],
-            'bid_sizes': [row.get(f'down_bid_{i}_size', np.nan) for i in range(1, 6)],
-            'ask_prices': [row.get(f'down_ask_{i}_price', np.nan) for i in range(1, 6)],
-            'ask_sizes': [row.get(f'down_ask_{i}_size', np.nan) for i in range(1, 6)],
+            'bid_prices': frame[1, 0, :, 0],
+            'bid_sizes': frame[1, 0, :, 1],
+            'ask_prices': frame[1, 1, :, 0],
+            'ask_sizes': frame[1, 1, :, 1],
         },
-        'timestamp': row.get('timestamp_et', row.get('timestamp_ms', 'N/A')),
-        'seconds_till_end': row.get('seconds_till_end', None),
-        'time_till_end': row.get('time_till_end', '--:--')
+        'sizes': frame[..., 1],
+        'timestamp': timestamp,
+        'seconds_till_end': seconds_till_end,
+        'time_till_end': _get_cell(df, 'time_till_end', row_idx, format_time_till_end(seconds_till_end))
     }
     return data
 
@@ -56,14 +235,16 @@ def calculate_anomaly_threshold(sizes):
     Вычислить порог аномалии (>2x среднего размера)
 
     Args:
-        sizes: Список размеров ордеров
+        sizes: Размеры ордеров (список или массив, NaN игнорируются)
 
     Returns:
         float: Пороговое значение для определения аномалии
     """
-    valid_sizes = [s for s in sizes if pd.notna(s) and s > 0]
-    if valid_sizes:
-        return np.mean(valid_sizes) * 2
+    sizes = np.asarray(sizes)
+    valid_sizes = sizes[sizes > 0]
+    if valid_sizes.size:
+        # Сумма в float64 точна и не зависит от порядка (совпадает с батч-версией)
+        return float(valid_sizes.sum(dtype=np.float64)) / valid_sizes.size * 2
     return float('inf')
 
 
@@ -78,8 +259,8 @@ def calculate_pressure(bid_sizes, ask_sizes):
     Returns:
         tuple: (тип давления, сумма бидов, сумма асков)
     """
-    bid_total = sum([s for s in bid_sizes if pd.notna(s)])
-    ask_total = sum([s for s in ask_sizes if pd.notna(s)])
+    bid_total = float(np.nansum(bid_sizes, dtype=np.float64))
+    ask_total = float(np.nansum(ask_sizes, dtype=np.float64))
     pressure = "BUYERS" if bid_total > ask_total else "SELLERS"
     return pressure, bid_total, ask_total
 
@@ -143,26 +324,14 @@ def calculate_orderbook_range(df):
             'display_width': фиксированная ширина для отображения
         }
     """
-    all_sizes = []
-
-    # Собираем все размеры из всех строк
-    size_columns = [
-        'up_bid_1_size', 'up_bid_2_size', 'up_bid_3_size', 'up_bid_4_size', 'up_bid_5_size',
-        'up_ask_1_size', 'up_ask_2_size', 'up_ask_3_size', 'up_ask_4_size', 'up_ask_5_size',
-        'down_bid_1_size', 'down_bid_2_size', 'down_bid_3_size', 'down_bid_4_size', 'down_bid_5_size',
-        'down_ask_1_size', 'down_ask_2_size', 'down_ask_3_size', 'down_ask_4_size', 'down_ask_5_size',
-    ]
+    sizes = get_orderbook_levels(df)[..., 1]
+    valid_sizes = sizes[sizes > 0]
 
-    for col in size_columns:
-        if col in df.columns:
-            values = df[col].dropna().values
-            all_sizes.extend([abs(v) for v in values if v > 0])
-
-    if not all_sizes:
+    if not valid_sizes.size:
         return {'min_size': 1, 'max_size': 1, 'display_width': 100}
 
     return {
-        'min_size': min(all_sizes),
-        'max_size': max(all_sizes),
+        'min_size': float(valid_sizes.min()),
+        'max_size': float(valid_sizes.max()),
         'display_width': 100  # Фиксированная ширина графика
-    }
\ No newline at end of file
+    }
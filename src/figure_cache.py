@@ -0,0 +1,374 @@
+"""
+Figure Cache Module
+Двухуровневый кеш начальных фигур: LRU в памяти + сжатый JSON на диске.
+Ключ - (отпечаток файла, виджет, версия виджета). Фигуры строятся с SVG
+линиями (scatter); варианты с другим типом трасс (render mode) хранятся
+только в памяти с типом трасс в ключе
+"""
+
+import os
+import glob
+import gzip
+import json
+import time
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+import orjson
+import plotly.io as pio
+from .data_loader import CACHE_DIR, file_fingerprint
+from .schema import SCHEMA_VERSION
+from .render_mode import set_line_trace_type
+from .skeleton import has_skeleton, build_skeleton_json
+from .shared_frame import SharedFrame, attach_frame, detach_frame
+from .config import FIGURE_CACHE_MB, FIGURE_BUILD_MODE, FIGURE_BUILD_WORKERS
+from .charts import (
+    create_orderbook_chart,
+    create_arbitrage_indicator_chart,
+    create_spread_chart,
+    create_imbalance_chart,
+    create_microprice_chart,
+    create_slope_chart,
+    create_eatflow_chart,
+    create_depth_chart,
+    create_btc_chart,
+    create_latency_direction_chart,
+    create_returns_chart,
+    create_volume_chart,
+    create_volatility_chart,
+    create_volume_spike_chart,
+    create_p_vwap_chart,
+)
+
+# Путь к дисковому уровню кеша фигур
+FIGURE_CACHE_DIR = os.path.join(CACHE_DIR, 'figures')
+
+# Тип трасс линий, с которым строятся и хранятся фигуры (go.Scatter)
+BASE_TRACE_TYPE = 'scatter'
+
+# Виджеты начального экрана в порядке Output'ов init_on_file_change:
+# имя -> (функция построения, версия). Версию нужно увеличить при любом
+# изменении виджета, иначе будут отдаваться старые фигуры из кеша.
+FIGURE_WIDGETS = OrderedDict([
+    ('orderbook', (create_orderbook_chart, 3)),
+    ('arbitrage_indicator', (create_arbitrage_indicator_chart, 3)),
+    ('spread', (create_spread_chart, 3)),
+    ('imbalance', (create_imbalance_chart, 3)),
+    ('microprice', (create_microprice_chart, 3)),
+    ('slope', (create_slope_chart, 3)),
+    ('eatflow', (create_eatflow_chart, 3)),
+    ('depth', (create_depth_chart, 3)),
+    ('btc', (create_btc_chart, 4)),
+    ('latency_direction', (create_latency_direction_chart, 4)),
+    ('returns', (create_returns_chart, 4)),
+    ('volume', (create_volume_chart, 4)),
+    ('volatility', (create_volatility_chart, 4)),
+    ('volume_spike', (create_volume_spike_chart, 4)),
+    ('p_vwap', (create_p_vwap_chart, 5)),
+])
+
+
+def widget_chart_id(widget):
+    """id графика виджета в layout ('p_vwap' -> 'chart-p-vwap')"""
+    return f"chart-{widget.replace('_', '-')}"
+
+
+def widget_version(widget):
+    """Версия фигуры виджета: версия виджета + версия схемы данных"""
+    return f"{FIGURE_WIDGETS[widget][1]}s{SCHEMA_VERSION}"
+
+
+def build_figure_json(df, widget, use_skeleton=True):
+    """
+    Построить начальную фигуру виджета (row_idx=0) и сериализовать в JSON.
+    По умолчанию через скелет виджета (src/skeleton.py): Plotly собирает
+    фигуру только при первой встрече, дальше подставляются массивы данных.
+    """
+    builder = FIGURE_WIDGETS[widget][0]
+    chart_id = widget_chart_id(widget)
+    if use_skeleton and has_skeleton(chart_id):
+        return build_skeleton_json(df, chart_id, builder)
+    return pio.to_json(builder(df, 0), validate=False)
+
+
+def _timed_build(df, widget):
+    """Построить фигуру виджета и замерить время"""
+    start = time.perf_counter()
+    figure_json = build_figure_json(df, widget)
+    return widget, figure_json, time.perf_counter() - start
+
+
+# DataFrame, подключённый в процессе-воркере: (token, df, блоки shared memory).
+# Держится до следующей сборки, чтобы все виджеты одного файла строились
+# на одном DataFrame (и общем кеше рядов src/series.py)
+_worker_frame = None
+
+
+def _build_in_worker(descriptor, widget):
+    """Построить фигуру в процессе-воркере по DataFrame из shared memory"""
+    global _worker_frame
+    if _worker_frame is None or _worker_frame[0] != descriptor['token']:
+        if _worker_frame is not None:
+            blocks = _worker_frame[2]
+            _worker_frame = None
+            detach_frame(blocks)
+        df, blocks = attach_frame(descriptor)
+        _worker_frame = (descriptor['token'], df, blocks)
+    return _timed_build(_worker_frame[1], widget)
+
+
+# Пул построения фигур (создаётся при первой сборке)
+_build_executor = None
+_build_executor_lock = threading.Lock()
+
+
+def get_build_executor():
+    """
+    Пул воркеров для построения фигур по FIGURE_BUILD_MODE/FIGURE_BUILD_WORKERS.
+
+    Returns:
+        Executor или None, если параллельная сборка выключена
+    """
+    global _build_executor
+    if FIGURE_BUILD_WORKERS <= 0:
+        return None
+    if _build_executor is None:
+        with _build_executor_lock:
+            if _build_executor is None:
+                if FIGURE_BUILD_MODE == 'process':
+                    # spawn: fork из многопоточного сервера небезопасен
+                    _build_executor = ProcessPoolExecutor(
+                        max_workers=FIGURE_BUILD_WORKERS,
+                        mp_context=multiprocessing.get_context('spawn')
+                    )
+                else:
+                    _build_executor = ThreadPoolExecutor(
+                        max_workers=FIGURE_BUILD_WORKERS, thread_name_prefix='figure'
+                    )
+    return _build_executor
+
+
+def iter_built_figures(df, widgets):
+    """
+    Построить фигуры виджетов в пуле воркеров.
+
+    Yields:
+        tuple: (widget, figure_json, seconds) в порядке готовности
+    """
+    executor = get_build_executor()
+    if executor is None or len(widgets) == 1:
+        for widget in widgets:
+            yield _timed_build(df, widget)
+        return
+
+    if isinstance(executor, ProcessPoolExecutor):
+        with SharedFrame(df) as shared:
+            futures = [executor.submit(_build_in_worker, shared.descriptor, widget) for widget in widgets]
+            for future in as_completed(futures):
+                yield future.result()
+    else:
+        futures = [executor.submit(_timed_build, df, widget) for widget in widgets]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+class FigureCache:
+    """
+    Cache of serialized initial figures.
+    Tier 1: in-memory LRU of JSON strings bounded by budget_bytes.
+    Tier 2: gzip-compressed JSON files in FIGURE_CACHE_DIR, survive restarts.
+    """
+
+    def __init__(self, budget_bytes=None, cache_dir=FIGURE_CACHE_DIR):
+        self.memory = OrderedDict()
+        self.budget_bytes = budget_bytes if budget_bytes is not None else FIGURE_CACHE_MB * 1024 * 1024
+        self.bytes_used = 0
+        self.cache_dir = cache_dir
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.builds = 0
+        self.lock = threading.Lock()
+
+    def disk_path(self, filename, fingerprint, widget):
+        """Путь к сжатому JSON фигуры на диске"""
+        stem = os.path.splitext(filename)[0]
+        return os.path.join(self.cache_dir, f"{stem}.{fingerprint}.{widget}.v{widget_version(widget)}.json.gz")
+
+    def get_jsons(self, filename, get_df, widgets=None, trace_types=None):
+        """
+        JSON начальных фигур виджетов (в порядке widgets).
+        Промахи обоих уровней строятся параллельно в пуле воркеров.
+
+        Args:
+            filename: имя файла в FILES_DIR
+            get_df: функция без аргументов, возвращающая DataFrame
+                    (вызывается только при промахе обоих уровней)
+            widgets: ключи FIGURE_WIDGETS (по умолчанию все)
+            trace_types: {виджет: тип трасс линий} (см. render_mode.line_trace_type),
+                         по умолчанию 'scatter', как фигуры и построены
+        """
+        widgets = list(widgets or FIGURE_WIDGETS)
+        fingerprint = file_fingerprint(filename)
+        found = {widget: self._lookup(filename, fingerprint, widget) for widget in widgets}
+        missing = [widget for widget in widgets if found[widget] is None]
+        if missing:
+            self._build_missing(filename, fingerprint, get_df, missing, found)
+        for widget, trace_type in (trace_types or {}).items():
+            if widget in found and trace_type != BASE_TRACE_TYPE:
+                found[widget] = self._variant(fingerprint, widget, trace_type, found[widget])
+        return [found[widget] for widget in widgets]
+
+    def _build_missing(self, filename, fingerprint, get_df, missing, found):
+        """Построить фигуры виджетов missing и положить их в оба уровня и в found"""
+        start = time.perf_counter()
+        timings = []
+        for widget, figure_json, seconds in iter_built_figures(get_df(), missing):
+            path = self.disk_path(filename, fingerprint, widget)
+            self._write_disk(filename, widget, path, figure_json)
+            self._remember((fingerprint, widget, widget_version(widget)), figure_json)
+            with self.lock:
+                self.builds += 1
+            found[widget] = figure_json
+            timings.append((widget, seconds))
+
+        timings.sort(key=lambda item: item[1], reverse=True)
+        breakdown = ', '.join(f"{widget} {seconds:.2f}s" for widget, seconds in timings)
+        print(f"Built {len(missing)} figures for {filename} in {time.perf_counter() - start:.2f}s: {breakdown}")
+
+    def _variant(self, fingerprint, widget, trace_type, figure_json):
+        """JSON фигуры с другим типом трасс линий (разбирается один раз, дальше из памяти)"""
+        key = (fingerprint, widget, widget_version(widget), trace_type)
+        with self.lock:
+            variant_json = self.memory.get(key)
+            if variant_json is not None:
+                self.memory.move_to_end(key)
+                self.memory_hits += 1
+                return variant_json
+        figure = set_line_trace_type(json.loads(figure_json), widget_chart_id(widget), trace_type)
+        variant_json = orjson.dumps(figure).decode('utf-8')
+        self._remember(key, variant_json)
+        return variant_json
+
+    def get_json(self, filename, widget, get_df, trace_type=None):
+        """JSON начальной фигуры одного виджета"""
+        trace_types = None if trace_type is None else {widget: trace_type}
+        return self.get_jsons(filename, get_df, [widget], trace_types)[0]
+
+    def get_figures(self, filename, get_df, widgets=None, trace_types=None):
+        """
+        Начальные фигуры виджетов для Output('...', 'figure'): готовый JSON
+        вставляется в ответ Dash как есть (orjson.Fragment), без разбора
+        и повторной сериализации
+        """
+        return [orjson.Fragment(figure_json) for figure_json in self.get_jsons(filename, get_df, widgets, trace_types)]
+
+    def get_figure(self, filename, widget, get_df, trace_type=None):
+        """Начальная фигура виджета для Output('...', 'figure') (см. get_figures)"""
+        return orjson.Fragment(self.get_json(filename, widget, get_df, trace_type))
+
+    def _lookup(self, filename, fingerprint, widget):
+        """JSON фигуры из памяти или с диска (None при промахе)"""
+        key = (fingerprint, widget, widget_version(widget))
+        with self.lock:
+            figure_json = self.memory.get(key)
+            if figure_json is not None:
+                self.memory.move_to_end(key)
+                self.memory_hits += 1
+                return figure_json
+
+        figure_json = self._read_disk(self.disk_path(filename, fingerprint, widget))
+        if figure_json is not None:
+            with self.lock:
+                self.disk_hits += 1
+            self._remember(key, figure_json)
+        return figure_json
+
+    def prebuild(self, filename, df, widgets=None):
+        """
+        Построить и записать на диск фигуры файла, которых ещё нет в кеше.
+
+        Returns:
+            int: число построенных фигур
+        """
+        fingerprint = file_fingerprint(filename)
+        built = 0
+        for widget in widgets or FIGURE_WIDGETS:
+            path = self.disk_path(filename, fingerprint, widget)
+            if os.path.exists(path):
+                continue
+            self._write_disk(filename, widget, path, build_figure_json(df, widget))
+            built += 1
+        return built
+
+    def _remember(self, key, figure_json):
+        """Положить JSON в LRU памяти и вытеснить старые фигуры сверх бюджета"""
+        nbytes = len(figure_json)
+        with self.lock:
+            if key in self.memory:
+                return
+            self.memory[key] = figure_json
+            self.bytes_used += nbytes
+            while self.bytes_used > self.budget_bytes and len(self.memory) > 1:
+                _, evicted = self.memory.popitem(last=False)
+                self.bytes_used -= len(evicted)
+
+    def _read_disk(self, path):
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError) as e:
+            print(f"Error reading cached figure {path}: {e}")
+            return None
+
+    def _write_disk(self, filename, widget, path, figure_json):
+        """Атомарно записать фигуру и удалить копии старых версий файла/виджета"""
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with gzip.open(tmp_path, 'wt', encoding='utf-8', compresslevel=6) as f:
+                f.write(figure_json)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error writing cached figure {path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        stem = os.path.splitext(filename)[0]
+        pattern = os.path.join(self.cache_dir, f"{glob.escape(stem)}.*.{glob.escape(widget)}.v*.json.gz")
+        for stale in glob.glob(pattern):
+            if stale != path:
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+
+    def stats(self):
+        """Счётчики попаданий и объём памяти"""
+        with self.lock:
+            return {
+                'entries': len(self.memory),
+                'bytes_used': self.bytes_used,
+                'budget_bytes': self.budget_bytes,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'builds': self.builds,
+            }
+
+
+# Global instance
+_figure_cache = None
+_figure_cache_lock = threading.Lock()
+
+
+def get_figure_cache():
+    """Get global figure cache instance (created once, safe to call from any thread)"""
+    global _figure_cache
+    if _figure_cache is None:
+        with _figure_cache_lock:
+            if _figure_cache is None:
+                _figure_cache = FigureCache()
+    return _figure_cache
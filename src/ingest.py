@@ -0,0 +1,195 @@
+"""
+Ingest Module
+Массовая конвертация CSV из FILES_DIR в колоночный формат с обновлением каталога
+
+Использование:
+    python -m src.ingest
+    python -m src.ingest --workers 8
+    python -m src.ingest --force
+    python -m src.ingest --figures    # заодно построить начальные фигуры в кеш
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import closing
+import pandas as pd
+from .data_loader import FILES_DIR, get_csv_files, get_columnar_path, convert_to_columnar, file_fingerprint, load_data
+from .catalog import connect, find_stale_files, get_market_info, summarize_market, upsert_market, remove_markets, record_ingest
+
+
+def find_pending_files(conn, force=False, figures=False):
+    """
+    Файлы, которые нужно (пере)конвертировать: новые или изменённые
+    по каталогу, а также файлы без Parquet копии для текущей схемы
+    (с figures=True - и файлы, у которых нет всех фигур в дисковом кеше).
+
+    Returns:
+        tuple: (pending - список имён файлов, removed - исчезнувшие из FILES_DIR)
+    """
+    changed, removed = find_stale_files(conn)
+    if force:
+        return get_csv_files(), removed
+
+    pending = {filename for filename, _ in changed}
+    if figures:
+        from .figure_cache import get_figure_cache, FIGURE_WIDGETS
+        figure_cache = get_figure_cache()
+    for filename in get_csv_files():
+        if not os.path.exists(get_columnar_path(filename)):
+            pending.add(filename)
+        elif figures:
+            fingerprint = file_fingerprint(filename)
+            if not all(os.path.exists(figure_cache.disk_path(filename, fingerprint, w)) for w in FIGURE_WIDGETS):
+                pending.add(filename)
+    return sorted(pending), removed
+
+
+def ingest_file(filename, figures=False, force=False):
+    """
+    Конвертировать один CSV (выполняется в процессе пула).
+    С figures=True также строит начальные фигуры в дисковый кеш фигур.
+    Если Parquet копия актуальна и каталог совпадает с файлом (не хватало
+    только фигур), CSV не перечитывается: данные открываются из Parquet.
+
+    Returns:
+        dict: имя файла, stat CSV, сводка рынка для каталога, время конвертации
+            (seconds, при актуальной копии - открытия Parquet) и построения фигур
+    """
+    filepath = os.path.join(FILES_DIR, filename)
+    stat = os.stat(filepath)
+    columnar_path = get_columnar_path(filename)
+
+    known = None if force else get_market_info(filename)
+    converted = not (
+        known is not None
+        and (known['mtime_ns'], known['size']) == (stat.st_mtime_ns, stat.st_size)
+        and os.path.exists(columnar_path)
+    )
+
+    start = time.perf_counter()
+    if converted:
+        df = convert_to_columnar(filename)
+        columns = pd.read_csv(filepath, nrows=0).columns.tolist()
+    else:
+        df = load_data(filename)
+        columns = known['columns']
+    seconds = time.perf_counter() - start
+
+    figures_built = 0
+    start = time.perf_counter()
+    if figures:
+        from .figure_cache import get_figure_cache
+        figures_built = get_figure_cache().prebuild(filename, df)
+    figure_seconds = time.perf_counter() - start
+
+    columnar_bytes = os.path.getsize(columnar_path) if os.path.exists(columnar_path) else None
+
+    return {
+        'filename': filename,
+        'stat': stat,
+        'info': summarize_market(df, columns),
+        'converted': converted,
+        'columnar_path': columnar_path if columnar_bytes is not None else None,
+        'columnar_bytes': columnar_bytes,
+        'seconds': seconds,
+        'figures_built': figures_built,
+        'figure_seconds': figure_seconds,
+    }
+
+
+def run_ingest(workers=None, force=False, figures=False):
+    """
+    Конвертировать все новые и изменённые CSV пулом процессов.
+    Каталог обновляется в главном процессе по мере готовности файлов.
+
+    Returns:
+        dict: {'files', 'failed', 'rows', 'bytes', 'seconds'}
+    """
+    with closing(connect()) as conn:
+        pending, removed = find_pending_files(conn, force, figures)
+        remove_markets(conn, removed)
+        conn.commit()
+
+        if not pending:
+            print(f"Нечего конвертировать: {len(get_csv_files())} файлов актуальны")
+            return {'files': 0, 'failed': 0, 'rows': 0, 'bytes': 0, 'seconds': 0.0}
+
+        workers = workers or os.cpu_count() or 1
+        print(f"Конвертация {len(pending)} файлов, процессов: {workers}")
+
+        # Пропускная способность считается только по сконвертированным файлам
+        total_rows = total_bytes = converted = failed = 0
+        convert_seconds = figure_seconds = 0.0
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(ingest_file, filename, figures, force): filename for filename in pending}
+            for future in as_completed(futures):
+                filename = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    failed += 1
+                    print(f"Error ingesting {filename}: {e}")
+                    continue
+
+                info, stat = result['info'], result['stat']
+                if result['converted']:
+                    upsert_market(conn, filename, stat, info)
+                    record_ingest(
+                        conn, filename, stat.st_size, result['columnar_path'],
+                        result['columnar_bytes'], info['rows'], result['seconds']
+                    )
+                    conn.commit()
+
+                figure_seconds += result['figure_seconds']
+                figures_note = f", фигур: {result['figures_built']} за {result['figure_seconds']:.2f} s" if figures else ""
+                if result['converted']:
+                    converted += 1
+                    total_rows += info['rows']
+                    total_bytes += stat.st_size
+                    convert_seconds += result['seconds']
+                    print(f"  {filename}: {info['rows']} строк, {stat.st_size / 1e6:.1f} MB, {result['seconds']:.2f} s{figures_note}")
+                else:
+                    print(f"  {filename}: Parquet копия актуальна{figures_note}")
+
+        elapsed = time.perf_counter() - start
+
+    print(
+        f"\nГотово: {len(pending) - failed} файлов ({failed} ошибок) за {elapsed:.2f} s, "
+        f"сконвертировано {converted}: {total_rows} строк, {total_bytes / 1e6:.1f} MB"
+    )
+    if convert_seconds > 0:
+        # Время конвертации суммируется по процессам пула - скорость одного процесса
+        print(
+            f"Конвертация: {total_rows / convert_seconds:,.0f} rows/s, "
+            f"{total_bytes / 1e6 / convert_seconds:.1f} MB/s на процесс"
+        )
+    if figures:
+        print(f"Построение фигур: {figure_seconds:.2f} s (сумма по процессам)")
+    return {
+        'files': len(pending) - failed,
+        'converted': converted,
+        'failed': failed,
+        'rows': total_rows,
+        'bytes': total_bytes,
+        'seconds': elapsed,
+        'convert_seconds': convert_seconds,
+        'figure_seconds': figure_seconds,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Конвертация CSV рынков в колоночный формат с обновлением каталога'
+    )
+    parser.add_argument('--workers', type=int, default=None, help='Число процессов (по умолчанию все ядра)')
+    parser.add_argument('--force', action='store_true', help='Пересобрать все файлы, даже актуальные')
+    parser.add_argument('--figures', action='store_true', help='Построить начальные фигуры в дисковый кеш')
+    args = parser.parse_args()
+    run_ingest(workers=args.workers, force=args.force, figures=args.figures)
+
+
+if __name__ == '__main__':
+    main()
@@ -80,15 +80,20 @@ def create_main_layout():
             'speed': 1
         }),
         dcc.Store(id='cumulative-times', data=[]),
+        dcc.Store(id='market-timer-data', data=None),  # seconds_till_end файла для таймера
 
         # НОВЫЕ STORES для clientside playback
         dcc.Store(id='playback-chunk-request', data=None),  # JS → Server
         dcc.Store(id='playback-chunk-data', data=None),     # Server → JS
+        dcc.Store(id='active-track-request', data=None),    # JS → Server (окно Active-Track)
+        dcc.Store(id='linked-zoom-request', data=None),     # JS → Server (диапазон связанного зума)
 
         # Dummy divs для clientside callbacks
         html.Div(id='_chunk-receiver-dummy', style={'display': 'none'}),
         html.Div(id='_playback-engine-dummy', style={'display': 'none'}),
         html.Div(id='_playback-init-dummy', style={'display': 'none'}),
+        html.Div(id='_scrub-dummy', style={'display': 'none'}),
+        html.Div(id='_axis-link-dummy', style={'display': 'none'}),
         # Основной layout
         create_header(),
         html.Div([
@@ -0,0 +1,257 @@
+"""
+Metrics Module
+Метрики серверных callbacks: время (wall и CPU), размер ответа и обращения
+к кешу DataFrame по каждому callback. Отдаются в формате Prometheus на /metrics.
+
+Метрики считаются в каждом процессе отдельно: под gunicorn (--serve)
+один запрос /metrics показывает воркер, который его обработал (метка pid).
+"""
+
+import bisect
+import os
+import threading
+import time
+from collections import deque
+import numpy as np
+from dash.exceptions import PreventUpdate
+from .config import METRICS_WINDOW
+
+# Границы корзин гистограмм
+WALL_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PAYLOAD_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# Квантили по последним METRICS_WINDOW вызовам каждого callback
+QUANTILES = (0.5, 0.95, 0.99)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Обращения к кешу DataFrame из текущего callback (в этом потоке): [hits, misses]
+_local = threading.local()
+
+
+class Histogram:
+    """Prometheus гистограмма плюс окно последних значений для квантилей"""
+
+    def __init__(self, buckets, window=METRICS_WINDOW):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.recent = deque(maxlen=window)
+
+    def observe(self, value):
+        # le включительно: значение попадает в первую корзину с границей >= value
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+        self.recent.append(value)
+
+    def quantiles(self):
+        """{квантиль: значение} по окну последних вызовов"""
+        if not self.recent:
+            return {}
+        values = np.percentile(np.fromiter(self.recent, dtype=float), [q * 100 for q in QUANTILES])
+        return dict(zip(QUANTILES, values.tolist()))
+
+
+class CallbackStats:
+    """Метрики одного callback"""
+
+    def __init__(self):
+        self.calls = {'ok': 0, 'prevented': 0, 'error': 0}
+        self.wall = Histogram(WALL_BUCKETS)
+        self.cpu = Histogram(WALL_BUCKETS)
+        self.payload = Histogram(PAYLOAD_BUCKETS)
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+
+class CallbackMetrics:
+    """Метрики всех callbacks процесса (к ним обращаются потоки Flask)"""
+
+    def __init__(self):
+        self.callbacks = {}
+        self.lock = threading.Lock()
+
+    def record(self, name, status, wall, cpu, payload, cache_hits, cache_misses):
+        with self.lock:
+            stats = self.callbacks.get(name)
+            if stats is None:
+                stats = self.callbacks[name] = CallbackStats()
+            stats.calls[status] += 1
+            stats.wall.observe(wall)
+            stats.cpu.observe(cpu)
+            if status == 'ok':
+                stats.payload.observe(payload)
+            stats.cache_hits += cache_hits
+            stats.cache_misses += cache_misses
+
+    def render(self):
+        """Все метрики в текстовом формате Prometheus"""
+        lines = [
+            '# HELP fastscan_process_info Process serving this scrape',
+            '# TYPE fastscan_process_info gauge',
+            f'fastscan_process_info{{pid="{os.getpid()}"}} 1',
+        ]
+        with self.lock:
+            callbacks = sorted(self.callbacks.items())
+
+            lines += [
+                '# HELP fastscan_callback_calls_total Server callback calls by outcome',
+                '# TYPE fastscan_callback_calls_total counter',
+            ]
+            for name, stats in callbacks:
+                for status, count in stats.calls.items():
+                    lines.append(f'fastscan_callback_calls_total{{callback="{name}",status="{status}"}} {count}')
+
+            lines += [
+                '# HELP fastscan_callback_cache_lookups_total DataFrame cache lookups made by the callback',
+                '# TYPE fastscan_callback_cache_lookups_total counter',
+            ]
+            for name, stats in callbacks:
+                lines.append(f'fastscan_callback_cache_lookups_total{{callback="{name}",result="hit"}} {stats.cache_hits}')
+                lines.append(f'fastscan_callback_cache_lookups_total{{callback="{name}",result="miss"}} {stats.cache_misses}')
+
+            families = (
+                ('fastscan_callback_wall_seconds', 'wall', 'Wall time of a server callback, JSON serialization included'),
+                ('fastscan_callback_cpu_seconds', 'cpu', 'CPU time of the thread running a server callback'),
+                ('fastscan_callback_payload_bytes', 'payload', 'Size of the JSON response of a server callback'),
+            )
+            for metric, attr, help_text in families:
+                histograms = [(name, getattr(stats, attr)) for name, stats in callbacks]
+                lines += _render_histogram(metric, help_text, histograms)
+                lines += _render_quantiles(metric + '_recent', help_text, histograms)
+
+        return '\n'.join(lines) + '\n'
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _render_histogram(metric, help_text, histograms):
+    lines = [f'# HELP {metric} {help_text}', f'# TYPE {metric} histogram']
+    for name, hist in histograms:
+        cumulative = 0
+        for bound, count in zip(list(hist.buckets) + ['+Inf'], hist.counts):
+            cumulative += count
+            lines.append(f'{metric}_bucket{{callback="{name}",le="{bound}"}} {cumulative}')
+        lines.append(f'{metric}_sum{{callback="{name}"}} {_format_value(hist.total)}')
+        lines.append(f'{metric}_count{{callback="{name}"}} {hist.count}')
+    return lines
+
+
+def _render_quantiles(metric, help_text, histograms):
+    lines = [f'# HELP {metric} {help_text} (last {METRICS_WINDOW} calls)', f'# TYPE {metric} summary']
+    for name, hist in histograms:
+        for quantile, value in hist.quantiles().items():
+            lines.append(f'{metric}{{callback="{name}",quantile="{quantile}"}} {_format_value(value)}')
+        lines.append(f'{metric}_sum{{callback="{name}"}} {_format_value(sum(hist.recent))}')
+        lines.append(f'{metric}_count{{callback="{name}"}} {len(hist.recent)}')
+    return lines
+
+
+def record_cache_lookup(hit):
+    """Отметить обращение к кешу DataFrame (учитывается, если идёт callback)"""
+    counts = getattr(_local, 'cache', None)
+    if counts is not None:
+        counts[0 if hit else 1] += 1
+
+
+def _payload_bytes(response):
+    """Размер JSON ответа Dash в байтах"""
+    if isinstance(response, str):
+        # isascii() не сканирует строку: для ASCII длина и есть размер в UTF-8
+        return len(response) if response.isascii() else len(response.encode('utf-8'))
+    if isinstance(response, (bytes, bytearray)):
+        return len(response)
+    return 0
+
+
+def _instrument(name, dispatch):
+    """Обёртка вызова callback Dash (функция из callback_map: вызов + сериализация ответа)"""
+
+    def instrumented(*args, **kwargs):
+        counts = _local.cache = [0, 0]
+        status = 'error'
+        response = None
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            response = dispatch(*args, **kwargs)
+            status = 'ok'
+            return response
+        except PreventUpdate:
+            status = 'prevented'
+            raise
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.thread_time() - cpu_start
+            _local.cache = None
+            get_metrics().record(name, status, wall, cpu, _payload_bytes(response), counts[0], counts[1])
+
+    instrumented.__name__ = name
+    instrumented.__wrapped__ = dispatch
+    instrumented._fastscan_metrics = True
+    return instrumented
+
+
+def instrument_callbacks(app):
+    """
+    Обернуть метриками все серверные callbacks, зарегистрированные к этому
+    моменту (через app.callback и dash.callback). Clientside callbacks
+    выполняются в браузере и не учитываются.
+
+    Returns:
+        int: число обёрнутых callbacks
+    """
+    from dash._callback import GLOBAL_CALLBACK_MAP
+
+    wrapped = 0
+    for callback_map in (app.callback_map, GLOBAL_CALLBACK_MAP):
+        for entry in callback_map.values():
+            dispatch = entry.get('callback')
+            if dispatch is None or getattr(dispatch, '_fastscan_metrics', False):
+                continue
+            entry['callback'] = _instrument(dispatch.__name__, dispatch)
+            wrapped += 1
+    return wrapped
+
+
+def register_metrics_route(app):
+    """GET /metrics: метрики callbacks и кеша DataFrame в формате Prometheus"""
+    from flask import Response
+    from .data_cache import get_data_cache
+
+    @app.server.route('/metrics')
+    def metrics():
+        stats = get_data_cache().stats()
+        lines = [
+            '# HELP fastscan_data_cache_lookups_total DataFrame cache lookups of this process',
+            '# TYPE fastscan_data_cache_lookups_total counter',
+            f'fastscan_data_cache_lookups_total{{result="hit"}} {stats["hits"]}',
+            f'fastscan_data_cache_lookups_total{{result="miss"}} {stats["misses"]}',
+            '# HELP fastscan_data_cache_evictions_total Files evicted from the DataFrame cache',
+            '# TYPE fastscan_data_cache_evictions_total counter',
+            f'fastscan_data_cache_evictions_total {stats["evictions"]}',
+            '# HELP fastscan_data_cache_bytes Memory held by the DataFrame cache',
+            '# TYPE fastscan_data_cache_bytes gauge',
+            f'fastscan_data_cache_bytes {stats["bytes_used"]}',
+        ]
+        body = get_metrics().render() + '\n'.join(lines) + '\n'
+        return Response(body, content_type=CONTENT_TYPE)
+
+
+# Global instance
+_metrics = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics():
+    """Get global metrics instance (created once, safe to call from any thread)"""
+    global _metrics
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                _metrics = CallbackMetrics()
+    return _metrics
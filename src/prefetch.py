@@ -0,0 +1,88 @@
+"""
+Prefetch Module
+Фоновая подгрузка соседних и свежих рынков в кеш DataFrame
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .catalog import list_markets, list_recent_markets, get_market_info
+from .data_cache import get_data_cache
+from .config import PREFETCH_WORKERS, PREFETCH_NEIGHBOURS, PREFETCH_RECENT
+
+
+class Prefetcher:
+    """
+    Подгружает рынки в фоне пулом потоков.
+    Загруженные файлы попадают в кеш только если помещаются в свободный бюджет
+    (SimpleDataFrameCache.prefetch), поэтому подгрузка никогда не вытесняет открытые файлы.
+    """
+
+    def __init__(self, cache, workers=PREFETCH_WORKERS, neighbours=PREFETCH_NEIGHBOURS, recent=PREFETCH_RECENT):
+        self.cache = cache
+        self.workers = workers
+        self.neighbours = neighbours
+        self.recent = recent
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='prefetch') if workers > 0 else None
+        self.pending = set()
+        self.lock = threading.Lock()
+
+    def candidates(self, filename):
+        """
+        Рынки для подгрузки при открытии filename: соседи в отсортированном
+        списке (ближние первыми), затем самые свежие рынки.
+        """
+        files = list_markets()
+        names = []
+        if filename in files:
+            idx = files.index(filename)
+            for offset in range(1, self.neighbours + 1):
+                for neighbour in (idx + offset, idx - offset):
+                    if 0 <= neighbour < len(files):
+                        names.append(files[neighbour])
+        if self.recent > 0:
+            names.extend(list_recent_markets(self.recent))
+        return [name for i, name in enumerate(names) if name != filename and name not in names[:i]]
+
+    def schedule(self, filename):
+        """Запланировать подгрузку рынков вокруг filename (не блокирует вызывающий поток)"""
+        if self.executor is None:
+            return
+        for name in self.candidates(filename):
+            with self.lock:
+                if name in self.pending or name in self.cache:
+                    continue
+                self.pending.add(name)
+            self.executor.submit(self._prefetch, name)
+
+    def _prefetch(self, filename):
+        """
+        Загрузить файл и предложить его кешу. Если по оценке размера (строки
+        из каталога) файл не поместится и после вытеснения, он не читается.
+        """
+        try:
+            info = get_market_info(filename)
+            estimate = self.cache.estimate_nbytes(info['rows']) if info else None
+            if estimate is not None and estimate > self.cache.prefetch_room():
+                print(f"Prefetch skipped {filename}: cache budget is full")
+            elif not self.cache.prefetch(filename):
+                print(f"Prefetch skipped {filename}: cache budget is full")
+        except Exception as e:
+            print(f"Error prefetching {filename}: {e}")
+        finally:
+            with self.lock:
+                self.pending.discard(filename)
+
+
+# Global instance
+_prefetcher = None
+_prefetcher_lock = threading.Lock()
+
+
+def get_prefetcher():
+    """Get global prefetcher instance (created once, safe to call from any thread)"""
+    global _prefetcher
+    if _prefetcher is None:
+        with _prefetcher_lock:
+            if _prefetcher is None:
+                _prefetcher = Prefetcher(get_data_cache())
+    return _prefetcher
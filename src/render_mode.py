@@ -0,0 +1,60 @@
+"""
+Render Mode Module
+Выбор типа трасс для линий графиков: SVG (scatter) или WebGL (scattergl).
+Меняется только тип трассы, индексы трасс остаются прежними, поэтому
+restyle в playback_engine.js и Patch callbacks продолжают работать
+"""
+
+from dash import Patch
+from .series import get_plot_series
+from .zoom import ZOOM_CHARTS
+from .config import WEBGL_AUTO_POINTS
+
+# Режимы отрисовки для панели Performance
+RENDER_MODES = [
+    {'label': 'SVG', 'value': 'svg'},
+    {'label': 'WebGL', 'value': 'webgl'},
+    {'label': f'Auto (WebGL > {WEBGL_AUTO_POINTS} pts/chart)', 'value': 'auto'},
+]
+
+
+def drawn_points(df, chart_id):
+    """
+    Число точек всех линий графика, как они рисуются: после прореживания
+    (get_plot_series), а не по числу строк файла. Одна линия прорежена
+    до PLOT_MAX_POINTS, поэтому порог WebGL превышают графики с несколькими линиями.
+    """
+    _, series_traces = ZOOM_CHARTS[chart_id]
+    return sum(len(get_plot_series(df, key)[0]) for key in series_traces.values())
+
+
+def line_trace_type(df, chart_id, render_mode):
+    """
+    Тип трасс линий графика для режима отрисовки.
+
+    Returns:
+        str: 'scattergl' или 'scatter'
+    """
+    if render_mode == 'webgl':
+        return 'scattergl'
+    if render_mode == 'auto' and drawn_points(df, chart_id) > WEBGL_AUTO_POINTS:
+        return 'scattergl'
+    return 'scatter'
+
+
+def set_line_trace_type(figure, chart_id, trace_type):
+    """Выставить тип трасс линий в фигуре (dict) на месте"""
+    _, series_traces = ZOOM_CHARTS[chart_id]
+    for trace_idx in series_traces:
+        figure['data'][trace_idx]['type'] = trace_type
+    return figure
+
+
+def build_render_mode_patch(df, chart_id, render_mode):
+    """Patch, переключающий тип трасс линий графика"""
+    trace_type = line_trace_type(df, chart_id, render_mode)
+    _, series_traces = ZOOM_CHARTS[chart_id]
+    patched_fig = Patch()
+    for trace_idx in series_traces:
+        patched_fig['data'][trace_idx]['type'] = trace_type
+    return patched_fig
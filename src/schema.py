@@ -0,0 +1,86 @@
+"""
+Schema Module
+Явная схема колонок CSV рынка: типы хранения и производные колонки
+"""
+
+import pandas as pd
+
+# Версия схемы: входит в ключ Parquet копий, при изменении схемы копии пересобираются
+SCHEMA_VERSION = 1
+
+# Оси тензора уровней стакана: (N, сторона, книга, уровень, поле)
+ORDERBOOK_SIDES = ('up', 'down')
+ORDERBOOK_BOOKS = ('bid', 'ask')
+ORDERBOOK_DEPTH = 5
+ORDERBOOK_FIELDS = ('price', 'size')
+
+# Колонки тензора в порядке C-раскладки (N, 2, 2, 5, 2)
+ORDERBOOK_LEVEL_COLUMNS = [
+    f'{side}_{book}_{level}_{field}'
+    for side in ORDERBOOK_SIDES
+    for book in ORDERBOOK_BOOKS
+    for level in range(1, ORDERBOOK_DEPTH + 1)
+    for field in ORDERBOOK_FIELDS
+]
+
+# Типы колонок, заданные явно
+COLUMN_DTYPES = {
+    'market_slug': 'category',
+    'timestamp_ms': 'int64',
+    'timestamp_et': pd.StringDtype('pyarrow'),
+    'seconds_till_end': 'Int32',
+    **{col: 'float32' for col in ORDERBOOK_LEVEL_COLUMNS},
+}
+
+# Префиксы колонок Polymarket-метрик (цены, размеры, глубина) - float32.
+# Колонки Binance/оракула (цены BTC ~100k) остаются float64 ради точности центов.
+FLOAT32_PREFIXES = ('pm_',)
+
+# Производные колонки: не хранятся, вычисляются из исходных по запросу
+DERIVED_COLUMNS = {
+    'time_till_end': ('seconds_till_end',),
+}
+
+
+def get_column_dtype(column):
+    """
+    Тип хранения колонки по схеме.
+
+    Returns:
+        dtype или None, если тип определяет pandas
+    """
+    if column in COLUMN_DTYPES:
+        return COLUMN_DTYPES[column]
+    if column.startswith(FLOAT32_PREFIXES):
+        return 'float32'
+    return None
+
+
+def get_csv_dtypes(columns):
+    """Словарь dtype для pd.read_csv по списку колонок файла"""
+    dtypes = {}
+    for column in columns:
+        dtype = get_column_dtype(column)
+        if dtype is not None:
+            dtypes[column] = dtype
+    return dtypes
+
+
+def format_time_till_end(seconds):
+    """
+    Время до конца рынка в формате MM:SS.
+
+    Args:
+        seconds: секунды до конца (None/NaN -> '--:--')
+    """
+    if seconds is None or pd.isna(seconds):
+        return '--:--'
+    seconds = max(0, int(seconds))
+    return f"{seconds // 60:02d}:{seconds % 60:02d}"
+
+
+def derive_column(df, column):
+    """Вычислить производную колонку из исходных колонок DataFrame"""
+    if column == 'time_till_end':
+        return df['seconds_till_end'].map(format_time_till_end, na_action=None).astype(object)
+    raise KeyError(column)
@@ -0,0 +1,185 @@
+"""
+Series Module
+Общий слой рядов для графиков: валидные индексы и значения колонок
+вычисляются NumPy один раз на DataFrame и переиспользуются всеми виджетами
+"""
+
+import weakref
+import numpy as np
+from .config import PLOT_MAX_POINTS
+
+# Ряды по id(DataFrame): {ключ: массив или (x, y)}, удаляются вместе с DataFrame
+_series_cache = {}
+
+
+def _frame_cache(df):
+    """Словарь рядов DataFrame (создаётся при первом обращении)"""
+    key = id(df)
+    cache = _series_cache.get(key)
+    if cache is None:
+        cache = {}
+        _series_cache[key] = cache
+        weakref.finalize(df, _series_cache.pop, key, None)
+    return cache
+
+
+def _readonly(array):
+    array.flags.writeable = False
+    return array
+
+
+def get_values(df, column):
+    """
+    Значения колонки как float массив (NaN на месте пропусков).
+    float32 колонки остаются float32. Если колонки нет - массив NaN длины df.
+    """
+    cache = _frame_cache(df)
+    values = cache.get(column)
+    if values is None:
+        if column in df.columns:
+            series = df[column]
+            dtype = series.dtype if series.dtype in (np.float32, np.float64) else np.float64
+            values = series.to_numpy(dtype=dtype, na_value=np.nan)
+        else:
+            values = np.full(len(df), np.nan)
+        values = _readonly(values)
+        cache[column] = values
+    return values
+
+
+def valid_series(values):
+    """
+    Отбросить NaN из массива значений.
+
+    Returns:
+        tuple: (x - индексы строк с валидными значениями, y - сами значения)
+    """
+    mask = ~np.isnan(values)
+    return np.flatnonzero(mask), values[mask]
+
+
+def get_series(df, column):
+    """
+    Линия графика по колонке: (x - индексы валидных строк, y - значения).
+    Вычисляется один раз на DataFrame.
+    """
+    cache = _frame_cache(df)
+    key = ('series', column)
+    series = cache.get(key)
+    if series is None:
+        x, y = valid_series(get_values(df, column))
+        series = (_readonly(x), _readonly(y))
+        cache[key] = series
+    return series
+
+
+def get_sum_series(df, *columns):
+    """Линия суммы колонок (строка валидна, только если валидны все слагаемые)"""
+    cache = _frame_cache(df)
+    key = ('sum',) + columns
+    series = cache.get(key)
+    if series is None:
+        total = get_values(df, columns[0])
+        for column in columns[1:]:
+            total = total + get_values(df, column)
+        x, y = valid_series(total)
+        series = (_readonly(x), _readonly(y))
+        cache[key] = series
+    return series
+
+
+def get_row_index(df):
+    """Индексы всех строк 0..len(df)-1"""
+    cache = _frame_cache(df)
+    index = cache.get('__index__')
+    if index is None:
+        index = _readonly(np.arange(len(df)))
+        cache['__index__'] = index
+    return index
+
+
+def get_value(df, column, row_idx):
+    """Значение колонки в строке row_idx (NaN, если строки или колонки нет)"""
+    values = get_values(df, column)
+    return values[row_idx] if 0 <= row_idx < len(values) else np.nan
+
+
+def first_valid(df, column):
+    """Первое валидное значение колонки как float или None"""
+    _, y = get_series(df, column)
+    return float(y[0]) if len(y) else None
+
+
+def minmax_downsample(x, y, max_points):
+    """
+    Прореживание линии с сохранением экстремумов.
+
+    Точки делятся на бакеты одинаковой длины, в каждом остаются минимум и
+    максимум (в порядке X), плюс первая и последняя точки, так что всплески
+    не пропадают. Если точек не больше max_points, ряд возвращается как есть.
+
+    Args:
+        x, y: массивы линии без NaN (см. valid_series)
+        max_points: максимум точек в результате
+
+    Returns:
+        tuple: (x, y) прореженной линии
+    """
+    n = len(y)
+    if n <= max_points:
+        return x, y
+
+    n_buckets = max(1, (max_points - 2) // 2)
+    size = -(-n // n_buckets)
+    n_buckets = -(-n // size)
+
+    # Хвост последнего бакета дополняется +inf/-inf, чтобы не попасть в argmin/argmax
+    blocks = np.empty(n_buckets * size, dtype=y.dtype)
+    blocks[:n] = y
+    blocks[n:] = np.inf
+    imin = blocks.reshape(n_buckets, size).argmin(axis=1)
+    blocks[n:] = -np.inf
+    imax = blocks.reshape(n_buckets, size).argmax(axis=1)
+
+    base = np.arange(n_buckets) * size
+    idx = np.unique(np.concatenate(([0], base + imin, base + imax, [n - 1])))
+    return x[idx], y[idx]
+
+
+def get_key_series(df, key):
+    """
+    Линия по ключу ряда: имя колонки или кортеж колонок (сумма, см. get_sum_series)
+    """
+    if isinstance(key, tuple):
+        return get_sum_series(df, *key)
+    return get_series(df, key)
+
+
+def get_plot_series(df, key, max_points=PLOT_MAX_POINTS):
+    """
+    Обзорная линия для начальной фигуры: весь ряд, прореженный до max_points.
+    Значения в типе хранения колонки (src/schema.py): float32 для pm_* и цен
+    стакана, float64 для Binance/оракула - в float32 цена BTC ~100k теряет центы.
+    Вычисляется один раз на DataFrame.
+    """
+    cache = _frame_cache(df)
+    cache_key = ('plot', key, max_points)
+    series = cache.get(cache_key)
+    if series is None:
+        x, y = minmax_downsample(*get_key_series(df, key), max_points)
+        series = (_readonly(x), _readonly(y))
+        cache[cache_key] = series
+    return series
+
+
+def get_window_series(df, key, x_min, x_max, max_points=PLOT_MAX_POINTS):
+    """
+    Линия в видимом диапазоне [x_min, x_max] (для догрузки при зуме).
+    Берётся по одной точке за краями, чтобы линия доходила до границ графика.
+    В полном разрешении, если в диапазон попадает не больше max_points точек.
+    Значения в типе хранения колонки, как в get_plot_series.
+    """
+    x, y = get_key_series(df, key)
+    lo = max(int(np.searchsorted(x, x_min, side='left')) - 1, 0)
+    hi = min(int(np.searchsorted(x, x_max, side='right')) + 1, len(x))
+    return minmax_downsample(x[lo:hi], y[lo:hi], max_points)
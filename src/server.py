@@ -0,0 +1,92 @@
+"""
+Server Module
+Production запуск: gunicorn с несколькими процессами-воркерами, прогрев
+(каталог, свежие рынки) до форка воркеров и /healthz для балансировщика.
+Рынки воркеры отображают из общего хранилища (src/shared_store.py)
+"""
+
+import os
+import time
+from flask import jsonify
+from .catalog import list_markets, list_recent_markets
+from .data_cache import get_data_cache
+from .shared_store import open_frame, store_stats
+from .config import SERVER_WORKERS, SERVER_THREADS, WARMUP_MARKETS
+
+
+def warm_up(markets=WARMUP_MARKETS):
+    """
+    Загрузить самые свежие рынки в кеш DataFrame.
+
+    Вызывается в главном процессе до форка воркеров (preload_app): воркеры
+    получают загруженные DataFrame без повторного чтения файлов.
+    Пулы потоков (подгрузка, сборка фигур) здесь не создаются - после форка
+    их потоки в воркерах не существуют, каждый воркер создаёт свои лениво.
+
+    Returns:
+        list: имена загруженных файлов
+    """
+    start = time.perf_counter()
+    cache = get_data_cache()
+    loaded = []
+    for filename in list_recent_markets(markets) if markets > 0 else []:
+        try:
+            if cache.prefetch(filename):
+                loaded.append(filename)
+        except Exception as e:
+            print(f"Error warming up {filename}: {e}")
+    print(f"Warm-up: {len(loaded)} markets loaded in {time.perf_counter() - start:.2f}s")
+    return loaded
+
+
+def register_health_route(app):
+    """GET /healthz: процесс отвечает, каталог доступен"""
+
+    @app.server.route('/healthz')
+    def healthz():
+        cache = get_data_cache()
+        health = {
+            'status': 'ok',
+            'pid': os.getpid(),
+            'markets': len(list_markets()),
+            'data_cache': cache.stats()
+        }
+        if cache.loader is open_frame:
+            health['shared_store'] = store_stats()
+        return jsonify(health)
+
+
+def serve(app, host='0.0.0.0', port=8050, workers=SERVER_WORKERS, threads=SERVER_THREADS):
+    """
+    Запустить приложение в gunicorn (debug выключен).
+
+    Args:
+        app: Dash приложение (create_app), уже прогретое warm_up
+        workers: число процессов-воркеров
+        threads: потоков на воркер (callbacks одного воркера идут параллельно)
+    """
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        raise SystemExit("gunicorn не установлен: pip install gunicorn (Linux/macOS)")
+
+    class FastScanApplication(BaseApplication):
+        def load_config(self):
+            options = {
+                'bind': f'{host}:{port}',
+                'workers': workers,
+                'threads': threads,
+                'worker_class': 'gthread',
+                # Приложение и прогретый кеш создаются один раз до форка воркеров
+                'preload_app': True,
+                # Первое открытие большого рынка строит 15 фигур
+                'timeout': 120,
+            }
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return app.server
+
+    print(f"Serving on http://{host}:{port} ({workers} workers x {threads} threads)")
+    FastScanApplication().run()
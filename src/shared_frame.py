@@ -0,0 +1,96 @@
+"""
+Shared Frame Module
+DataFrame в разделяемой памяти для процессов-воркеров: числовые колонки
+копируются один раз в блоки multiprocessing.shared_memory, воркер собирает
+из них DataFrame без копирования и без pickle данных
+"""
+
+import uuid
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+
+
+def _is_plain_numeric(series):
+    """Колонка с обычным NumPy dtype (без pandas extension типов)"""
+    return isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biuf'
+
+
+class SharedFrame:
+    """
+    Копия DataFrame в разделяемой памяти (создаётся в родительском процессе).
+
+    descriptor - то, что передаётся воркеру: token копии, для числовых колонок
+    имя блока и dtype; остальные колонки (строки, category, nullable Int)
+    передаются как есть через pickle - они небольшие.
+
+    Блоки живут, пока не вызван close() (или выход из with).
+    """
+
+    def __init__(self, df):
+        self.blocks = []
+        columns = []
+        try:
+            for name in df.columns:
+                series = df[name]
+                if not _is_plain_numeric(series):
+                    columns.append((name, None, series))
+                    continue
+                values = series.to_numpy()
+                block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+                self.blocks.append(block)
+                np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf)[:] = values
+                columns.append((name, block.name, values.dtype.str))
+        except Exception:
+            self.close()
+            raise
+        self.descriptor = {'token': uuid.uuid4().hex, 'rows': len(df), 'columns': columns}
+
+    def close(self):
+        """Освободить и удалить блоки разделяемой памяти"""
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def attach_frame(descriptor):
+    """
+    Собрать DataFrame поверх блоков разделяемой памяти (в воркере).
+
+    Returns:
+        tuple: (df, blocks) - блоки нужно закрыть через detach_frame,
+               когда DataFrame больше не используется
+    """
+    rows = descriptor['rows']
+    data = {}
+    blocks = []
+    for name, block_name, payload in descriptor['columns']:
+        if block_name is None:
+            data[name] = payload
+            continue
+        # Воркеры пула (spawn) используют resource_tracker родителя, поэтому
+        # подключение не приводит к удалению блока при выходе воркера
+        block = shared_memory.SharedMemory(name=block_name)
+        blocks.append(block)
+        values = np.ndarray((rows,), dtype=np.dtype(payload), buffer=block.buf)
+        values.flags.writeable = False
+        data[name] = values
+    df = pd.DataFrame(data, copy=False)
+    return df, blocks
+
+
+def detach_frame(blocks):
+    """Закрыть блоки, подключённые attach_frame (DataFrame должен быть уже удалён)"""
+    for block in blocks:
+        try:
+            block.close()
+        except BufferError:
+            # Кто-то ещё держит view на блок - память освободится вместе с процессом
+            pass
@@ -0,0 +1,261 @@
+"""
+Shared Store Module
+Общее для процессов хранилище рынков: числовые колонки DataFrame и тензор
+уровней стакана записываются один раз в .npy файлы, а каждый процесс
+отображает их read-only через mmap - страницы памяти общие для всех
+воркеров gunicorn, и память не растёт с числом воркеров.
+
+Каталог рынка в STORE_DIR (имя - как у Parquet копии, без расширения):
+    manifest.json   - колонки и их файлы (пишется последним)
+    <i>.npy         - числовая колонка
+    levels.npy      - тензор уровней (N, 2, 2, 5, 2) float32
+    refs/<pid>      - процессы, у которых рынок открыт
+"""
+
+import glob
+import json
+import os
+import shutil
+import threading
+import weakref
+import numpy as np
+import pandas as pd
+from .data_loader import (
+    CACHE_DIR,
+    get_csv_files,
+    get_columnar_path,
+    load_data,
+    get_orderbook_levels,
+    register_orderbook_levels,
+)
+from .shared_frame import _is_plain_numeric
+from .config import SHARED_STORE_DIR
+
+# Каталог хранилища
+STORE_DIR = SHARED_STORE_DIR or os.path.join(CACHE_DIR, 'shared')
+
+_MANIFEST = 'manifest.json'
+_LEVELS = 'levels.npy'
+_REFS = 'refs'
+
+# Открытые в этом процессе DataFrame по каталогам рынков: путь -> число
+_refs = {}
+_refs_lock = threading.Lock()
+
+
+def dataset_path(filename):
+    """Каталог рынка в хранилище для текущей версии файла и схемы"""
+    stem, _ = os.path.splitext(os.path.basename(get_columnar_path(filename)))
+    return os.path.join(STORE_DIR, stem)
+
+
+def materialize(filename):
+    """
+    Записать рынок в хранилище, если его там ещё нет (один раз на все процессы).
+
+    Запись идёт во временный каталог и публикуется атомарным rename: если
+    два процесса пишут рынок одновременно, остаётся копия первого.
+
+    Returns:
+        str: каталог рынка
+    """
+    path = dataset_path(filename)
+    if os.path.exists(os.path.join(path, _MANIFEST)):
+        return path
+
+    df = load_data(filename)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(os.path.join(tmp_path, _REFS))
+
+    columns = []
+    for idx, name in enumerate(df.columns):
+        series = df[name]
+        if not _is_plain_numeric(series):
+            # category / string / Int32 - небольшие, читаются из Parquet копии
+            columns.append([name, None])
+            continue
+        column_file = f"{idx}.npy"
+        np.save(os.path.join(tmp_path, column_file), series.to_numpy())
+        columns.append([name, column_file])
+    np.save(os.path.join(tmp_path, _LEVELS), get_orderbook_levels(df))
+    with open(os.path.join(tmp_path, _MANIFEST), 'w', encoding='utf-8') as f:
+        json.dump({'filename': filename, 'rows': len(df), 'columns': columns}, f)
+
+    try:
+        os.rename(tmp_path, path)
+    except OSError:
+        # Рынок уже опубликовал другой процесс
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+    # Предыдущие версии этого рынка, если их никто не держит
+    cleanup_store(filename)
+    return path
+
+
+def open_frame(filename):
+    """
+    DataFrame рынка поверх файлов хранилища: числовые колонки и тензор
+    уровней - read-only views над np.memmap, без копирования в память процесса.
+    Рынок отмечается открытым этим процессом, пока DataFrame жив.
+
+    Returns:
+        pd.DataFrame
+    """
+    path = materialize(filename)
+    with open(os.path.join(path, _MANIFEST), encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    other = [name for name, column_file in manifest['columns'] if column_file is None]
+    other_df = load_data(filename, columns=other) if other else None
+
+    data = {}
+    for name, column_file in manifest['columns']:
+        if column_file is None:
+            data[name] = other_df[name].array
+        else:
+            data[name] = _map_array(os.path.join(path, column_file))
+    df = pd.DataFrame(data, copy=False)
+    register_orderbook_levels(df, _map_array(os.path.join(path, _LEVELS)))
+
+    _acquire(path)
+    weakref.finalize(df, _release, path, os.getpid())
+    return df
+
+
+def _map_array(file_path):
+    """Read-only отображение .npy файла как обычный ndarray (view над np.memmap)"""
+    return np.load(file_path, mmap_mode='r').view(np.ndarray)
+
+
+def _ref_path(path, pid=None):
+    return os.path.join(path, _REFS, str(pid or os.getpid()))
+
+
+def _acquire(path):
+    """Отметить рынок открытым в этом процессе (refs/<pid> на первый DataFrame)"""
+    with _refs_lock:
+        count = _refs.get(path, 0)
+        if count == 0:
+            open(_ref_path(path), 'w').close()
+        _refs[path] = count + 1
+
+
+def _release(path, pid):
+    """DataFrame рынка удалён: на последнем снять отметку процесса"""
+    if pid != os.getpid():
+        # DataFrame унаследован при fork, отметку держит родитель
+        return
+    with _refs_lock:
+        count = _refs.get(path, 0) - 1
+        if count > 0:
+            _refs[path] = count
+            return
+        _refs.pop(path, None)
+    try:
+        os.remove(_ref_path(path))
+    except OSError:
+        pass
+
+
+def _pid_alive(pid):
+    """Жив ли процесс pid"""
+    if pid == os.getpid():
+        return True
+    if os.name == 'nt':
+        # os.kill(pid, 0) на Windows посылает CTRL_C_EVENT - считаем процесс живым
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _live_refs(path):
+    """Число живых процессов, у которых рынок открыт (отметки мёртвых удаляются)"""
+    live = 0
+    for ref in glob.glob(os.path.join(path, _REFS, '*')):
+        try:
+            pid = int(os.path.basename(ref))
+        except ValueError:
+            continue
+        if _pid_alive(pid):
+            live += 1
+        else:
+            try:
+                os.remove(ref)
+            except OSError:
+                pass
+    return live
+
+
+def cleanup_store(filename=None):
+    """
+    Удалить из хранилища устаревшие версии рынков (файл изменился или исчез,
+    сменилась схема), которые не открыты ни одним живым процессом, и
+    временные каталоги завершившихся процессов.
+
+    Args:
+        filename: проверить только версии этого рынка (None - всё хранилище)
+
+    Returns:
+        int: число удалённых каталогов
+    """
+    if not os.path.isdir(STORE_DIR):
+        return 0
+
+    names = get_csv_files() if filename is None else [filename]
+    current = set()
+    for name in names:
+        try:
+            current.add(os.path.basename(dataset_path(name)))
+        except OSError:
+            # Файл исчез - все его версии устарели
+            pass
+    prefix = None if filename is None else os.path.splitext(filename)[0] + '.'
+
+    removed = 0
+    for entry in os.listdir(STORE_DIR):
+        if prefix is not None and not entry.startswith(prefix):
+            continue
+        path = os.path.join(STORE_DIR, entry)
+        if entry.endswith('.tmp'):
+            try:
+                pid = int(entry.split('.')[-2])
+            except ValueError:
+                continue
+            if _pid_alive(pid):
+                continue
+        elif entry in current or _live_refs(path) > 0:
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        removed += 1
+    return removed
+
+
+def store_stats():
+    """Размер хранилища и рынки, открытые этим процессом"""
+    datasets = 0
+    size = 0
+    if os.path.isdir(STORE_DIR):
+        for entry in os.listdir(STORE_DIR):
+            path = os.path.join(STORE_DIR, entry)
+            if entry.endswith('.tmp') or not os.path.isdir(path):
+                continue
+            datasets += 1
+            size += sum(os.path.getsize(p) for p in glob.glob(os.path.join(path, '*.npy')))
+    with _refs_lock:
+        opened = len(_refs)
+    return {'dir': STORE_DIR, 'datasets': datasets, 'bytes': size, 'open_in_process': opened}
+
+
+def enable_shared_store():
+    """Загружать рынки кеша DataFrame через общее хранилище (для нескольких воркеров)"""
+    from .data_cache import get_data_cache
+    removed = cleanup_store()
+    if removed:
+        print(f"Shared store: removed {removed} stale datasets")
+    get_data_cache().loader = open_frame
@@ -0,0 +1,130 @@
+"""
+Skeleton Module
+Скелеты начальных фигур: layout, shapes и стили трасс собираются функцией
+create_*_chart (через валидаторы Plotly) один раз на процесс, а для
+каждого файла в готовый JSON подставляются только массивы данных
+"""
+
+import re
+import threading
+import numpy as np
+import pandas as pd
+import plotly.io as pio
+from plotly.io.json import to_json_plotly
+from _plotly_utils.utils import to_typed_array_spec
+from .series import get_plot_series, get_value
+from .zoom import ZOOM_CHARTS
+from .charts import BTC_MARKER_TRACES
+from .widgets.event_markers import event_segments
+from .widgets.p_vwap_chart import EVENT_TRACES as P_VWAP_EVENT_TRACES
+
+# Слоты данных сверх линий ZOOM_CHARTS:
+# маркеры текущей строки {индекс трассы: колонка}
+MARKER_TRACES = {'chart-btc': BTC_MARKER_TRACES}
+# маркеры событий {индекс трассы: функция df -> X событий}
+EVENT_TRACES = {'chart-p-vwap': P_VWAP_EVENT_TRACES}
+# Графики, у которых от данных зависят не только слоты (стаканы, заголовок, давление)
+NO_SKELETON = {'chart-orderbook'}
+
+_SLOT_TOKEN = '__skeleton_slot_{}__'
+_SLOT_PATTERN = re.compile(r'"__skeleton_slot_(\d+)__"')
+
+
+def has_skeleton(chart_id):
+    """Можно ли строить фигуру графика по скелету"""
+    return chart_id in ZOOM_CHARTS and chart_id not in NO_SKELETON
+
+
+def slot_values(df, chart_id, row_idx=0):
+    """
+    Данные графика по слотам: линии, маркеры текущей строки, события.
+
+    Returns:
+        list: [(индекс трассы, 'x'/'y', значение)]
+    """
+    values = []
+    _, series_traces = ZOOM_CHARTS[chart_id]
+    for trace_idx, key in series_traces.items():
+        x, y = get_plot_series(df, key)
+        values += [(trace_idx, 'x', x), (trace_idx, 'y', y)]
+
+    for trace_idx, column in MARKER_TRACES.get(chart_id, {}).items():
+        current = get_value(df, column, row_idx)
+        valid = pd.notna(current)
+        values += [
+            (trace_idx, 'x', [row_idx] if valid else []),
+            (trace_idx, 'y', [float(current)] if valid else []),
+        ]
+
+    for trace_idx, find_events in EVENT_TRACES.get(chart_id, {}).items():
+        x, y = event_segments(find_events(df))
+        values += [(trace_idx, 'x', x), (trace_idx, 'y', y)]
+    return values
+
+
+def skeleton_signature(df, chart_id):
+    """
+    Форма фигуры: какие линии пусты. Для пустой линии виджет добавляет
+    трассу-заглушку без стиля, поэтому скелет строится на каждую форму.
+    """
+    _, series_traces = ZOOM_CHARTS[chart_id]
+    return tuple(len(get_plot_series(df, key)[0]) > 0 for key in series_traces.values())
+
+
+def _encode(value):
+    """Значение слота в JSON так же, как его сериализует Plotly (numpy -> typed array b64)"""
+    if isinstance(value, np.ndarray):
+        value = to_typed_array_spec(value)
+        if isinstance(value, np.ndarray):
+            value = value.tolist()
+    return to_json_plotly(value)
+
+
+class FigureSkeleton:
+    """
+    JSON фигуры, разрезанный по слотам данных.
+    render() склеивает куски с JSON новых значений слотов без Plotly.
+    """
+
+    def __init__(self, figure, slots):
+        """
+        Args:
+            figure: go.Figure, построенная функцией create_*_chart
+            slots: [(индекс трассы, поле)] в порядке slot_values
+        """
+        figure_dict = figure.to_plotly_json()
+        for slot_idx, (trace_idx, field) in enumerate(slots):
+            figure_dict['data'][trace_idx][field] = _SLOT_TOKEN.format(slot_idx)
+        parts = _SLOT_PATTERN.split(pio.to_json(figure_dict, validate=False))
+        # parts: [текст, номер слота, текст, номер слота, ..., текст]
+        self.texts = parts[0::2]
+        self.order = [int(slot_idx) for slot_idx in parts[1::2]]
+
+    def render(self, values):
+        """JSON фигуры с подставленными значениями слотов"""
+        encoded = [_encode(value) for _, _, value in values]
+        pieces = [self.texts[0]]
+        for slot_idx, text in zip(self.order, self.texts[1:]):
+            pieces.append(encoded[slot_idx])
+            pieces.append(text)
+        return ''.join(pieces)
+
+
+# Скелеты процесса: (id графика, форма) -> FigureSkeleton
+_skeletons = {}
+_skeletons_lock = threading.Lock()
+
+
+def build_skeleton_json(df, chart_id, builder):
+    """
+    Начальная фигура графика (row_idx=0) в JSON через скелет.
+    При первой встрече формы фигура строится builder'ом и запоминается как скелет.
+    """
+    key = (chart_id, skeleton_signature(df, chart_id))
+    values = slot_values(df, chart_id)
+    skeleton = _skeletons.get(key)
+    if skeleton is None:
+        skeleton = FigureSkeleton(builder(df, 0), [(trace_idx, field) for trace_idx, field, _ in values])
+        with _skeletons_lock:
+            skeleton = _skeletons.setdefault(key, skeleton)
+    return skeleton.render(values)
@@ -3,10 +3,12 @@ Arbitrage Indicator Chart Widget
 График индикатора арбитража
 """
 
-import pandas as pd
-import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from ..series import get_plot_series
+
+# Линии по индексам трасс: ключ ряда для догрузки при зуме (src/zoom.py)
+SERIES_TRACES = {0: ('up_ask_1_price', 'down_ask_1_price'), 1: ('up_bid_1_price', 'down_bid_1_price')}
 
 
 def create_arbitrage_indicator_figure(df, row_idx):
@@ -25,19 +27,9 @@ def create_arbitrage_indicator_figure(df, row_idx):
         row_heights=[1.0]
     )
 
-    # === Извлечение данных ===
-    up_ask_1_price = df['up_ask_1_price'].values if 'up_ask_1_price' in df.columns else np.array([np.nan] * len(df))
-    down_ask_1_price = df['down_ask_1_price'].values if 'down_ask_1_price' in df.columns else np.array([np.nan] * len(df))
-    up_bid_1_price = df['up_bid_1_price'].values if 'up_bid_1_price' in df.columns else np.array([np.nan] * len(df))
-    down_bid_1_price = df['down_bid_1_price'].values if 'down_bid_1_price' in df.columns else np.array([np.nan] * len(df))
-
-    # Вычисление сумм
-    ask_sum = up_ask_1_price + down_ask_1_price
-    bid_sum = up_bid_1_price + down_bid_1_price
-
-    # Фильтрация NaN
-    ask_mask = ~pd.isna(ask_sum)
-    bid_mask = ~pd.isna(bid_sum)
+    # === Извлечение данных: суммы лучших цен UP + DOWN ===
+    ask_sum_x, ask_sum_y = get_plot_series(df, ('up_ask_1_price', 'down_ask_1_price'))
+    bid_sum_x, bid_sum_y = get_plot_series(df, ('up_bid_1_price', 'down_bid_1_price'))
 
     # === Горизонтальная линия на 1.0 ===
     fig.add_hline(
@@ -53,11 +45,11 @@ def create_arbitrage_indicator_figure(df, row_idx):
     )
 
     # === Trace 0: Ask Sum (красная линия) ===
-    if ask_mask.any():
+    if len(ask_sum_x):
         fig.add_trace(
             go.Scatter(
-                x=[i for i, m in enumerate(ask_mask) if m],
-                y=[float(v) for v, m in zip(ask_sum, ask_mask) if m],
+                x=ask_sum_x,
+                y=ask_sum_y,
                 mode='lines',
                 name='Ask Sum',
                 line=dict(color='#F44336', width=2),
@@ -69,11 +61,11 @@ def create_arbitrage_indicator_figure(df, row_idx):
         fig.add_trace(go.Scatter(x=[], y=[], showlegend=False), row=1, col=1)
 
     # === Trace 1: Bid Sum (зеленая линия) ===
-    if bid_mask.any():
+    if len(bid_sum_x):
         fig.add_trace(
             go.Scatter(
-                x=[i for i, m in enumerate(bid_mask) if m],
-                y=[float(v) for v, m in zip(bid_sum, bid_mask) if m],
+                x=bid_sum_x,
+                y=bid_sum_y,
                 mode='lines',
                 name='Bid Sum',
                 line=dict(color='#00C853', width=2),
@@ -4,8 +4,8 @@ Ask Prices Chart Widget
 """
 
 import pandas as pd
-import numpy as np
 import plotly.graph_objects as go
+from ..series import get_series, get_value
 
 
 def add_ask_prices_traces(fig, df, row_idx):
@@ -18,12 +18,11 @@ def add_ask_prices_traces(fig, df, row_idx):
         row_idx: Текущий индекс строки
     """
     # 1. UP Ask 1 Price - зеленая линия
-    up_ask_prices = df['up_ask_1_price'].values if 'up_ask_1_price' in df.columns else np.array([np.nan] * len(df))
-    up_mask = ~pd.isna(up_ask_prices)
+    up_ask_prices_x, up_ask_prices_y = get_series(df, 'up_ask_1_price')
     fig.add_trace(
         go.Scatter(
-            x=[i for i, m in enumerate(up_mask) if m],
-            y=[float(p) for p, m in zip(up_ask_prices, up_mask) if m],
+            x=up_ask_prices_x,
+            y=up_ask_prices_y,
             mode='lines',
             name='UP Ask Price',
             line=dict(color='#00C853', width=2),  # Зеленый
@@ -33,12 +32,11 @@ def add_ask_prices_traces(fig, df, row_idx):
     )
 
     # 2. DOWN Ask 1 Price - красная линия
-    down_ask_prices = df['down_ask_1_price'].values if 'down_ask_1_price' in df.columns else np.array([np.nan] * len(df))
-    down_mask = ~pd.isna(down_ask_prices)
+    down_ask_prices_x, down_ask_prices_y = get_series(df, 'down_ask_1_price')
     fig.add_trace(
         go.Scatter(
-            x=[i for i, m in enumerate(down_mask) if m],
-            y=[float(p) for p, m in zip(down_ask_prices, down_mask) if m],
+            x=down_ask_prices_x,
+            y=down_ask_prices_y,
             mode='lines',
             name='DOWN Ask Price',
             line=dict(color='#F44336', width=2),  # Красный
@@ -48,7 +46,7 @@ def add_ask_prices_traces(fig, df, row_idx):
     )
 
     # 3. Текущая точка UP Ask
-    current_up = up_ask_prices[row_idx] if row_idx < len(up_ask_prices) else np.nan
+    current_up = get_value(df, 'up_ask_1_price', row_idx)
     fig.add_trace(
         go.Scatter(
             x=[row_idx] if pd.notna(current_up) else [],
@@ -64,7 +62,7 @@ def add_ask_prices_traces(fig, df, row_idx):
     )
 
     # 4. Текущая точка DOWN Ask
-    current_down = down_ask_prices[row_idx] if row_idx < len(down_ask_prices) else np.nan
+    current_down = get_value(df, 'down_ask_1_price', row_idx)
     fig.add_trace(
         go.Scatter(
             x=[row_idx] if pd.notna(current_down) else [],
@@ -1,15 +1,15 @@
 import pandas as pd
-import numpy as np
 import plotly.graph_objects as go
+from ..series import get_values, get_series, get_row_index, get_value, first_valid
 
 def add_btc_traces(fig, df, row_idx):
     """
     Добавляет графики цены BTC (Binance, Oracle, VWAP, Strike) в фигуру.
     """
-    x_indices = list(range(len(df)))
+    x_indices = get_row_index(df)
 
     # 1. Binance BTC - оранжевая линия
-    binance_prices = df['binance_btc_price'].values
+    binance_prices = get_values(df, 'binance_btc_price')
     fig.add_trace(
         go.Scatter(
             x=x_indices, y=binance_prices,
@@ -21,12 +21,11 @@ def add_btc_traces(fig, df, row_idx):
     )
 
     # 2. VWAP 30s - серая пунктирная линия
-    vwap = df['binance_vwap_30s'].values if 'binance_vwap_30s' in df.columns else np.array([np.nan] * len(df))
-    vwap_mask = ~pd.isna(vwap)
+    vwap_x, vwap_y = get_series(df, 'binance_vwap_30s')
     fig.add_trace(
         go.Scatter(
-            x=[i for i, m in enumerate(vwap_mask) if m],
-            y=[float(v) for v, m in zip(vwap, vwap_mask) if m],
+            x=vwap_x,
+            y=vwap_y,
             mode='lines', name='VWAP 30s',
             line=dict(color='#888', width=1, dash='dot'),
             hovertemplate='VWAP: $%{y:,.2f}<extra></extra>'
@@ -35,12 +34,11 @@ def add_btc_traces(fig, df, row_idx):
     )
 
     # 3. Oracle BTC - синяя линия
-    oracle_prices = df['oracle_btc_price'].values if 'oracle_btc_price' in df.columns else np.array([np.nan] * len(df))
-    oracle_mask = ~pd.isna(oracle_prices)
+    oracle_prices_x, oracle_prices_y = get_series(df, 'oracle_btc_price')
     fig.add_trace(
         go.Scatter(
-            x=[i for i, m in enumerate(oracle_mask) if m],
-            y=[float(p) for p, m in zip(oracle_prices, oracle_mask) if m],
+            x=oracle_prices_x,
+            y=oracle_prices_y,
             mode='lines', name='Oracle BTC',
             line=dict(color='#2196F3', width=2),
             hovertemplate='Oracle: $%{y:,.2f}<extra></extra>'
@@ -49,7 +47,7 @@ def add_btc_traces(fig, df, row_idx):
     )
 
     # 4. Strike price - первая не-NaN цена oracle
-    first_oracle = next((float(p) for p in oracle_prices if pd.notna(p)), None)
+    first_oracle = first_valid(df, 'oracle_btc_price')
     if first_oracle:
         fig.add_hline(
             y=first_oracle, line_dash="dash", line_color="rgba(255,255,255,0.5)",
@@ -60,7 +58,7 @@ def add_btc_traces(fig, df, row_idx):
         )
 
     # 5. Текущая точка Binance
-    current_binance = binance_prices[row_idx]
+    current_binance = get_value(df, 'binance_btc_price', row_idx)
     fig.add_trace(
         go.Scatter(
             x=[row_idx] if pd.notna(current_binance) else [],
@@ -76,7 +74,7 @@ def add_btc_traces(fig, df, row_idx):
     )
 
     # 6. Текущая точка Oracle
-    current_oracle = oracle_prices[row_idx] if row_idx < len(oracle_prices) else np.nan
+    current_oracle = get_value(df, 'oracle_btc_price', row_idx)
     fig.add_trace(
         go.Scatter(
             x=[row_idx] if pd.notna(current_oracle) else [],
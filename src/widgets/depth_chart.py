@@ -3,10 +3,12 @@ Depth Chart Widget
 График глубины ликвидности
 """
 
-import pandas as pd
-import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from ..series import get_plot_series
+
+# Линии по индексам трасс: ключ ряда для догрузки при зуме (src/zoom.py)
+SERIES_TRACES = {0: 'pm_up_bid_depth5', 1: 'pm_up_ask_depth5', 2: 'pm_down_bid_depth5', 3: 'pm_down_ask_depth5'}
 
 
 def create_depth_figure(df, row_idx):
@@ -26,23 +28,17 @@ def create_depth_figure(df, row_idx):
     )
 
     # === Извлечение данных depth ===
-    pm_up_bid_depth5 = df['pm_up_bid_depth5'].values if 'pm_up_bid_depth5' in df.columns else np.array([np.nan] * len(df))
-    pm_up_ask_depth5 = df['pm_up_ask_depth5'].values if 'pm_up_ask_depth5' in df.columns else np.array([np.nan] * len(df))
-    pm_down_bid_depth5 = df['pm_down_bid_depth5'].values if 'pm_down_bid_depth5' in df.columns else np.array([np.nan] * len(df))
-    pm_down_ask_depth5 = df['pm_down_ask_depth5'].values if 'pm_down_ask_depth5' in df.columns else np.array([np.nan] * len(df))
-
-    # Фильтрация NaN
-    up_bid_mask = ~pd.isna(pm_up_bid_depth5)
-    up_ask_mask = ~pd.isna(pm_up_ask_depth5)
-    down_bid_mask = ~pd.isna(pm_down_bid_depth5)
-    down_ask_mask = ~pd.isna(pm_down_ask_depth5)
+    pm_up_bid_depth5_x, pm_up_bid_depth5_y = get_plot_series(df, 'pm_up_bid_depth5')
+    pm_up_ask_depth5_x, pm_up_ask_depth5_y = get_plot_series(df, 'pm_up_ask_depth5')
+    pm_down_bid_depth5_x, pm_down_bid_depth5_y = get_plot_series(df, 'pm_down_bid_depth5')
+    pm_down_ask_depth5_x, pm_down_ask_depth5_y = get_plot_series(df, 'pm_down_ask_depth5')
 
     # === Trace 0: UP Bid Depth (зеленый) ===
-    if up_bid_mask.any():
+    if len(pm_up_bid_depth5_x):
         fig.add_trace(
             go.Scatter(
-                x=[i for i, m in enumerate(up_bid_mask) if m],
-                y=[float(v) for v, m in zip(pm_up_bid_depth5, up_bid_mask) if m],
+                x=pm_up_bid_depth5_x,
+                y=pm_up_bid_depth5_y,
                 mode='lines',
                 name='UP Bid Depth',
                 line=dict(color='rgba(0, 200, 83, 0.8)', width=0),
@@ -56,11 +52,11 @@ def create_depth_figure(df, row_idx):
         fig.add_trace(go.Scatter(x=[], y=[], showlegend=False), row=1, col=1)
 
     # === Trace 1: UP Ask Depth (красный) ===
-    if up_ask_mask.any():
+    if len(pm_up_ask_depth5_x):
         fig.add_trace(
             go.Scatter(
-                x=[i for i, m in enumerate(up_ask_mask) if m],
-                y=[float(v) for v, m in zip(pm_up_ask_depth5, up_ask_mask) if m],
+                x=pm_up_ask_depth5_x,
+                y=pm_up_ask_depth5_y,
                 mode='lines',
                 name='UP Ask Depth',
                 line=dict(color='rgba(244, 67, 54, 0.8)', width=0),
@@ -74,11 +70,11 @@ def create_depth_figure(df, row_idx):
         fig.add_trace(go.Scatter(x=[], y=[], showlegend=False), row=1, col=1)
 
     # === Trace 2: DOWN Bid Depth (зеленый) ===
-    if down_bid_mask.any():
+    if len(pm_down_bid_depth5_x):
         fig.add_trace(
             go.Scatter(
-                x=[i for i, m in enumerate(down_bid_mask) if m],
-                y=[float(v) for v, m in zip(pm_down_bid_depth5, down_bid_mask) if m],
+                x=pm_down_bid_depth5_x,
+                y=pm_down_bid_depth5_y,
                 mode='lines',
                 name='DOWN Bid Depth',
                 line=dict(color='rgba(0, 200, 83, 0.6)', width=0),
@@ -92,11 +88,11 @@ def create_depth_figure(df, row_idx):
         fig.add_trace(go.Scatter(x=[], y=[], showlegend=False), row=1, col=1)
 
     # === Trace 3: DOWN Ask Depth (красный) ===
-    if down_ask_mask.any():
+    if len(pm_down_ask_depth5_x):
         fig.add_trace(
             go.Scatter(
-                x=[i for i, m in enumerate(down_ask_mask) if m],
-                y=[float(v) for v, m in zip(pm_down_ask_depth5, down_ask_mask) if m],
+                x=pm_down_ask_depth5_x,
+                y=pm_down_ask_depth5_y,
                 mode='lines',
                 name='DOWN Ask Depth',
                 line=dict(color='rgba(244, 67, 54, 0.6)', width=0),
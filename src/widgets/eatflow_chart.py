@@ -3,10 +3,12 @@ EatFlow Chart Widget
 График скорости поедания (pm_up_bid_eatflow, pm_up_ask_eatflow, pm_down_bid_eatflow, pm_down_ask_eatflow)
 """
 
-import pandas as pd
-import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from ..series import get_plot_series
+
+# Линии по индексам трасс: ключ ряда для догрузки при зуме (src/zoom.py)
+SERIES_TRACES = {0: 'pm_up_bid_eatflow', 1: 'pm_up_ask_eatflow', 2: 'pm_down_bid_eatflow', 3: 'pm_down_ask_eatflow'}
 
 
 def create_eatflow_figure(df, row_idx):
@@ -26,23 +28,17 @@ def create_eatflow_figure(df, row_idx):
     )
 
     # === Извлечение данных ===
-    up_bid_eatflow = df['pm_up_bid_eatflow'].values if 'pm_up_bid_eatflow' in df.columns else np.array([np.nan] * len(df))
-    up_ask_eatflow = df['pm_up_ask_eatflow'].values if 'pm_up_ask_eatflow' in df.columns else np.array([np.nan] * len(df))
-    down_bid_eatflow = df['pm_down_bid_eatflow'].values if 'pm_down_bid_eatflow' in df.columns else np.array([np.nan] * len(df))
-    down_ask_eatflow = df['pm_down_ask_eatflow'].values if 'pm_down_ask_eatflow' in df.columns else np.array([np.nan] * len(df))
-
-    # Фильтрация NaN
-    m1 = ~pd.isna(up_bid_eatflow)
-    m2 = ~pd.isna(up_ask_eatflow)
-    m3 = ~pd.isna(down_bid_eatflow)
-    m4 = ~pd.isna(down_ask_eatflow)
+    up_bid_eatflow_x, up_bid_eatflow_y = get_plot_series(df, 'pm_up_bid_eatflow')
+    up_ask_eatflow_x, up_ask_eatflow_y = get_plot_series(df, 'pm_up_ask_eatflow')
+    down_bid_eatflow_x, down_bid_eatflow_y = get_plot_series(df, 'pm_down_bid_eatflow')
+    down_ask_eatflow_x, down_ask_eatflow_y = get_plot_series(df, 'pm_down_ask_eatflow')
 
     # === Trace 0: UP Bid EatFlow (светло-зеленая) ===
-    if m1.any():
+    if len(up_bid_eatflow_x):
         fig.add_trace(
             go.Scatter(
-                x=[i for i, m in enumerate(m1) if m],
-                y=[float(v) for v, m in zip(up_bid_eatflow, m1) if m],
+                x=up_bid_eatflow_x,
+                y=up_bid_eatflow_y,
                 mode='lines',
                 name='UP Bid EatFlow',
                 line=dict(color='#81C784', width=2),
@@ -54,11 +50,11 @@ def create_eatflow_figure(df, row_idx):
         fig.add_trace(go.Scatter(x=[], y=[], showlegend=False), row=1, col=1)
 
     # === Trace 1: UP Ask EatFlow (темно-зеленая) ===
-    if m2.any():
+    if len(up_ask_eatflow_x):
         fig.add_trace(
             go.Scatter(
-                x=[i for i, m in enumerate(m2) if m],
-                y=[float(v) for v, m in zip(up_ask_eatflow, m2) if m],
+                x=up_ask_eatflow_x,
+                y=up_ask_eatflow_y,
                 mode='lines',
                 name='UP Ask EatFlow',
                 line=dict(color='#2E7D32', width=2),
@@ -70,11 +66,11 @@ def create_eatflow_figure(df, row_idx):
         fig.add_trace(go.Scatter(x=[], y=[], showlegend=False), row=1, col=1)
 
     # === Trace 2: DOWN Bid EatFlow (светло-красная) ===
-    if m3.any():
+    if len(down_bid_eatflow_x):
         fig.add_trace(
             go.Scatter(
-                x=[i for i, m in enumerate(m3) if m],
-                y=[float(v) for v, m in zip(down_bid_eatflow, m3) if m],
+                x=down_bid_eatflow_x,
+                y=down_bid_eatflow_y,
                 mode='lines',
                 name='DOWN Bid EatFlow',
                 line=dict(color='#E57373', width=2),
@@ -86,11 +82,11 @@ def create_eatflow_figure(df, row_idx):
         fig.add_trace(go.Scatter(x=[], y=[], showlegend=False), row=1, col=1)
 
     # === Trace 3: DOWN Ask EatFlow (темно-красная) ===
-    if m4.any():
+    if len(down_ask_eatflow_x):
         fig.add_trace(
             go.Scatter(
-                x=[i for i, m in enumerate(m4) if m],
-                y=[float(v) for v, m in zip(down_ask_eatflow, m4) if m],
+                x=down_ask_eatflow_x,
+                y=down_ask_eatflow_y,
                 mode='lines',
                 name='DOWN Ask EatFlow',
                 line=dict(color='#C62828', width=2),
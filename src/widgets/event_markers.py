@@ -0,0 +1,68 @@
+"""
+Event Markers Widget
+Вертикальные маркеры событий (пересечения, всплески) одной трассой
+"""
+
+import numpy as np
+import plotly.graph_objects as go
+
+
+def event_segments(x_positions):
+    """
+    Координаты вертикальных отрезков для списка событий.
+
+    Каждое событие - отрезок (x, 0) -> (x, 1), отрезки разделены NaN
+    (разрыв линии, как None в списке), поэтому все события рисуются одной трассой.
+
+    Returns:
+        tuple: (x, y) массивы длины 3 * len(x_positions)
+    """
+    x_positions = np.asarray(x_positions, dtype=np.float32)
+    x = np.repeat(x_positions, 3)
+    x[2::3] = np.nan
+    y = np.tile(np.array([0.0, 1.0, np.nan], dtype=np.float32), len(x_positions))
+    return x, y
+
+
+def add_event_markers(fig, x_positions, name, row=1, col=1, color='rgba(255, 193, 7, 0.7)', width=2, dash='dot'):
+    """
+    Добавить маркеры событий в subplot одной scatter трассой вместо
+    fig.add_vline на каждое событие (shape на событие дорог и при построении,
+    и при relayout в браузере).
+
+    Отрезки рисуются на скрытой оси Y с диапазоном [0, 1] поверх оси subplot,
+    поэтому занимают всю высоту графика при любом масштабе по Y.
+    Трасса добавляется всегда (и без событий), чтобы индексы трасс не менялись.
+
+    Args:
+        fig: Plotly figure (make_subplots)
+        x_positions: X координаты событий
+        name: имя трассы
+        row, col: subplot
+    """
+    subplot = fig.get_subplot(row, col)
+    y_anchor = subplot.yaxis.plotly_name.replace('axis', '')
+
+    axis_numbers = [int(key[5:] or 1) for key in fig.layout.to_plotly_json() if key.startswith('yaxis')]
+    axis_number = max(axis_numbers, default=1) + 1
+    fig.layout[f'yaxis{axis_number}'] = dict(
+        overlaying=y_anchor,
+        range=[0, 1],
+        visible=False,
+        fixedrange=True
+    )
+
+    x, y = event_segments(x_positions)
+    fig.add_trace(
+        go.Scatter(
+            x=x,
+            y=y,
+            mode='lines',
+            name=name,
+            line=dict(color=color, width=width, dash=dash),
+            hoverinfo='skip',
+            showlegend=False,
+            xaxis=subplot.xaxis.plotly_name.replace('axis', ''),
+            yaxis=f'y{axis_number}'
+        )
+    )
@@ -3,10 +3,12 @@ Imbalance Chart Widget
 График имбаланса (pm_up_imbalance, pm_down_imbalance)
 """
 
-import pandas as pd
-import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from ..series import get_plot_series
+
+# Линии по индексам трасс: ключ ряда для догрузки при зуме (src/zoom.py)
+SERIES_TRACES = {0: 'pm_up_imbalance', 1: 'pm_down_imbalance'}
 
 
 def create_imbalance_figure(df, row_idx):
@@ -26,19 +28,15 @@ def create_imbalance_figure(df, row_idx):
     )
 
     # === Извлечение данных ===
-    pm_up_imbalance = df['pm_up_imbalance'].values if 'pm_up_imbalance' in df.columns else np.array([np.nan] * len(df))
-    pm_down_imbalance = df['pm_down_imbalance'].values if 'pm_down_imbalance' in df.columns else np.array([np.nan] * len(df))
-
-    # Фильтрация NaN
-    up_mask = ~pd.isna(pm_up_imbalance)
-    down_mask = ~pd.isna(pm_down_imbalance)
+    pm_up_imbalance_x, pm_up_imbalance_y = get_plot_series(df, 'pm_up_imbalance')
+    pm_down_imbalance_x, pm_down_imbalance_y = get_plot_series(df, 'pm_down_imbalance')
 
     # === Trace 0: UP Imbalance (зеленая линия) ===
-    if up_mask.any():
+    if len(pm_up_imbalance_x):
         fig.add_trace(
             go.Scatter(
-                x=[i for i, m in enumerate(up_mask) if m],
-                y=[float(v) for v, m in zip(pm_up_imbalance, up_mask) if m],
+                x=pm_up_imbalance_x,
+                y=pm_up_imbalance_y,
                 mode='lines',
                 name='UP Imbalance',
                 line=dict(color='#00C853', width=2),
@@ -50,11 +48,11 @@ def create_imbalance_figure(df, row_idx):
         fig.add_trace(go.Scatter(x=[], y=[], showlegend=False), row=1, col=1)
 
     # === Trace 1: DOWN Imbalance (красная линия) ===
-    if down_mask.any():
+    if len(pm_down_imbalance_x):
         fig.add_trace(
             go.Scatter(
-                x=[i for i, m in enumerate(down_mask) if m],
-                y=[float(v) for v, m in zip(pm_down_imbalance, down_mask) if m],
+                x=pm_down_imbalance_x,
+                y=pm_down_imbalance_y,
                 mode='lines',
                 name='DOWN Imbalance',
                 line=dict(color='#F44336', width=2),
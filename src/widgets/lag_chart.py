@@ -1,19 +1,18 @@
 import pandas as pd
-import numpy as np
 import plotly.graph_objects as go
+from ..series import get_series, get_value
 
 def add_lag_traces(fig, df, row_idx):
     """
     Добавляет график Lag (разница Binance - Oracle) в фигуру.
     """
-    lag_values = df['lag'].values if 'lag' in df.columns else np.array([np.nan] * len(df))
-    lag_mask = ~pd.isna(lag_values)
+    lag_values_x, lag_values_y = get_series(df, 'lag')
 
     # Линия lag
     fig.add_trace(
         go.Scatter(
-            x=[i for i, m in enumerate(lag_mask) if m],
-            y=[float(lag) for lag, m in zip(lag_values, lag_mask) if m],
+            x=lag_values_x,
+            y=lag_values_y,
             mode='lines',
             name='Price Lag (Binance - Oracle)',
             line=dict(color='#FFC107', width=2),
@@ -32,7 +31,7 @@ def add_lag_traces(fig, df, row_idx):
     )
 
     # Текущая точка lag
-    current_lag = lag_values[row_idx] if row_idx < len(lag_values) else np.nan
+    current_lag = get_value(df, 'lag', row_idx)
     fig.add_trace(
         go.Scatter(
             x=[row_idx] if pd.notna(current_lag) else [],
@@ -3,10 +3,12 @@ Latency Direction Chart Widget
 График индикатора запаздывания оракула
 """
 
-import pandas as pd
-import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from ..series import get_plot_series
+
+# Линии по индексам трасс: ключ ряда для догрузки при зуме (src/zoom.py)
+SERIES_TRACES = {0: 'lat_dir_norm_x1000', 1: 'lat_dir_raw_x1000'}
 
 
 def create_latency_direction_figure(df, row_idx):
@@ -26,12 +28,8 @@ def create_latency_direction_figure(df, row_idx):
     )
 
     # === Извлечение данных ===
-    lat_dir_raw = df['lat_dir_raw_x1000'].values if 'lat_dir_raw_x1000' in df.columns else np.array([np.nan] * len(df))
-    lat_dir_norm = df['lat_dir_norm_x1000'].values if 'lat_dir_norm_x1000' in df.columns else np.array([np.nan] * len(df))
-
-    # Фильтрация NaN
-    raw_mask = ~pd.isna(lat_dir_raw)
-    norm_mask = ~pd.isna(lat_dir_norm)
+    lat_dir_raw_x, lat_dir_raw_y = get_plot_series(df, 'lat_dir_raw_x1000')
+    lat_dir_norm_x, lat_dir_norm_y = get_plot_series(df, 'lat_dir_norm_x1000')
 
     # === Фоновые зоны (выше/ниже нуля) ===
 
@@ -114,11 +112,11 @@ def create_latency_direction_figure(df, row_idx):
     )
 
     # === Trace 0: lat_dir_norm_x1000 (медленный тренд, толстая линия) ===
-    if norm_mask.any():
+    if len(lat_dir_norm_x):
         fig.add_trace(
             go.Scatter(
-                x=[i for i, m in enumerate(norm_mask) if m],
-                y=[float(v) for v, m in zip(lat_dir_norm, norm_mask) if m],
+                x=lat_dir_norm_x,
+                y=lat_dir_norm_y,
                 mode='lines',
                 name='LatDir Norm (тренд)',
                 line=dict(color='#9C27B0', width=3),  # Фиолетовая толстая
@@ -130,11 +128,11 @@ def create_latency_direction_figure(df, row_idx):
         fig.add_trace(go.Scatter(x=[], y=[], showlegend=False), row=1, col=1)
 
     # === Trace 1: lat_dir_raw_x1000 (быстрый сигнал, тонкая линия) ===
-    if raw_mask.any():
+    if len(lat_dir_raw_x):
         fig.add_trace(
             go.Scatter(
-                x=[i for i, m in enumerate(raw_mask) if m],
-                y=[float(v) for v, m in zip(lat_dir_raw, raw_mask) if m],
+                x=lat_dir_raw_x,
+                y=lat_dir_raw_y,
                 mode='lines',
                 name='LatDir Raw (сигнал)',
                 line=dict(color='#00BCD4', width=2),  # Голубая
@@ -6,6 +6,59 @@ Market Header Widget
 from dash import html
 
 
+# Фазы рынка по оставшемуся времени: порог "больше above секунд" и стили панели.
+# Таблица передаётся и в браузер - таймер считается clientside (assets/market_timer.js)
+MARKET_PHASES = [
+    # 🟢 Зелёный (>600s / 10+ мин) — ранняя фаза
+    {
+        'above': 600,
+        'backgroundColor': '#1e5128',
+        'color': '#a7f3d0',
+        'phase': 'Ранняя фаза',
+        'phaseIcon': '🟢'
+    },
+    # 🟡 Жёлтый (300–600s / 5–10 мин) — формирование тренда
+    {
+        'above': 300,
+        'backgroundColor': '#6b5b11',
+        'color': '#fef3c7',
+        'phase': 'Основная фаза входа',
+        'phaseIcon': '🟡'
+    },
+    # 🟠 Оранжевый (120–300s / 2–5 мин) — развязка
+    {
+        'above': 120,
+        'backgroundColor': '#7c3d00',
+        'color': '#fed7aa',
+        'phase': 'Развязка — фиксация',
+        'phaseIcon': '🟠'
+    },
+    # 🔴 Красный (<120s / <2 мин) — финал
+    {
+        'above': 30,
+        'backgroundColor': '#7f1d1d',
+        'color': '#fecaca',
+        'phase': 'Финал — экстренный выход',
+        'phaseIcon': '🔴'
+    },
+    # ⚫ Мигающий красный (<30s) — критическая зона
+    {
+        'above': None,
+        'backgroundColor': '#991b1b',
+        'color': '#fef2f2',
+        'phase': 'КРИТИЧЕСКАЯ ЗОНА',
+        'phaseIcon': '⚠️',
+        'animation': 'pulse 0.8s ease-in-out infinite'
+    },
+]
+
+# Стили панели, когда время неизвестно
+NO_PHASE = {
+    'backgroundColor': '#2c2c2c',
+    'color': '#888'
+}
+
+
 def get_phase_color(seconds_till_end):
     """
     Определить цвет фона панели по оставшемуся времени
@@ -17,56 +70,11 @@ def get_phase_color(seconds_till_end):
         dict: стили для фона панели
     """
     if seconds_till_end is None or seconds_till_end < 0:
-        return {
-            'backgroundColor': '#2c2c2c',
-            'color': '#888'
-        }
+        return dict(NO_PHASE)
 
-    # 🟢 Зелёный (>600s / 10+ мин) — ранняя фаза
-    if seconds_till_end > 600:
-        return {
-            'backgroundColor': '#1e5128',
-            'color': '#a7f3d0',
-            'phase': 'Ранняя фаза',
-            'phaseIcon': '🟢'
-        }
-
-    # 🟡 Жёлтый (300–600s / 5–10 мин) — формирование тренда
-    elif seconds_till_end > 300:
-        return {
-            'backgroundColor': '#6b5b11',
-            'color': '#fef3c7',
-            'phase': 'Основная фаза входа',
-            'phaseIcon': '🟡'
-        }
-
-    # 🟠 Оранжевый (120–300s / 2–5 мин) — развязка
-    elif seconds_till_end > 120:
-        return {
-            'backgroundColor': '#7c3d00',
-            'color': '#fed7aa',
-            'phase': 'Развязка — фиксация',
-            'phaseIcon': '🟠'
-        }
-
-    # 🔴 Красный (<120s / <2 мин) — финал
-    elif seconds_till_end > 30:
-        return {
-            'backgroundColor': '#7f1d1d',
-            'color': '#fecaca',
-            'phase': 'Финал — экстренный выход',
-            'phaseIcon': '🔴'
-        }
-
-    # ⚫ Мигающий красный (<30s) — критическая зона
-    else:
-        return {
-            'backgroundColor': '#991b1b',
-            'color': '#fef2f2',
-            'phase': 'КРИТИЧЕСКАЯ ЗОНА',
-            'phaseIcon': '⚠️',
-            'animation': 'pulse 0.8s ease-in-out infinite'
-        }
+    for phase in MARKET_PHASES:
+        if phase['above'] is None or seconds_till_end > phase['above']:
+            return {key: value for key, value in phase.items() if key != 'above'}
 
 
 def create_market_header():
@@ -3,10 +3,12 @@ Microprice Chart Widget
 График микроцены (pm_up_microprice, pm_down_microprice)
 """
 
-import pandas as pd
-import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from ..series import get_plot_series
+
+# Линии по индексам трасс: ключ ряда для догрузки при зуме (src/zoom.py)
+SERIES_TRACES = {0: 'pm_up_microprice', 1: 'pm_down_microprice'}
 
 
 def create_microprice_figure(df, row_idx):
@@ -26,19 +28,15 @@ def create_microprice_figure(df, row_idx):
     )
 
     # === Извлечение данных ===
-    pm_up_microprice = df['pm_up_microprice'].values if 'pm_up_microprice' in df.columns else np.array([np.nan] * len(df))
-    pm_down_microprice = df['pm_down_microprice'].values if 'pm_down_microprice' in df.columns else np.array([np.nan] * len(df))
-
-    # Фильтрация NaN
-    up_mask = ~pd.isna(pm_up_microprice)
-    down_mask = ~pd.isna(pm_down_microprice)
+    pm_up_microprice_x, pm_up_microprice_y = get_plot_series(df, 'pm_up_microprice')
+    pm_down_microprice_x, pm_down_microprice_y = get_plot_series(df, 'pm_down_microprice')
 
     # === Trace 0: UP Microprice (зеленая линия) ===
-    if up_mask.any():
+    if len(pm_up_microprice_x):
         fig.add_trace(
             go.Scatter(
-                x=[i for i, m in enumerate(up_mask) if m],
-                y=[float(v) for v, m in zip(pm_up_microprice, up_mask) if m],
+                x=pm_up_microprice_x,
+                y=pm_up_microprice_y,
                 mode='lines',
                 name='UP Microprice',
                 line=dict(color='#00C853', width=2),
@@ -50,11 +48,11 @@ def create_microprice_figure(df, row_idx):
         fig.add_trace(go.Scatter(x=[], y=[], showlegend=False), row=1, col=1)
 
     # === Trace 1: DOWN Microprice (красная линия) ===
-    if down_mask.any():
+    if len(pm_down_microprice_x):
         fig.add_trace(
             go.Scatter(
-                x=[i for i, m in enumerate(down_mask) if m],
-                y=[float(v) for v, m in zip(pm_down_microprice, down_mask) if m],
+                x=pm_down_microprice_x,
+                y=pm_down_microprice_y,
                 mode='lines',
                 name='DOWN Microprice',
                 line=dict(color='#F44336', width=2),
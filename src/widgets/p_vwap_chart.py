@@ -3,10 +3,29 @@ P/VWAP Chart Widget
 График отклонения цены от VWAP (осциллятор)
 """
 
-import pandas as pd
-import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from ..series import get_values, valid_series, get_plot_series
+from .event_markers import add_event_markers
+
+# Линии по индексам трасс: ключ ряда для догрузки при зуме (src/zoom.py)
+SERIES_TRACES = {0: 'binance_p_vwap_30s', 1: 'binance_p_vwap_5s'}
+
+
+def find_crossovers(df):
+    """
+    Индексы строк, где P/VWAP 5s пересекает P/VWAP 30s (сигналы разворота).
+    Пересечение - смена знака разности линий там, где обе линии валидны.
+    """
+    valid_indices, diff = valid_series(
+        get_values(df, 'binance_p_vwap_5s') - get_values(df, 'binance_p_vwap_30s')
+    )
+    above = diff >= 0
+    return valid_indices[1:][above[1:] != above[:-1]]
+
+
+# Маркеры событий по индексам трасс (src/skeleton.py)
+EVENT_TRACES = {2: find_crossovers}
 
 
 def create_p_vwap_figure(df, row_idx):
@@ -26,12 +45,8 @@ def create_p_vwap_figure(df, row_idx):
     )
 
     # === Извлечение данных ===
-    p_vwap_5s = df['binance_p_vwap_5s'].values if 'binance_p_vwap_5s' in df.columns else np.array([np.nan] * len(df))
-    p_vwap_30s = df['binance_p_vwap_30s'].values if 'binance_p_vwap_30s' in df.columns else np.array([np.nan] * len(df))
-
-    # Фильтрация NaN
-    p5s_mask = ~pd.isna(p_vwap_5s)
-    p30s_mask = ~pd.isna(p_vwap_30s)
+    p_vwap_5s_x, p_vwap_5s_y = get_plot_series(df, 'binance_p_vwap_5s')
+    p_vwap_30s_x, p_vwap_30s_y = get_plot_series(df, 'binance_p_vwap_30s')
 
     # === Фоновые зоны (выше/ниже нуля) ===
 
@@ -88,11 +103,11 @@ def create_p_vwap_figure(df, row_idx):
     )
 
     # === Trace 0: P/VWAP 30s (медленный тренд, толстая линия) ===
-    if p30s_mask.any():
+    if len(p_vwap_30s_x):
         fig.add_trace(
             go.Scatter(
-                x=[i for i, m in enumerate(p30s_mask) if m],
-                y=[float(v) for v, m in zip(p_vwap_30s, p30s_mask) if m],
+                x=p_vwap_30s_x,
+                y=p_vwap_30s_y,
                 mode='lines',
                 name='P/VWAP 30s (тренд)',
                 line=dict(color='#9C27B0', width=3),  # Фиолетовая толстая
@@ -104,11 +119,11 @@ def create_p_vwap_figure(df, row_idx):
         fig.add_trace(go.Scatter(x=[], y=[], showlegend=False), row=1, col=1)
 
     # === Trace 1: P/VWAP 5s (быстрый сигнал, тонкая линия) ===
-    if p5s_mask.any():
+    if len(p_vwap_5s_x):
         fig.add_trace(
             go.Scatter(
-                x=[i for i, m in enumerate(p5s_mask) if m],
-                y=[float(v) for v, m in zip(p_vwap_5s, p5s_mask) if m],
+                x=p_vwap_5s_x,
+                y=p_vwap_5s_y,
                 mode='lines',
                 name='P/VWAP 5s (сигнал)',
                 line=dict(color='#00BCD4', width=2),  # Голубая
@@ -119,36 +134,12 @@ def create_p_vwap_figure(df, row_idx):
     else:
         fig.add_trace(go.Scatter(x=[], y=[], showlegend=False), row=1, col=1)
 
-    # === Поиск точек пересечения (сигналы разворота) ===
-    # Находим индексы, где обе линии валидны
-    both_valid = p5s_mask & p30s_mask
-    valid_indices = np.where(both_valid)[0]
-
-    if len(valid_indices) > 1:
-        crossover_indices = []
-
-        for i in range(1, len(valid_indices)):
-            idx_prev = valid_indices[i - 1]
-            idx_curr = valid_indices[i]
-
-            # Разность линий (P/VWAP 5s - P/VWAP 30s)
-            diff_prev = p_vwap_5s[idx_prev] - p_vwap_30s[idx_prev]
-            diff_curr = p_vwap_5s[idx_curr] - p_vwap_30s[idx_curr]
-
-            # Пересечение происходит, когда знак разности меняется
-            if not pd.isna(diff_prev) and not pd.isna(diff_curr):
-                if (diff_prev >= 0 and diff_curr < 0) or (diff_prev < 0 and diff_curr >= 0):
-                    crossover_indices.append(idx_curr)
-
-        # Добавляем вертикальные маркеры в точках пересечения
-        for cross_idx in crossover_indices:
-            fig.add_vline(
-                x=cross_idx,
-                line_dash='dot',
-                line_color='rgba(255, 193, 7, 0.7)',  # Жёлтый
-                line_width=2,
-                row=1, col=1
-            )
+    # === Trace 2: вертикальные маркеры пересечений (одна трасса) ===
+    add_event_markers(
+        fig, find_crossovers(df), 'Crossover',
+        color='rgba(255, 193, 7, 0.7)',  # Жёлтый
+        row=1, col=1
+    )
 
     # === Layout ===
     fig.update_layout(
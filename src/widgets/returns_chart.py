@@ -3,9 +3,11 @@ Returns/Momentum Chart Widget
 График моментума и доходности BTC
 """
 
-import pandas as pd
-import numpy as np
 import plotly.graph_objects as go
+from ..series import get_plot_series
+
+# Линии по индексам трасс: ключ ряда для догрузки при зуме (src/zoom.py)
+SERIES_TRACES = {0: 'binance_ret5s_x100', 1: 'binance_ret1s_x100'}
 
 
 def add_returns_traces(fig, df, row_idx):
@@ -18,12 +20,8 @@ def add_returns_traces(fig, df, row_idx):
         row_idx: Текущий индекс строки
     """
     # Извлекаем данные доходности
-    ret1s = df['binance_ret1s_x100'].values if 'binance_ret1s_x100' in df.columns else np.array([np.nan] * len(df))
-    ret5s = df['binance_ret5s_x100'].values if 'binance_ret5s_x100' in df.columns else np.array([np.nan] * len(df))
-
-    # Фильтруем NaN значения
-    ret1s_mask = ~pd.isna(ret1s)
-    ret5s_mask = ~pd.isna(ret5s)
+    ret1s_x, ret1s_y = get_plot_series(df, 'binance_ret1s_x100')
+    ret5s_x, ret5s_y = get_plot_series(df, 'binance_ret5s_x100')
 
     # === Фоновые зоны для пороговых значений ===
 
@@ -109,8 +107,8 @@ def add_returns_traces(fig, df, row_idx):
     # === Ret5s - сглаженный тренд (толстая линия) ===
     fig.add_trace(
         go.Scatter(
-            x=[i for i, m in enumerate(ret5s_mask) if m],
-            y=[float(v) for v, m in zip(ret5s, ret5s_mask) if m],
+            x=ret5s_x,
+            y=ret5s_y,
             mode='lines',
             name='Ret 5s (тренд)',
             line=dict(color='#9C27B0', width=3),  # Фиолетовая толстая линия
@@ -122,8 +120,8 @@ def add_returns_traces(fig, df, row_idx):
     # === Ret1s - быстрый сигнал (линия) ===
     fig.add_trace(
         go.Scatter(
-            x=[i for i, m in enumerate(ret1s_mask) if m],
-            y=[float(v) for v, m in zip(ret1s, ret1s_mask) if m],
+            x=ret1s_x,
+            y=ret1s_y,
             mode='lines',
             name='Ret 1s (сигнал)',
             line=dict(color='#00BCD4', width=2),
@@ -171,11 +169,8 @@ def create_returns_figure(df, row_idx):
     )
 
     # Добавляем графики
-    ret1s = df['binance_ret1s_x100'].values if 'binance_ret1s_x100' in df.columns else np.array([np.nan] * len(df))
-    ret5s = df['binance_ret5s_x100'].values if 'binance_ret5s_x100' in df.columns else np.array([np.nan] * len(df))
-
-    ret1s_mask = ~pd.isna(ret1s)
-    ret5s_mask = ~pd.isna(ret5s)
+    ret1s_x, ret1s_y = get_plot_series(df, 'binance_ret1s_x100')
+    ret5s_x, ret5s_y = get_plot_series(df, 'binance_ret5s_x100')
 
     # === Фоновые зоны ===
     fig.add_hrect(
@@ -212,8 +207,8 @@ def create_returns_figure(df, row_idx):
     # === Trace 0: Ret5s линия ===
     fig.add_trace(
         go.Scatter(
-            x=[i for i, m in enumerate(ret5s_mask) if m],
-            y=[float(v) for v, m in zip(ret5s, ret5s_mask) if m],
+            x=ret5s_x,
+            y=ret5s_y,
             mode='lines',
             name='Ret 5s (тренд)',
             line=dict(color='#9C27B0', width=3),
@@ -225,8 +220,8 @@ def create_returns_figure(df, row_idx):
     # === Trace 1: Ret1s линия ===
     fig.add_trace(
         go.Scatter(
-            x=[i for i, m in enumerate(ret1s_mask) if m],
-            y=[float(v) for v, m in zip(ret1s, ret1s_mask) if m],
+            x=ret1s_x,
+            y=ret1s_y,
             mode='lines',
             name='Ret 1s (сигнал)',
             line=dict(color='#00BCD4', width=2),
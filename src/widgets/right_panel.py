@@ -4,7 +4,10 @@ Right Panel Widget
 """
 
 from dash import html, dcc
-from ..data_loader import get_csv_files
+from ..catalog import list_markets
+from ..render_mode import RENDER_MODES
+from ..zoom import AXIS_LINK_OPTIONS
+from ..config import RENDER_MODE
 from .active_track import create_active_track_widget
 
 
@@ -55,8 +58,10 @@ def create_playback_controls():
 
 
 def create_file_selector():
-    """Создать селектор файлов"""
-    files = get_csv_files()
+    """Создать селектор файлов (список рынков из каталога)"""
+    # Только чтение: каталог обновляется при старте, после ingest и в фоне
+    # (start_catalog_refresher), новые файлы видны после перезагрузки страницы
+    files = list_markets()
     return html.Div([
         html.H3("Select File", style={'color': 'white', 'marginTop': '0'}),
         dcc.Dropdown(
@@ -93,7 +98,9 @@ def create_market_timer():
             'display': 'flex',
             'alignItems': 'center',
             'marginBottom': '10px'
-        })
+        }),
+        # Фаза рынка (стиль выставляет assets/market_timer.js)
+        html.Div(id='market-phase', children='', style={'marginBottom': '10px'})
     ])
 
 
@@ -128,11 +135,40 @@ def create_performance_settings():
                 clearable=False,
                 style={'marginBottom': '15px'}
             ),
+        ]),
+
+        # Render Mode: SVG / WebGL / Auto по числу точек
+        html.Div([
+            html.Label("Chart Rendering:", style={'color': '#aaa', 'fontSize': '12px', 'marginBottom': '5px'}),
+            dcc.Dropdown(
+                id='render-mode-selector',
+                options=RENDER_MODES,
+                value=RENDER_MODE,
+                clearable=False,
+                style={'marginBottom': '15px'}
+            ),
         ])
         # Buffer Settings УДАЛЕНЫ - buffering теперь в JS (playback_engine.js)
     ])
 
 
+def create_axis_link_settings():
+    """Создать панель выбора графиков со связанным зумом"""
+    return html.Div([
+        html.Hr(style={'borderColor': '#444'}),
+        html.H3("Linked Zoom", style={'color': 'white'}),
+        html.Label("Charts zoomed together:", style={'color': '#aaa', 'fontSize': '12px', 'marginBottom': '5px'}),
+        # Зум графика вне группы меняет только его собственные оси
+        dcc.Dropdown(
+            id='axis-link-charts',
+            options=AXIS_LINK_OPTIONS,
+            value=[option['value'] for option in AXIS_LINK_OPTIONS],
+            multi=True,
+            style={'marginBottom': '15px'}
+        )
+    ])
+
+
 def create_time_slider():
     """Создать слайдер для навигации по времени"""
     return html.Div([
@@ -145,6 +181,8 @@ def create_time_slider():
             step=1,
             value=0,
             marks={},
+            # Кадр при перетаскивании рисуется в браузере (callbacks.py, Callback 3)
+            updatemode='drag',
             tooltip={"placement": "bottom", "always_visible": True}
         )
     ])
@@ -157,7 +195,9 @@ def create_right_panel():
         create_market_timer(),
         create_playback_controls(),
         create_time_slider(),
+        create_file_info_panel(),
         create_performance_settings(),
+        create_axis_link_settings(),
         create_active_track_widget(),
     ], style={
         'flex': '1',
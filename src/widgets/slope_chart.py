@@ -3,10 +3,12 @@ Slope Chart Widget
 График наклона (pm_up_bid_slope, pm_up_ask_slope, pm_down_bid_slope, pm_down_ask_slope)
 """
 
-import pandas as pd
-import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from ..series import get_plot_series
+
+# Линии по индексам трасс: ключ ряда для догрузки при зуме (src/zoom.py)
+SERIES_TRACES = {0: 'pm_up_bid_slope', 1: 'pm_up_ask_slope', 2: 'pm_down_bid_slope', 3: 'pm_down_ask_slope'}
 
 
 def create_slope_figure(df, row_idx):
@@ -26,24 +28,18 @@ def create_slope_figure(df, row_idx):
     )
 
     # === Извлечение данных ===
-    up_bid_slope = df['pm_up_bid_slope'].values if 'pm_up_bid_slope' in df.columns else np.array([np.nan] * len(df))
-    up_ask_slope = df['pm_up_ask_slope'].values if 'pm_up_ask_slope' in df.columns else np.array([np.nan] * len(df))
-    down_bid_slope = df['pm_down_bid_slope'].values if 'pm_down_bid_slope' in df.columns else np.array([np.nan] * len(df))
-    down_ask_slope = df['pm_down_ask_slope'].values if 'pm_down_ask_slope' in df.columns else np.array([np.nan] * len(df))
-
-    # Фильтрация NaN
     # Для простоты используем маску для каждого ряда
-    m1 = ~pd.isna(up_bid_slope)
-    m2 = ~pd.isna(up_ask_slope)
-    m3 = ~pd.isna(down_bid_slope)
-    m4 = ~pd.isna(down_ask_slope)
+    up_bid_slope_x, up_bid_slope_y = get_plot_series(df, 'pm_up_bid_slope')
+    up_ask_slope_x, up_ask_slope_y = get_plot_series(df, 'pm_up_ask_slope')
+    down_bid_slope_x, down_bid_slope_y = get_plot_series(df, 'pm_down_bid_slope')
+    down_ask_slope_x, down_ask_slope_y = get_plot_series(df, 'pm_down_ask_slope')
 
     # === Trace 0: UP Bid Slope (светло-зеленая) ===
-    if m1.any():
+    if len(up_bid_slope_x):
         fig.add_trace(
             go.Scatter(
-                x=[i for i, m in enumerate(m1) if m],
-                y=[float(v) for v, m in zip(up_bid_slope, m1) if m],
+                x=up_bid_slope_x,
+                y=up_bid_slope_y,
                 mode='lines',
                 name='UP Bid Slope',
                 line=dict(color='#81C784', width=2),
@@ -55,11 +51,11 @@ def create_slope_figure(df, row_idx):
         fig.add_trace(go.Scatter(x=[], y=[], showlegend=False), row=1, col=1)
 
     # === Trace 1: UP Ask Slope (темно-зеленая) ===
-    if m2.any():
+    if len(up_ask_slope_x):
         fig.add_trace(
             go.Scatter(
-                x=[i for i, m in enumerate(m2) if m],
-                y=[float(v) for v, m in zip(up_ask_slope, m2) if m],
+                x=up_ask_slope_x,
+                y=up_ask_slope_y,
                 mode='lines',
                 name='UP Ask Slope',
                 line=dict(color='#2E7D32', width=2),
@@ -71,11 +67,11 @@ def create_slope_figure(df, row_idx):
         fig.add_trace(go.Scatter(x=[], y=[], showlegend=False), row=1, col=1)
 
     # === Trace 2: DOWN Bid Slope (светло-красная) ===
-    if m3.any():
+    if len(down_bid_slope_x):
         fig.add_trace(
             go.Scatter(
-                x=[i for i, m in enumerate(m3) if m],
-                y=[float(v) for v, m in zip(down_bid_slope, m3) if m],
+                x=down_bid_slope_x,
+                y=down_bid_slope_y,
                 mode='lines',
                 name='DOWN Bid Slope',
                 line=dict(color='#E57373', width=2),
@@ -87,11 +83,11 @@ def create_slope_figure(df, row_idx):
         fig.add_trace(go.Scatter(x=[], y=[], showlegend=False), row=1, col=1)
 
     # === Trace 3: DOWN Ask Slope (темно-красная) ===
-    if m4.any():
+    if len(down_ask_slope_x):
         fig.add_trace(
             go.Scatter(
-                x=[i for i, m in enumerate(m4) if m],
-                y=[float(v) for v, m in zip(down_ask_slope, m4) if m],
+                x=down_ask_slope_x,
+                y=down_ask_slope_y,
                 mode='lines',
                 name='DOWN Ask Slope',
                 line=dict(color='#C62828', width=2),
@@ -3,10 +3,12 @@ Volatility Chart Widget
 График волатильности (ATR + RVol)
 """
 
-import pandas as pd
-import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from ..series import get_plot_series
+
+# Линии по индексам трасс: ключ ряда для догрузки при зуме (src/zoom.py)
+SERIES_TRACES = {0: 'binance_atr_5s', 1: 'binance_atr_30s', 2: 'binance_rvol_30s'}
 
 
 def create_volatility_figure(df, row_idx):
@@ -28,23 +30,18 @@ def create_volatility_figure(df, row_idx):
     )
 
     # === Извлечение данных ===
-    atr_5s = df['binance_atr_5s'].values if 'binance_atr_5s' in df.columns else np.array([np.nan] * len(df))
-    atr_30s = df['binance_atr_30s'].values if 'binance_atr_30s' in df.columns else np.array([np.nan] * len(df))
-    rvol_30s = df['binance_rvol_30s'].values if 'binance_rvol_30s' in df.columns else np.array([np.nan] * len(df))
-
-    # Фильтрация NaN
-    atr5s_mask = ~pd.isna(atr_5s)
-    atr30s_mask = ~pd.isna(atr_30s)
-    rvol_mask = ~pd.isna(rvol_30s)
+    atr_5s_x, atr_5s_y = get_plot_series(df, 'binance_atr_5s')
+    atr_30s_x, atr_30s_y = get_plot_series(df, 'binance_atr_30s')
+    rvol_30s_x, rvol_30s_y = get_plot_series(df, 'binance_rvol_30s')
 
     # ===== ВЕРХНИЙ ГРАФИК: ATR =====
 
     # Trace 0: ATR 5s (быстрый, тонкая линия)
-    if atr5s_mask.any():
+    if len(atr_5s_x):
         fig.add_trace(
             go.Scatter(
-                x=[i for i, m in enumerate(atr5s_mask) if m],
-                y=[float(v) for v, m in zip(atr_5s, atr5s_mask) if m],
+                x=atr_5s_x,
+                y=atr_5s_y,
                 mode='lines',
                 name='ATR 5s',
                 line=dict(color='#00BCD4', width=2),
@@ -56,11 +53,11 @@ def create_volatility_figure(df, row_idx):
         fig.add_trace(go.Scatter(x=[], y=[], showlegend=False), row=1, col=1)
 
     # Trace 1: ATR 30s (медленный, толстая линия)
-    if atr30s_mask.any():
+    if len(atr_30s_x):
         fig.add_trace(
             go.Scatter(
-                x=[i for i, m in enumerate(atr30s_mask) if m],
-                y=[float(v) for v, m in zip(atr_30s, atr30s_mask) if m],
+                x=atr_30s_x,
+                y=atr_30s_y,
                 mode='lines',
                 name='ATR 30s',
                 line=dict(color='#FF6B00', width=3),
@@ -74,11 +71,11 @@ def create_volatility_figure(df, row_idx):
     # ===== НИЖНИЙ ГРАФИК: RVOL =====
 
     # Trace 2: RVol 30s (реализованная волатильность)
-    if rvol_mask.any():
+    if len(rvol_30s_x):
         fig.add_trace(
             go.Scatter(
-                x=[i for i, m in enumerate(rvol_mask) if m],
-                y=[float(v) for v, m in zip(rvol_30s, rvol_mask) if m],
+                x=rvol_30s_x,
+                y=rvol_30s_y,
                 mode='lines',
                 name='RVol 30s',
                 line=dict(color='#9C27B0', width=2),
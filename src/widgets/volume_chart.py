@@ -3,10 +3,12 @@ Volume Chart Widget
 График объёмов торгов (линии)
 """
 
-import pandas as pd
-import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from ..series import get_plot_series
+
+# Линии по индексам трасс: ключ ряда для догрузки при зуме (src/zoom.py)
+SERIES_TRACES = {0: 'binance_volume_5s', 1: 'binance_volume_1s', 2: 'binance_volma_30s'}
 
 
 def create_volume_figure(df, row_idx):
@@ -26,14 +28,9 @@ def create_volume_figure(df, row_idx):
     )
 
     # === Извлечение данных ===
-    volume_1s = df['binance_volume_1s'].values if 'binance_volume_1s' in df.columns else np.array([np.nan] * len(df))
-    volume_5s = df['binance_volume_5s'].values if 'binance_volume_5s' in df.columns else np.array([np.nan] * len(df))
-    volma_30s = df['binance_volma_30s'].values if 'binance_volma_30s' in df.columns else np.array([np.nan] * len(df))
-
-    # Фильтрация NaN
-    v1s_mask = ~pd.isna(volume_1s)
-    v5s_mask = ~pd.isna(volume_5s)
-    volma_mask = ~pd.isna(volma_30s)
+    volume_1s_x, volume_1s_y = get_plot_series(df, 'binance_volume_1s')
+    volume_5s_x, volume_5s_y = get_plot_series(df, 'binance_volume_5s')
+    volma_30s_x, volma_30s_y = get_plot_series(df, 'binance_volma_30s')
 
     # === Пороговые линии ===
 
@@ -77,11 +74,11 @@ def create_volume_figure(df, row_idx):
     )
 
     # === Trace 0: Volume 5s (толстая полупрозрачная линия) ===
-    if v5s_mask.any():
+    if len(volume_5s_x):
         fig.add_trace(
             go.Scatter(
-                x=[i for i, m in enumerate(v5s_mask) if m],
-                y=[float(v) for v, m in zip(volume_5s, v5s_mask) if m],
+                x=volume_5s_x,
+                y=volume_5s_y,
                 mode='lines',
                 name='Volume 5s',
                 line=dict(color='rgba(100, 181, 246, 0.6)', width=3),
@@ -93,11 +90,11 @@ def create_volume_figure(df, row_idx):
         fig.add_trace(go.Scatter(x=[], y=[], showlegend=False), row=1, col=1)
 
     # === Trace 1: Volume 1s (основная линия) ===
-    if v1s_mask.any():
+    if len(volume_1s_x):
         fig.add_trace(
             go.Scatter(
-                x=[i for i, m in enumerate(v1s_mask) if m],
-                y=[float(v) for v, m in zip(volume_1s, v1s_mask) if m],
+                x=volume_1s_x,
+                y=volume_1s_y,
                 mode='lines',
                 name='Volume 1s',
                 line=dict(color='#2196F3', width=2),
@@ -109,11 +106,11 @@ def create_volume_figure(df, row_idx):
         fig.add_trace(go.Scatter(x=[], y=[], showlegend=False), row=1, col=1)
 
     # === Trace 2: Volume MA 30s (скользящее среднее) ===
-    if volma_mask.any():
+    if len(volma_30s_x):
         fig.add_trace(
             go.Scatter(
-                x=[i for i, m in enumerate(volma_mask) if m],
-                y=[float(v) for v, m in zip(volma_30s, volma_mask) if m],
+                x=volma_30s_x,
+                y=volma_30s_y,
                 mode='lines',
                 name='VolMA 30s',
                 line=dict(color='#9C27B0', width=2),
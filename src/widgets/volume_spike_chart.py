@@ -3,10 +3,12 @@ Volume Spike Chart Widget
 График всплесков объёма торгов
 """
 
-import pandas as pd
-import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from ..series import get_plot_series
+
+# Линии по индексам трасс: ключ ряда для догрузки при зуме (src/zoom.py)
+SERIES_TRACES = {0: 'binance_volume_spike'}
 
 
 def create_volume_spike_figure(df, row_idx):
@@ -26,17 +28,14 @@ def create_volume_spike_figure(df, row_idx):
     )
 
     # === Извлечение данных ===
-    volume_spike = df['binance_volume_spike'].values if 'binance_volume_spike' in df.columns else np.array([np.nan] * len(df))
-
-    # Фильтрация NaN
-    spike_mask = ~pd.isna(volume_spike)
+    volume_spike_x, volume_spike_y = get_plot_series(df, 'binance_volume_spike')
 
     # === Trace 0: Volume Spike (основная линия) ===
-    if spike_mask.any():
+    if len(volume_spike_x):
         fig.add_trace(
             go.Scatter(
-                x=[i for i, m in enumerate(spike_mask) if m],
-                y=[float(v) for v, m in zip(volume_spike, spike_mask) if m],
+                x=volume_spike_x,
+                y=volume_spike_y,
                 mode='lines',
                 name='Volume Spike',
                 line=dict(color='#FF6B00', width=2),
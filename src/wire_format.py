@@ -0,0 +1,145 @@
+"""
+Wire Format Module
+Компактный колоночный формат чанков playback (struct-of-arrays).
+
+Каждое поле чанка - один типизированный массив, упакованный в base64:
+    {'dtype': 'f4', 'shape': [n, ...], 'bdata': '...'}
+Флаги аномалий передаются битовой маской. Подписи, цвета и заголовки
+формируются в браузере (assets/playback_engine.js).
+"""
+
+import base64
+import numpy as np
+import pandas as pd
+from .config import BAR_SCALE_COEFF
+from .data_loader import get_orderbook_levels
+from .data_cache import MARKER_COLUMNS, compute_batch_flags
+
+# Версия формата, проверяется в playback_engine.js
+CHUNK_FORMAT = 'soa-1'
+
+# Маркеры по колонкам Binance/оракула - float64, как и их линии (центы при ~100k).
+# В float32 остаются только цены Polymarket
+MARKER_DTYPES = {
+    'binance_price': 'f8',
+    'oracle_price': 'f8',
+    'lag': 'f8',
+    'ret1s': 'f8',
+    'ret5s': 'f8',
+}
+
+
+def pack_array(values, dtype):
+    """
+    Упаковать массив в base64 typed-array (little-endian).
+
+    Args:
+        values: массив или список чисел
+        dtype: код типа NumPy/Plotly ('f4', 'f8', 'i1', 'u1', 'i4')
+
+    Returns:
+        dict: {'dtype', 'shape', 'bdata'}
+    """
+    arr = np.ascontiguousarray(values, dtype=np.dtype(dtype).newbyteorder('<'))
+    return {
+        'dtype': dtype,
+        'shape': list(arr.shape),
+        'bdata': base64.b64encode(arr.tobytes()).decode('ascii')
+    }
+
+
+def pack_plotly_array(values, dtype):
+    """
+    Упаковать 1-D массив в typed-array спецификацию Plotly для figure и Patch
+    (plotly.js декодирует её сам, без JSON списка чисел).
+
+    Returns:
+        dict: {'dtype', 'bdata'}
+    """
+    packed = pack_array(values, dtype)
+    del packed['shape']
+    return packed
+
+
+def pack_bitmask(mask):
+    """
+    Упаковать булев массив в битовую маску (LSB first).
+    Бит k лежит в bytes[k >> 3] >> (k & 7).
+
+    Returns:
+        dict: {'dtype': 'u1', 'shape', 'bits', 'bdata'}
+    """
+    mask = np.asarray(mask, dtype=bool)
+    packed = pack_array(np.packbits(mask.ravel(), bitorder='little'), 'u1')
+    packed['shape'] = list(mask.shape)
+    packed['bits'] = int(mask.size)
+    return packed
+
+
+def encode_trace_chunk(df: pd.DataFrame, start: int, stop: int) -> dict:
+    """
+    Закодировать строки [start, stop) для clientside playback.
+
+    Поля:
+        levels: (n, 2, 2, 5, 2) float32 - сторона, книга, уровень, price/size
+        anomaly: битовая маска (n, 2, 2, 5) - размер > 2x среднего по строке
+        buyers: (n, 2) int8 - 1 если bid_total > ask_total (UP, DOWN)
+        markers: {имя: (n,) float, NaN = нет маркера}
+        seconds_till_end: (n,) float32
+        timestamp: список строк для заголовка стакана
+
+    Returns:
+        dict: чанк в колоночном формате
+    """
+    start = max(0, start)
+    stop = max(start, min(stop, len(df)))
+
+    levels = get_orderbook_levels(df)[start:stop]
+    anomaly, _, buyers = compute_batch_flags(levels)
+
+    markers = {}
+    for name, column in MARKER_COLUMNS.items():
+        if column in df.columns:
+            values = df[column].iloc[start:stop].to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            values = np.full(stop - start, np.nan)
+        markers[name] = pack_array(values, MARKER_DTYPES.get(name, 'f4'))
+
+    seconds = _seconds_till_end(df, start, stop)
+
+    if 'timestamp_et' in df.columns:
+        timestamps = df['timestamp_et'].iloc[start:stop].astype(str).tolist()
+    elif 'timestamp_ms' in df.columns:
+        timestamps = df['timestamp_ms'].iloc[start:stop].astype(str).tolist()
+    else:
+        timestamps = ['N/A'] * (stop - start)
+
+    return {
+        'format': CHUNK_FORMAT,
+        'count': stop - start,
+        'bar_scale': BAR_SCALE_COEFF,
+        'levels': pack_array(levels, 'f4'),
+        'anomaly': pack_bitmask(anomaly),
+        'buyers': pack_array(buyers, 'i1'),
+        'markers': markers,
+        'seconds_till_end': pack_array(seconds, 'f4'),
+        'timestamp': timestamps
+    }
+
+
+def _seconds_till_end(df, start, stop):
+    """seconds_till_end строк [start, stop) в float32, NaN = нет значения"""
+    if 'seconds_till_end' in df.columns:
+        return df['seconds_till_end'].iloc[start:stop].to_numpy(dtype=np.float32, na_value=np.nan)
+    return np.full(stop - start, np.nan, dtype=np.float32)
+
+
+def encode_market_timer(df: pd.DataFrame) -> dict:
+    """
+    Данные таймера до закрытия рынка на весь файл (один раз при открытии):
+    обратный отсчёт и фаза рынка считаются в браузере (assets/market_timer.js).
+
+    Returns:
+        dict: {'seconds_till_end': (n,) float32, NaN = нет значения}
+    """
+    return {'seconds_till_end': pack_array(_seconds_till_end(df, 0, len(df)), 'f4')}
@@ -0,0 +1,82 @@
+"""
+Zoom Module
+Догрузка линий при зуме: начальные фигуры содержат прореженные ряды
+(get_plot_series), а при зуме сервер отдаёт только видимый диапазон X -
+в полном разрешении, если точек в нём не больше ширины графика.
+Диапазоны осей между графиками связывает браузер (assets/axis_link.js)
+"""
+
+from collections import OrderedDict
+from dash import Patch
+from .series import get_plot_series, get_window_series
+from .wire_format import pack_plotly_array
+from .charts import ORDERBOOK_SERIES_TRACES, BTC_SERIES_TRACES
+from .widgets.arbitrage_indicator_chart import SERIES_TRACES as ARBITRAGE_INDICATOR_SERIES_TRACES
+from .widgets.spread_chart import SERIES_TRACES as SPREAD_SERIES_TRACES
+from .widgets.imbalance_chart import SERIES_TRACES as IMBALANCE_SERIES_TRACES
+from .widgets.microprice_chart import SERIES_TRACES as MICROPRICE_SERIES_TRACES
+from .widgets.slope_chart import SERIES_TRACES as SLOPE_SERIES_TRACES
+from .widgets.eatflow_chart import SERIES_TRACES as EATFLOW_SERIES_TRACES
+from .widgets.depth_chart import SERIES_TRACES as DEPTH_SERIES_TRACES
+from .widgets.latency_direction_chart import SERIES_TRACES as LATENCY_DIRECTION_SERIES_TRACES
+from .widgets.returns_chart import SERIES_TRACES as RETURNS_SERIES_TRACES
+from .widgets.volume_chart import SERIES_TRACES as VOLUME_SERIES_TRACES
+from .widgets.volatility_chart import SERIES_TRACES as VOLATILITY_SERIES_TRACES
+from .widgets.volume_spike_chart import SERIES_TRACES as VOLUME_SPIKE_SERIES_TRACES
+from .widgets.p_vwap_chart import SERIES_TRACES as P_VWAP_SERIES_TRACES
+
+# Графики с временными рядами: id графика -> (оси X рядов, {индекс трассы: ключ ряда}).
+# Оси одного графика связаны всегда: зум по любой из них переносится на остальные.
+ZOOM_CHARTS = OrderedDict([
+    ('chart-orderbook', (('xaxis3',), ORDERBOOK_SERIES_TRACES)),
+    ('chart-arbitrage-indicator', (('xaxis',), ARBITRAGE_INDICATOR_SERIES_TRACES)),
+    ('chart-spread', (('xaxis',), SPREAD_SERIES_TRACES)),
+    ('chart-imbalance', (('xaxis',), IMBALANCE_SERIES_TRACES)),
+    ('chart-microprice', (('xaxis',), MICROPRICE_SERIES_TRACES)),
+    ('chart-slope', (('xaxis',), SLOPE_SERIES_TRACES)),
+    ('chart-eatflow', (('xaxis',), EATFLOW_SERIES_TRACES)),
+    ('chart-depth', (('xaxis',), DEPTH_SERIES_TRACES)),
+    ('chart-btc', (('xaxis', 'xaxis2'), BTC_SERIES_TRACES)),
+    ('chart-latency-direction', (('xaxis',), LATENCY_DIRECTION_SERIES_TRACES)),
+    ('chart-returns', (('xaxis',), RETURNS_SERIES_TRACES)),
+    ('chart-volume', (('xaxis',), VOLUME_SERIES_TRACES)),
+    ('chart-volatility', (('xaxis', 'xaxis2'), VOLATILITY_SERIES_TRACES)),
+    ('chart-volume-spike', (('xaxis',), VOLUME_SPIKE_SERIES_TRACES)),
+    ('chart-p-vwap', (('xaxis',), P_VWAP_SERIES_TRACES)),
+])
+
+
+# Графики для выбора группы связанного зума (панель Linked Zoom)
+AXIS_LINK_OPTIONS = [
+    {'label': chart_id.replace('chart-', ''), 'value': chart_id} for chart_id in ZOOM_CHARTS
+]
+
+
+def build_window_patch(df, chart_id, data_range):
+    """
+    Patch графика с точками линий диапазона data_range.
+
+    Используется связанным зумом (data_range - видимый диапазон) и Active-Track
+    (data_range - окно с запасом, чтобы следующие шаги слайдера не ходили на сервер).
+    Оси в Patch не пишутся: диапазоны ведёт браузер (assets/axis_pins.js), а
+    диапазон на момент запроса к приходу ответа мог устареть.
+
+    Args:
+        data_range: [x_min, x_max] загружаемых точек, None - обзорные ряды
+    """
+    _, series_traces = ZOOM_CHARTS[chart_id]
+    patched_fig = Patch()
+    _patch_series(patched_fig, df, series_traces, data_range)
+    return patched_fig
+
+
+def _patch_series(patched_fig, df, series_traces, x_range):
+    """Записать в Patch линии диапазона x_range (None - обзорные ряды)"""
+    for trace_idx, key in series_traces.items():
+        if x_range is None:
+            x, y = get_plot_series(df, key)
+        else:
+            x, y = get_window_series(df, key, min(x_range), max(x_range))
+        patched_fig['data'][trace_idx]['x'] = pack_plotly_array(x, 'i4')
+        # 'f4' для pm_* колонок, 'f8' для цен BTC (см. get_plot_series)
+        patched_fig['data'][trace_idx]['y'] = pack_plotly_array(y, y.dtype.str[1:])
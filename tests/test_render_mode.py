@@ -0,0 +1,39 @@
+"""
+Тесты выбора типа трасс (src/render_mode.py) на реальных файлах рынков из files/.
+Без файлов рынков тесты пропускаются
+"""
+
+import pytest
+from src.data_loader import get_csv_files, load_data
+from src.render_mode import drawn_points, line_trace_type
+from src.zoom import ZOOM_CHARTS
+from src.config import PLOT_MAX_POINTS, WEBGL_AUTO_POINTS
+
+MARKET_FILES = get_csv_files()
+
+
+@pytest.fixture(scope='module')
+def market_df():
+    if not MARKET_FILES:
+        pytest.skip('no market files in files/')
+    return load_data(MARKET_FILES[0])
+
+
+def test_auto_threshold_reachable():
+    # Линия прорежена до PLOT_MAX_POINTS: порог по одной линии был бы недостижим
+    max_lines = max(len(series_traces) for _, series_traces in ZOOM_CHARTS.values())
+    assert max_lines * PLOT_MAX_POINTS > WEBGL_AUTO_POINTS
+
+
+def test_auto_picks_scattergl_on_market_file(market_df):
+    trace_types = {chart_id: line_trace_type(market_df, chart_id, 'auto') for chart_id in ZOOM_CHARTS}
+    assert 'scattergl' in trace_types.values()
+    for chart_id, trace_type in trace_types.items():
+        expected = 'scattergl' if drawn_points(market_df, chart_id) > WEBGL_AUTO_POINTS else 'scatter'
+        assert trace_type == expected, chart_id
+
+
+def test_fixed_modes(market_df):
+    for chart_id in ZOOM_CHARTS:
+        assert line_trace_type(market_df, chart_id, 'svg') == 'scatter'
+        assert line_trace_type(market_df, chart_id, 'webgl') == 'scattergl'